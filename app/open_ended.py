@@ -1,15 +1,32 @@
 import streamlit as st
 from datetime import datetime
-from io import BytesIO
 from pathlib import Path
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import LETTER
-import textwrap
 import html
-import json
-
-
-def _safe_rerun():
+import functools
+import hashlib
+import os
+import re
+import threading
+from urllib.parse import urlencode, urlsplit
+
+from logic import engine
+from logic.csf_catalog import CsfCatalog
+from logic.csf_store import CatalogStore, shared_store
+from logic.record import (
+    CONSTRAINT_BITS,
+    PFCE_NODE_BITS,
+    PRINCIPLE_BITS,
+    SALIENCE_BITS,
+    STAKEHOLDER_BITS,
+)
+from logic.record_store import RecordStore, new_record_id, shared_record_store
+from logic.share_token import MAX_TOKEN_CHARS, from_token, to_token
+from logic.session_spill import SpillManager, shared_spill_manager
+from logic.session_store import SessionSync, new_session_id, shared_session_store
+from logic.framework import PFCE_SUBNODES, PFCE_SURFACING_PROMPTS
+
+
+def safe_rerun():
     try:
         if hasattr(st, "rerun"):
             st.rerun()
@@ -23,32 +40,17 @@ def _html_block(s: str) -> str:
     return "\n".join(line.lstrip() for line in s.splitlines())
 
 def render_divider():
-    st.markdown(
-        """
-        <hr style="
-            margin: 1.25rem 0;
-            border: none;
-            height: 1px;
-            background: linear-gradient(
-                90deg,
-                rgba(255,255,255,0.00),
-                rgba(255,255,255,0.35),
-                rgba(255,255,255,0.00)
-            );
-        ">
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown('<hr class="oe-divider">', unsafe_allow_html=True)
 
 
 def csf_section_open(title: str, subtitle: str):
     st.markdown(
         f"""
         <div class="csf-section">
-          <div style="font-size: 1.35rem; font-weight: 750; margin: 0 0 0.25rem 0;">
+          <div class="csf-section-title">
             {title}
           </div>
-          <div style="color: rgba(229,231,235,0.75); margin: 0 0 0.75rem 0; line-height: 1.45;">
+          <div class="csf-section-subtitle">
             {subtitle}
           </div>
         """,
@@ -79,45 +81,7 @@ def oe_init_record():
     if OE_RECORD_KEY in st.session_state:
         return
 
-    st.session_state[OE_RECORD_KEY] = {
-        "scenario_description": "",
-        "decision_point": "",
-        "procedural_context": "",
-
-        "technical": {
-            "csf_categories": [],
-            "csf_outcomes": [],
-            "considerations": [],
-            "other_notes": "",
-        },
-
-        "stakeholders": [],
-
-        "ethical": {
-            "pfce_salience_selected": [],
-            "pfce_principles": [],
-            "considerations": [],
-            "pfce_pressure_summary": "",
-        },
-
-        "tension": {
-            "a": "",
-            "b": "",
-            "statement": "",
-            "type": "Not specified",
-        },
-
-        "constraints": {
-            "selected": [],
-            "other": "",
-        },
-
-        "decision": {
-            "decision_text": "",
-            "documented_rationale": "",
-            "tradeoff_reasoning": "",
-        },
-    }
+    st.session_state[OE_RECORD_KEY] = engine.init_record()
 
 OE_KEYMAP = {
     # Steps 1–3
@@ -130,7 +94,9 @@ OE_KEYMAP = {
     # If you implement CSF mapping checkboxes later, store these lists:
     "csf_categories": "oe_csf_categories_selected",
     "csf_outcomes": "oe_csf_outcomes_selected",
-    "technical_considerations": "oe_technical_considerations",
+    "csf_functions": "oe_csf_functions_selected",
+    "csf_include_examples": "oe_csf_examples_included",
+    "technical_additional": "oe_technical_additional",
 
 
     # Step 5 (stakeholders)
@@ -140,14 +106,14 @@ OE_KEYMAP = {
     "pfce_salience_selected": "oe_pfce_salience_selected",
     "pfce_principles": "oe_pfce_principles",
     "pfce_pressure_summary": "oe_pfce_pressure_summary",
-    "ethical_considerations": "oe_ethical_considerations",
+    "pfce_nodes": "oe_pfce_nodes_selected",
+    "ethical_additional": "oe_ethical_additional",
 
     # Step 7 (tension)
-    "tension_a": "oe_tension_a",              # strongly recommend splitting, not one blob
+    "tension_a": "oe_tension_a",              # obligation references (see logic/record.py)
     "tension_b": "oe_tension_b",
     "tradeoff_reasoning": "oe_reasoning_tradeoff",
     "tension_type": "oe_tension_type",
-    "tension_statement": "oe_tension_statement",
 
 
     # Step 8 (institutional and governance constraints)
@@ -159,1140 +125,684 @@ OE_KEYMAP = {
     "decision_rationale": "oe_decision_rationale",
 }
 
-def oe_sync_record():
+# Steps whose inputs have been copied into the record at least once this session
+OE_SYNCED_STEPS_KEY = "oe_synced_steps"
+
+# Record input names changed since they were last copied into the record
+OE_DIRTY_KEY = "oe_dirty_inputs"
+
+# Record field -> value changed since the record was last saved
+OE_UNSAVED_KEY = "oe_unsaved_changes"
+
+
+def oe_callback(fn):
+    """
+    For widget callbacks (on_change/on_click). Streamlit runs them before the
+    script, so before main() can bring back a spilled session: a callback
+    reading a spilled key (a selection bitset, the dirty set) would build on
+    an empty value, and that value would then win over the saved one. The
+    wrapper restores a spilled session first.
+    """
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        oe_restore_spilled()
+        return fn(*args, **kwargs)
+
+    return run
+
+
+def _mark_dirty(*names):
+    """The record inputs `names` need syncing."""
+    st.session_state.setdefault(OE_DIRTY_KEY, set()).update(names)
+
+
+# Widget on_change callback; the render path (oe_set_input) calls _mark_dirty directly.
+oe_mark_dirty = oe_callback(_mark_dirty)
+
+
+def oe_set_input(name: str, value):
+    """Sets a derived input's session key, marking it dirty only if the value changed."""
+    key = OE_KEYMAP[name]
+    if st.session_state.get(key) != value:
+        st.session_state[key] = value
+        _mark_dirty(name)
+
+
+def oe_sync_record(*steps) -> dict:
+    """
+    Copies the given steps' dirty inputs into the record and returns the
+    change set ({record field: new value}). Inputs nobody touched since the
+    last sync are not re-read. Only steps whose widgets are on screen (or
+    whose keys are derived, not widget keys) should be synced: Streamlit
+    drops a widget's state once it stops being rendered, so syncing an
+    earlier step's text area from a later step would blank it.
+    """
     rec = st.session_state.get(OE_RECORD_KEY)
     if not rec:
+        return {}
+
+    dirty = st.session_state.setdefault(OE_DIRTY_KEY, set())
+    names = [name for step in steps for name in engine.STEP_INPUTS[step] if name in dirty]
+    # The engine only sees plain values, keyed by record input name.
+    values = {name: st.session_state.get(OE_KEYMAP[name]) for name in names}
+    changes = engine.sync_changes(rec, values, names)
+    dirty.difference_update(names)
+    st.session_state.setdefault(OE_SYNCED_STEPS_KEY, set()).update(steps)
+    if changes:
+        st.session_state.setdefault(OE_UNSAVED_KEY, {}).update(changes)
+        st.session_state.pop(OE_EXPORT_CACHE_KEY, None)
+    return changes
+
+
+# Each step keeps its checkbox selections in one bitset instead of a session
+# key per checkbox. CSF categories and outcomes share one, over catalog tree
+# positions, kept with the tree layout it was built on (see oe_csf_bits); the
+# others are over the option tables in logic.record.
+OE_CSF_BITS_KEY = "oe_csf_bits"
+OE_CSF_BITS_LAYOUT_KEY = "oe_csf_bits_layout"
+OE_STAKEHOLDER_BITS_KEY = "oe_stakeholder_bits"
+OE_SALIENCE_BITS_KEY = "oe_pfce_salience_bits"
+OE_PRINCIPLE_BITS_KEY = "oe_pfce_principle_bits"
+OE_NODE_BITS_KEY = "oe_pfce_node_bits"
+OE_CONSTRAINT_BITS_KEY = "oe_constraint_bits"
+
+
+# Keys of widgets generated per item are built from the item's content, never
+# hash(): str hashes are randomized per process, so such keys changed on a
+# restart and differed between workers. Bump OE_STATE_VERSION when a key scheme
+# changes, and teach oe_migrate_session_state the old one.
+OE_STATE_VERSION = 2
+OE_STATE_VERSION_KEY = "oe_state_version"
+
+_PLAIN_KEY_PART = re.compile(r"[A-Za-z0-9.\-]{1,64}")
+
+
+def oe_widget_key(prefix: str, *parts) -> str:
+    """
+    Process-stable key for a per-item widget, e.g. oe_widget_key("oe_csf_refs_doc", "GV.OC-01").
+    Parts that are not short plain IDs (free text, labels) become a digest of their text.
+    """
+    out = [prefix]
+    for part in parts:
+        text = "" if part is None else str(part)
+        if not _PLAIN_KEY_PART.fullmatch(text):
+            text = hashlib.blake2s(text.encode("utf-8"), digest_size=6).hexdigest()
+        out.append(text)
+    return "_".join(out)
+
+
+def oe_migrate_session_state():
+    """
+    Moves session state saved under an older key scheme to the current one.
+    Version 1 kept one key per checkbox; the Step 5 keys held hash(stakeholder)
+    and cannot be read back in another process, so stakeholders are rebuilt
+    from the combined list (oe_stakeholders), which is plain text.
+    """
+    state = st.session_state
+    if state.get(OE_STATE_VERSION_KEY) == OE_STATE_VERSION:
         return
+    legacy = {}
+    for i, item in enumerate(PFCE_SURFACING_PROMPTS):
+        legacy[f"oe_pfce_salience_{item['id']}"] = (OE_SALIENCE_BITS_KEY, i)
+    for i, pid in enumerate(PRINCIPLE_BITS.options):
+        legacy[f"oe_pfce_{pid}"] = (OE_PRINCIPLE_BITS_KEY, i)
+    for pid, nodes in PFCE_SUBNODES.items():
+        for idx, node in enumerate(nodes, start=1):
+            legacy[f"oe_pfce_node_{pid}_{idx}"] = (OE_NODE_BITS_KEY, PFCE_NODE_BITS.position((pid, node)))
+    for i, c in enumerate(CONSTRAINT_BITS.options):
+        legacy[f"oe_constraint_{c}"] = (OE_CONSTRAINT_BITS_KEY, i)
+
+    bits = {}
+    csf_ids = []
+    found = False
+    for key in list(state.keys()):
+        if not isinstance(key, str):
+            continue
+        if key in legacy:
+            bits_key, i = legacy[key]
+            if state[key]:
+                bits[bits_key] = bits.get(bits_key, 0) | 1 << i
+        elif key.startswith(("oe_csf_cat_", "oe_csf_sub_")):
+            if state[key]:
+                csf_ids.append(key[len("oe_csf_cat_"):])
+        elif not re.fullmatch(r"oe_stakeholders_-?\d+", key):
+            continue
+        found = True
+        del state[key]
 
-    km = OE_KEYMAP
-
-    def _get(key, default=""):
-        return st.session_state.get(key, default)
-
-    # Step 1–3
-    rec["scenario_description"] = str(_get(km["scenario_description"], "")).strip()
-    rec["decision_point"] = str(_get(km["decision_point"], "")).strip()
-    rec["procedural_context"] = str(_get(km["procedural_context"], "")).strip()
-
-    # Step 4
-    rec["technical"]["csf_categories"] = _get(km["csf_categories"], []) or []
-    rec["technical"]["csf_outcomes"] = _get(km["csf_outcomes"], []) or []
-    rec["technical"]["other_notes"] = str(_get(km["technical_other_notes"], "")).strip()
-    rec["technical"]["considerations"] = _get(km["technical_considerations"], []) or []
-
-    # Step 5
-    rec["stakeholders"] = _get(km["stakeholders_combined"], []) or []
-
-    # Step 6
-    rec["ethical"]["pfce_salience_selected"] = _get(km["pfce_salience_selected"], []) or []
-    rec["ethical"]["pfce_principles"] = _get(km["pfce_principles"], []) or []
-    rec["ethical"]["pfce_pressure_summary"] = str(_get(km["pfce_pressure_summary"], "")).strip()
-    rec["ethical"]["considerations"] = _get(km["ethical_considerations"], []) or []
-
-    # Step 7
-    a = str(_get(km.get("tension_a", ""), "")).strip()
-    b = str(_get(km.get("tension_b", ""), "")).strip()
-
-    rec["tension"]["a"] = a
-    rec["tension"]["b"] = b
-
-    # Derive statement centrally (single source of truth)
-    rec["tension"]["statement"] = f"{a}  ⟷  {b}".strip(" ⟷ ")
-
-    # Explicitly store classification (if any)
-    rec["tension"]["type"] = str(
-        _get(km.get("tension_type", ""), "Not specified")
-    ).strip() or "Not specified"
-
-    # Optional downstream reasoning
-    rec["tradeoff_reasoning"] = str(
-        _get(km["tradeoff_reasoning"], "")
-    ).strip()
-
-    # Step 8
-    rec["constraints"]["selected"] = _get(km["constraints_selected"], []) or []
-    rec["constraints"]["other"] = str(_get(km["constraints_other"], "")).strip()
-    rec["decision"]["decision_text"] = str(_get(km["decision_text"], "")).strip()
-    rec["decision"]["documented_rationale"] = str(_get(km["decision_rationale"], "")).strip()
-
-    st.session_state[OE_RECORD_KEY] = rec
-
-
-STAKEHOLDER_OPTIONS = [
-    "Local Residents/Businesses",
-    "City Leadership (Mayor, City Manager, City Council)",
-    "Department leadership (Public Works, Utilities, Police, Fire, etc.)",
-    "IT/Cybersecurity Team",
-    "City Employees/Internal Staff",
-    "Vendors/Managed Service Providers",
-    "State or Federal Partners/Regulators",
-    "Law enforcement / investigative partners",
-    "Finance/Procurement/Legal",
-    "Media/Public Information Office",
-]
+    if found:
+        if csf_ids:
+            _, catalog = get_csf_store(str(CSF_EXPORT_PATH)).current()
+            bits[OE_CSF_BITS_KEY] = catalog.tree.mask(csf_ids)
+            bits[OE_CSF_BITS_LAYOUT_KEY] = catalog.tree.layout
+        if "oe_stakeholders" in state:
+            bits[OE_STAKEHOLDER_BITS_KEY] = STAKEHOLDER_BITS.encode(state["oe_stakeholders"] or ())[0]
+        for bits_key, value in bits.items():
+            state.setdefault(bits_key, value)
+    state[OE_STATE_VERSION_KEY] = OE_STATE_VERSION
 
-CSF_EXPORT_PATH = Path("data/csf-export.json")  # update if you renamed the file
 
-@st.cache_data(show_spinner=False)
-def load_csf_export_index(path: str):
+@oe_callback
+def oe_toggle_bit(key: str, i: int):
+    st.session_state[key] = st.session_state.get(key, 0) ^ (1 << i)
+
+
+def oe_bit_checkbox(label: str, key: str, i: int, **kwargs) -> bool:
     """
-    Builds indexes from the NIST CSF reference-tool export schema.
-    Returns:
-      functions: {FN_ID: {"title":..., "description":...}}
-      categories: {CAT_ID: {"title":..., "description":..., "function": FN_ID}}
-      subcats: {SUB_ID: {"text":..., "category": CAT_ID}}
-      cats_by_fn: {FN_ID: [CAT_ID, ...]}
-      subs_by_cat: {CAT_ID: [SUB_ID, ...]}
-      refs_by_subcat: {SUB_ID: [ {doc_name, doc_version, doc_url, dest_element_identifier} ... ]}
+    Checkbox for bit i of the bitset at `key`. It has no widget key: its value
+    comes from the bitset and on_change flips the bit. The widget ID includes
+    the value, so after a flip Streamlit creates it anew, showing the new value.
     """
-    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    return st.checkbox(
+        label,
+        value=bool(st.session_state.get(key, 0) >> i & 1),
+        on_change=oe_toggle_bit,
+        args=(key, i),
+        **kwargs,
+    )
 
-    elems = raw.get("response", {}).get("elements", {}).get("elements", [])
-    docs = raw.get("response", {}).get("elements", {}).get("documents", [])
-    rels = raw.get("response", {}).get("elements", {}).get("relationships", [])
 
-    doc_map = {d.get("doc_identifier"): d for d in docs if d.get("doc_identifier")}
+def oe_csf_bits(catalog: CsfCatalog) -> int:
+    """
+    The Step 4 selection bitset over `catalog`'s tree. A new catalog version
+    (hot reload) can move every position, and the bitset outlives the step's
+    catalog pin (and travels through the session store and spill), so over
+    another layout it is rebuilt from the selected IDs, never read as is.
+    """
+    state = st.session_state
+    tree = catalog.tree
+    if state.get(OE_CSF_BITS_LAYOUT_KEY) != tree.layout:
+        if OE_CSF_BITS_KEY in state:
+            ids = list(state.get(OE_KEYMAP["csf_categories"]) or ()) + list(state.get(OE_KEYMAP["csf_outcomes"]) or ())
+            state[OE_CSF_BITS_KEY] = tree.mask(ids)
+        state[OE_CSF_BITS_LAYOUT_KEY] = tree.layout
+    return state.get(OE_CSF_BITS_KEY, 0)
+
+
+def _oe_widget_state(step: int, inputs: dict) -> dict:
+    """Widget key -> value that shows the record's inputs for `step` on screen."""
+    if step == 1:
+        return {"oe_scenario_description": inputs["scenario_description"]}
+    if step == 2:
+        return {"oe_decision_point": inputs["decision_point"]}
+    if step == 3:
+        return {"oe_csf_function_choice": inputs["procedural_context"] or None}
+    if step == 4:
+        tree = get_csf_catalog(step).tree
+        out = {
+            OE_CSF_BITS_KEY: tree.mask(inputs["csf_categories"] + inputs["csf_outcomes"]),
+            OE_CSF_BITS_LAYOUT_KEY: tree.layout,
+        }
+        out["oe_csf_include_examples"] = inputs["csf_include_examples"]
+        out["oe_technical_additional_text"] = "\n".join(inputs["technical_additional"])
+        return out
+    if step == 5:
+        bits, other = STAKEHOLDER_BITS.encode(inputs["stakeholders_combined"])
+        out = {OE_STAKEHOLDER_BITS_KEY: bits}
+        out["oe_stakeholders_other_toggle"] = bool(other)
+        out["oe_stakeholders_other_text"] = ", ".join(other)
+        return out
+    if step == 6:
+        out = {
+            OE_SALIENCE_BITS_KEY: SALIENCE_BITS.encode(inputs["pfce_salience_selected"])[0],
+            OE_PRINCIPLE_BITS_KEY: PRINCIPLE_BITS.encode(inputs["pfce_principles"])[0],
+            OE_NODE_BITS_KEY: PFCE_NODE_BITS.encode(inputs["pfce_nodes"])[0],
+        }
+        out["oe_ethical_additional_text"] = "\n".join(inputs["ethical_additional"])
+        return out
+    if step == 7:
+        a, b = inputs["tension_a"], inputs["tension_b"]
+        out = {"oe_tension_a_id": a or "__none__", "oe_tension_b_id": b or "__none__"}
+        inferred = engine.infer_tension_type(engine.ref_origin(a), engine.ref_origin(b))
+        if a and b and inputs["tension_type"] != inferred:
+            out["oe_tension_override_toggle"] = True
+            out["oe_tension_type"] = inputs["tension_type"]
+        return out
+    if step == 8:
+        bits, other = CONSTRAINT_BITS.encode(inputs["constraints_selected"])
+        out = {OE_CONSTRAINT_BITS_KEY: bits}
+        out["oe_constraints_other_toggle"] = bool(other)
+        out["oe_constraints_other"] = ", ".join(other)
+        return out
+    return {"oe_decision_documentation": inputs["decision_text"]}
+
+
+def _oe_restore_step_widgets(step: int):
+    """
+    Puts a synced step's saved inputs back into its widgets when their state
+    is gone (after visiting other steps, or after resuming a saved record).
+    """
+    if step not in st.session_state.get(OE_SYNCED_STEPS_KEY, ()):
+        return
+    inputs = engine.record_inputs(st.session_state[OE_RECORD_KEY])
+    for key, value in _oe_widget_state(step, inputs).items():
+        if key not in st.session_state:
+            st.session_state[key] = value
 
-    functions = {}
-    categories = {}
-    subcats = {}
-    cats_by_fn = {}
-    subs_by_cat = {}
-    refs_by_subcat = {}
 
-    # --- Parse CSF core elements ---
-    for e in elems:
-        if e.get("doc_identifier") != "CSF_2_0_0":
-            continue
+# ---------- Persistence (autosave on step navigation, resume by record ID) ----------
 
-        et = e.get("element_type")
-        eid = e.get("element_identifier")
-        title = (e.get("title") or "").strip()
-        text = (e.get("text") or "").strip()
-
-        if et == "function":
-            functions[eid] = {"title": title or eid, "description": text}
-            cats_by_fn.setdefault(eid, [])
-
-        elif et == "category":
-            fn_id = eid.split(".")[0]  # GV.OC -> GV
-            categories[eid] = {"title": title or eid, "description": text, "function": fn_id}
-            cats_by_fn.setdefault(fn_id, []).append(eid)
-            subs_by_cat.setdefault(eid, [])
-
-        elif et == "subcategory":
-            cat_id = eid.split("-")[0]  # GV.OC-01 -> GV.OC
-            subcats[eid] = {"text": text, "category": cat_id}
-            subs_by_cat.setdefault(cat_id, []).append(eid)
-
-    # Dedupe category lists
-    for fn_id, lst in cats_by_fn.items():
-        cats_by_fn[fn_id] = list(dict.fromkeys(lst))
-
-    # --- Parse informative references (external_reference relationships) ---
-    for r in rels:
-        if r.get("relationship_identifier") != "external_reference":
-            continue
-        if r.get("source_doc_identifier") != "CSF_2_0_0":
-            continue
+OE_RECORD_DB_PATH = Path("data/records.sqlite3")
+OE_RECORD_ID_KEY = "oe_record_id"
+# Step the record was last saved on
+OE_SAVED_STEP_KEY = "oe_saved_step"
 
-        src_subcat = r.get("source_element_identifier")  # e.g., GV.OC-01
-        dest_doc = r.get("dest_doc_identifier")
-        dest_elem = r.get("dest_element_identifier")
-
-        d = doc_map.get(dest_doc, {})
-        refs_by_subcat.setdefault(src_subcat, []).append({
-            "doc_name": d.get("name") or dest_doc,
-            "doc_version": d.get("version") or "",
-            "doc_url": d.get("website") or "",
-            "dest_element_identifier": dest_elem or "",
-        })
-
-    return functions, categories, subcats, cats_by_fn, subs_by_cat, refs_by_subcat
-
-
-CSF_FUNCTION_PROMPTS = {
-    "GV": {
-        "label": "GOVERN (GV)",
-        "prompt": "Are you establishing, reviewing, or overseeing cybersecurity risk management strategy, policies, or governance expectations?",
-    },
-    "ID": {
-        "label": "IDENTIFY (ID)",
-        "prompt": "Are you working to understand current cybersecurity risks, such as identifying assets, systems, vulnerabilities, or risk exposure?",
-    },
-    "PR": {
-        "label": "PROTECT (PR)",
-        "prompt": "Are you applying or managing safeguards to reduce or manage cybersecurity risk?",
-    },
-    "DE": {
-        "label": "DETECT (DE)",
-        "prompt": "Are you monitoring for, identifying, or analyzing potential cybersecurity attacks or compromises?",
-    },
-    "RS": {
-        "label": "RESPOND (RS)",
-        "prompt": "Are you taking action in response to a confirmed cybersecurity incident?",
-    },
-    "RC": {
-        "label": "RECOVER (RC)",
-        "prompt": "Are you restoring systems, data, or operations affected by a cybersecurity incident?",
-    },
-}
 
-PFCE_PRESSURE_PROMPTS = {
-    "Beneficence": {
-        "label": "Beneficence",
-        "prompt": "What benefit is being protected or promoted—and for whom?",
-    },
-    "Non-maleficence": {
-        "label": "Non-maleficence",
-        "prompt": "What foreseeable harm is being avoided or accepted?",
-    },
-    "Autonomy": {
-        "label": "Autonomy",
-        "prompt": "Whose choices or agency are being constrained, overridden, or preserved?",
-    },
-    "Justice": {
-        "label": "Justice",
-        "prompt": "Are impacts or protections distributed unevenly across groups or communities?",
-    },
-    "Explicability": {
-        "label": "Explicability",
-        "prompt": "What would be difficult to explain, justify, or defend about this decision?",
-    },
-}
+def get_record_store() -> RecordStore:
+    return shared_record_store(OE_RECORD_DB_PATH)
 
 
-PFCE_DEFINITIONS = {
-    "Beneficence": (
-        "Cybersecurity technologies should be used to benefit humans, promote human well-being, "
-        "and make our lives better overall."
-    ),
-    "Non-maleficence": (
-        "Cybersecurity technologies should not be used to intentionally harm humans or to make "
-        "our lives worse overall."
-    ),
-    "Autonomy": (
-        "Cybersecurity technologies should be used in ways that respect human autonomy. Humans "
-        "should be able to make informed decisions for themselves about how that technology is used "
-        "in their lives."
-    ),
-    "Justice": (
-        "Cybersecurity technologies should be used to promote fairness, equality, and impartiality. "
-        "They should not be used to unfairly discriminate, undermine solidarity, or prevent equal access."
-    ),
-    "Explicability": (
-        "Cybersecurity technologies should be used in ways that are intelligible, transparent, and "
-        "comprehensible, and it should be clear who is accountable and responsible for their use."
-    ),
-}
+def oe_autosave(step: int, next_step: int):
+    """
+    Syncs the step being left and queues the record for saving (batched by
+    the store). Skipped when nothing changed and the saved step is current.
+    """
+    oe_sync_record(step)
+    unsaved = st.session_state.pop(OE_UNSAVED_KEY, None)
+    record_id = st.session_state.get(OE_RECORD_ID_KEY)
+    if record_id and not unsaved and st.session_state.get(OE_SAVED_STEP_KEY) == next_step:
+        return
+    if not record_id:
+        record_id = st.session_state[OE_RECORD_ID_KEY] = new_record_id()
+        # A refresh of this URL resumes the record (which is now newer than any share link)
+        st.query_params["record"] = record_id
+        st.query_params.pop("resume", None)
+    get_record_store().save(record_id, st.session_state[OE_RECORD_KEY], next_step)
+    st.session_state[OE_SAVED_STEP_KEY] = next_step
+
+
+def oe_resume_record(record_id: str) -> bool:
+    """Loads a saved record into this session at the step it was saved on. False if not found."""
+    found = get_record_store().load(record_id)
+    if found is None:
+        return False
+    rec, step = found
+    _oe_load_record(rec, step)
+    st.session_state[OE_RECORD_ID_KEY] = record_id
+    st.session_state[OE_SAVED_STEP_KEY] = step
+    return True
+
+
+def _oe_load_record(rec, step: int):
+    """
+    Rebuilds the session's reasoning state from `rec` in one pass, opened at
+    `step`: derived keys, then the widgets and selection bitsets of every
+    step up to `step`. Later steps' widgets are cleared, so suggestions still
+    pre-fill them. Everything is derived before the session is touched, so a
+    record that cannot be rendered leaves the session as it was.
+    """
+    state = st.session_state
+    step = max(1, min(int(step), OE_TOTAL_STEPS))
+    inputs = engine.record_inputs(rec)
+    widgets = {s: _oe_widget_state(s, inputs) for s in OE_STEP_TITLES}
+    state[OE_RECORD_KEY] = rec
+    state["oe_step"] = step
+    for name, value in inputs.items():
+        state[OE_KEYMAP[name]] = value
+    for s, keys in widgets.items():
+        if s <= step:
+            state.update(keys)
+        else:
+            for key in keys:
+                state.pop(key, None)
+    state[OE_SYNCED_STEPS_KEY] = set(range(1, step + 1))
+    # The record matches the keys just set: nothing to sync, save or re-export
+    for key in (OE_DIRTY_KEY, OE_UNSAVED_KEY, OE_EXPORT_CACHE_KEY, OE_RECORD_ID_KEY, OE_SAVED_STEP_KEY):
+        state.pop(key, None)
 
-PFCE_SURFACING_PROMPTS = [
-    {
-        "id": "harm_disadvantage",
-        "prompt": "This decision could cause harm or disadvantage to people, even indirectly.",
-        "maps_to": ["Non-maleficence", "Justice"],
-    },
-    {
-        "id": "cost_of_failure",
-        "prompt": "The costs or burdens of failure would fall unevenly or unfairly.",
-        "maps_to": ["Justice", "Non-maleficence"],
-    },
-    {
-        "id": "rights_dependencies",
-        "prompt": "This decision could affect people’s rights, expectations, or reliance on services.",
-        "maps_to": ["Autonomy", "Beneficence"],
-    },
-    {
-        "id": "public_justification",
-        "prompt": "This decision would be difficult to publicly justify or defend if questioned later.",
-        "maps_to": ["Explicability", "Justice", "Non-maleficence"],
-    },
-    {
-        "id": "ethical_discomfort",
-        "prompt": "This decision feels ethically uncomfortable, even if it is technically justified.",
-        "maps_to": ["Beneficence", "Non-maleficence", "Explicability"],
-    },
-]
-
-OLD_PFCE_PROMPTS = {
-    "Beneficence": "Could this decision affect human well-being or access to essential services?",
-    "Non-maleficence": "Could this decision foreseeably cause harm (directly or indirectly)?",
-    "Autonomy": "Could this decision constrain people’s ability to make informed choices about how they are affected?",
-    "Justice": "Could impacts or protections be distributed unevenly across groups or neighborhoods?",
-    "Explicability": "Is accountability, transparency, or explainability central to this decision?",
-}
 
-PFCE_SUBNODES = {
-    "Non-maleficence": [
-        "Privacy violations",
-        "Financial harm",
-        "Physical harm",
-        "Psychological harm",
-        "System harm",
-        "Data harm",
-        "Reputational harm",
-    ],
-    "Justice": [
-        "Democracy / Free speech",
-        "Avoiding bias",
-        "Accessibility & usability",
-        "Procedural fairness",
-        "Substantive fairness",
-        "Rights (incl. privacy rights)",
-        "Self defence",
-    ],
-    "Beneficence": [
-        "Promote well-being",
-        "Protect privacy",
-        "Financial benefits",
-        "Reputational benefits",
-        "Connectivity benefits",
-        "Strengthen trust",
-    ],
-    "Autonomy": [
-        "Informed consent",
-        "Control data & access",
-        "Privacy settings",
-        "Ownership",
-        "Respect for persons",
-        "Relationships",
-    ],
-    "Explicability": [
-        "Accountability",
-        "Transparency (incl. privacy policies)",
-        "Responsible use of AI",
-        "Responsibility to protect systems & data",
-        "Professional development & diligence",
-    ],
-}
+# ---------- Share/resume links (the state travels in the URL, nothing is stored) ----------
 
-TEMP_CONSTRAINT_OPTIONS = [
-    "Legal or regulatory requirements",
-    "Public transparency or disclosure obligations",
-    "Budgetary or resource limitations",
-    "Staffing or expertise constraints",
-    "Procurement or contracting limitations",
-    "Political or leadership direction",
-    "Interagency or third-party dependencies",
-    "Time sensitivity or urgency",
-    "Incomplete or uncertain information",
-]
-
-
-def _build_pdf(title: str, lines: list[str]) -> BytesIO:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=LETTER)
-    width, height = LETTER
-
-    x = 54
-    y = height - 54
-
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(x, y, title[:120])
-    y -= 24
-
-    c.setFont("Helvetica", 10)
-
-    rec = st.session_state.get(OE_RECORD_KEY, {})
-    tension = rec.get("tension", {}).get("statement", "")
-
-    if tension:
-        lines.append(f"Decision Tension: {tension}")
-    else:
-        lines.append("Decision Tension: Not specified")
-
-    code = rec.get("procedural_context", "").strip()
-    label = CSF_FUNCTION_PROMPTS.get(code, {}).get("label", code or "Not specified")
-    lines.append(f"Procedural Context: {label}")
-
-    for raw in lines:
-        wrapped = textwrap.wrap(raw, width=100) if raw else [""]
-        for wline in wrapped:
-            if y < 72:
-                c.showPage()
-                c.setFont("Helvetica", 10)
-                y = height - 54
-            c.drawString(x, y, wline)
-            y -= 14
-        y -= 6
-
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
+# The share token this session last created or opened
+OE_SHARE_TOKEN_KEY = "oe_share_token"
 
-def _render_open_header(step: int):
-    step_title = html.escape(OE_STEP_TITLES.get(step) or OE_STEP_TITLES.get(1, "Step"))
 
-    st.markdown(
-        f"""
-        <div style="text-align:center; margin-top: 0;">
-          <h2 style="margin: 0 0 0.25rem 0;">{step_title}</h2>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+def oe_share_token(step: int):
+    """
+    Token for a link that reopens this walkthrough, as it is now, at `step`.
+    None when the token would be longer than a link may carry (MAX_TOKEN_CHARS).
+    """
+    oe_sync_record(step)
+    token = to_token(st.session_state[OE_RECORD_KEY], step)
+    if len(token) > MAX_TOKEN_CHARS:
+        st.session_state.pop(OE_SHARE_TOKEN_KEY, None)
+        return None
+    st.session_state[OE_SHARE_TOKEN_KEY] = token
+    return token
 
-    st.markdown(
-        """
-        <hr style='
-            margin: 14px 0 20px 0;
-            border: none;
-            height: 2px;
-            background: linear-gradient(
-                90deg,
-                rgba(76,139,245,0.15),
-                rgba(76,139,245,0.55),
-                rgba(76,139,245,0.15)
-            );
-        '>
-        """,
-        unsafe_allow_html=True,
-    )
+
+def oe_share_url(token: str) -> str:
+    """
+    The link for `token`: the app's address with ?resume= only. This session's
+    ?record= and ?session= stay out of it, or the recipient would reopen (and
+    then autosave over) the author's record and join the author's session.
+    """
+    base = getattr(st.context, "url", "") or ""
+    if base:
+        base = urlsplit(base)._replace(query="", fragment="").geturl()
+    return f"{base}?{urlencode({'resume': token})}"
 
 
-def render_open_ended():
-    oe_init_record()
+def oe_open_share_token(token: str) -> bool:
+    """Loads the state a share token carries into this session. False if the token is not valid."""
+    try:
+        rec, step = from_token(token)
+    except ValueError:
+        return False
+    _oe_load_record(rec, step)
+    st.session_state[OE_SHARE_TOKEN_KEY] = token
+    return True
 
-    if "oe_step" not in st.session_state:
-        st.session_state["oe_step"] = 1
 
-    total_steps = OE_TOTAL_STEPS
-    step = int(st.session_state["oe_step"])
+# ---------- Externalized session state (several server processes) ----------
 
-    step = max(1, min(step, total_steps))
-    st.session_state["oe_step"] = step
+# "sqlite:data/sessions.sqlite3" or "redis://host:6379/0" (app/serve.py --session-backend).
+# Empty: session state stays in the Streamlit process, as with a single server.
+OE_SESSION_BACKEND = os.environ.get("OE_SESSION_BACKEND", "")
 
-    _render_open_header(step)
-    st.progress(step / float(total_steps))
+OE_SESSION_SYNC_KEY = "_oe_session_sync"
 
-    st.markdown(
-        f"""
-        <div style="
-            margin-top: -12px;
-            font-size: 0.85rem;
-            color: rgba(229,231,235,0.75);
-        ">
-            Step {step} of {total_steps}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-    
+# Buttons: Streamlit does not allow setting their state, so they stay in-process.
+_OE_LOCAL_KEY_PREFIXES = ("oe_csf_search_pick_", "oe_generate_pdf")
 
-    # ==========================================================
-    # TILE HELPER (safe)
-    # ==========================================================
-    def _render_step_tile_html(title: str, body_html: str = ""):
-        st.markdown(
-            f"""
-            <div class="listbox walkthrough-tile">
-              <div class="walkthrough-step-title">{title}</div>
-              {body_html}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
 
+def _oe_externalized(key) -> bool:
+    """The record, every oe_* key and the landing gate; keys starting with "_" are process-local."""
+    if not isinstance(key, str):
+        return False
+    return key == "landing_complete" or (key.startswith("oe_") and not key.startswith(_OE_LOCAL_KEY_PREFIXES))
 
-    # ==========================================================
-    # STEP 1: Scenario Description
-    # ==========================================================
-    if step == 1:
-        # Instruction text above the input
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            Describe the situation requiring a decision. Include:
-            <ul class="tight-list" style="margin-bottom: 0.75rem;">
-                <li>What happened or what is being proposed</li>
-                <li>When the decision must be made</li>
-                <li>What constraints exist (time, resources, information)</li>
-            </ul>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
 
-        # Text box with ONLY guidance as placeholder
-        scenario_description = st.text_area(
-            "Scenario Description",
-            key="oe_scenario_description",
-            height=120,
-            placeholder="(Example: Following a suspected ransomware incident, some municipal systems have been restored while others remain offline. A decision is required on whether to further isolate network segments to limit potential spread, which would disrupt services that are currently functioning. The decision must be made quickly with limited information about the scope of compromise.)",
-            label_visibility="collapsed",
-        )
+def oe_session_pull():
+    """
+    Start of a rerun: loads the session's state from the backend if another
+    process saved a newer version (one version read otherwise). The session
+    ID travels in the URL (?session=...), the one thing every process sees.
+    """
+    if not OE_SESSION_BACKEND:
+        return
+    sid = st.query_params.get("session")
+    resume = st.query_params.get("resume")
+    if resume and st.session_state.get(OE_SHARE_TOKEN_KEY) != resume:
+        # A share link not opened yet starts a session of its own (main() drops ?session)
+        sid = None
+    sync = st.session_state.get(OE_SESSION_SYNC_KEY)
+    if sync is None or (sid and sync.session_id != sid):
+        store = shared_session_store(OE_SESSION_BACKEND)
+        sync = st.session_state[OE_SESSION_SYNC_KEY] = SessionSync(store, sid or new_session_id(), _oe_externalized)
+    sync.pull(st.session_state)
+
+
+def oe_session_push():
+    """End of a rerun (also when it ends in st.rerun()): saves the state if anything changed."""
+    sync = st.session_state.get(OE_SESSION_SYNC_KEY)
+    if sync is None:
+        return
+    if sync.push(st.session_state) and st.query_params.get("session") != sync.session_id:
+        st.query_params["session"] = sync.session_id
 
 
-    # ==========================================================
-    # STEP 2: Decision Point
-    # ==========================================================
-    elif step == 2:
-        # Instruction text above the input
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            What is the specific operational decision being considered?
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+# ---------- Idle sessions spilled to disk ----------
 
-        # Text box with ONLY guidance as placeholder
-        scenario_description = st.text_area(
-            "Decision Point",
-            key="oe_decision_point",
-            height=120,
-            placeholder="(Example: Whether to further isolate additional network segments to prevent potential ransomware spread.)",
-            label_visibility="collapsed",
-        )
+# Seconds without a rerun before a session's state is spilled (0: never)
+OE_SPILL_TTL = float(os.environ.get("OE_SESSION_SPILL_TTL", 1800))
+OE_SPILL_DIR = Path("data/spill")
 
+# Process-local caches a spilled session drops instead of saving (rebuilt on demand)
+_OE_SPILL_DROP = {"_oe_csf_catalog_pin", "_oe_export_cache"}
 
-    # ==========================================================
-    # STEP 3: Procedural Context
-    # ==========================================================
-    elif step == 3:
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            Which question best matches the procedural situation you are addressing?
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
 
-        selected = st.radio(
-            label="Procedural Context",
-            options=list(CSF_FUNCTION_PROMPTS.keys()),
-            index=None,  # no default selection
-            format_func=lambda k: CSF_FUNCTION_PROMPTS[k]["prompt"],
-            key="oe_csf_function_choice",
-            label_visibility="collapsed",
-        )
+class _SessionStateView:
+    """A session's state as a mapping, usable outside its script thread."""
 
-        if selected:
-            st.session_state["oe_csf_function"] = selected
-            label = CSF_FUNCTION_PROMPTS.get(selected, {}).get("label", selected)
-            st.info(f"Procedural context informed by NIST CSF Function: **{label}**")
-        else:
-            st.session_state["oe_csf_function"] = ""
-
-
-    # ==========================================================
-    # STEP 4: Technical Obligation(s)
-    # ==========================================================
-    elif step == 4:
-        csf_fn_index, categories, subcats, cats_by_fn, subs_by_cat, _refs_by_subcat = load_csf_export_index(str(CSF_EXPORT_PATH))
-
-        selected_fn = st.session_state.get("oe_csf_function", "")
-        fn_ids = [selected_fn] if selected_fn else list(csf_fn_index.keys())
-
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            Identify the technical obligations implicated by this decision.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    __slots__ = ("_state",)
 
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 0.85rem 0;
-                font-size: 0.9rem;
-                color: rgba(229,231,235,0.65);
-                line-height: 1.4;
-            ">
-            First, select the relevant CSF technical areas (categories). Then, select the specific CSF outcomes (technical obligations) implicated by this decision.
-            Add additional technical obligations only if they are not captured by the CSF outcomes.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    def __init__(self, state):
+        self._state = state
 
-        # -----------------------------
-        # A) Select technical areas (categories)
-        # -----------------------------
-        selected_cat_ids = []
-        for fn_id in fn_ids:
-            fn = csf_fn_index.get(fn_id, {})
-            fn_title = fn.get("title", fn_id)
-            fn_desc = fn.get("description", "")
-
-            st.markdown(
-                f"""
-                <div style="margin: 0.75rem 0 0.25rem 0; font-weight: 800;">
-                {fn_title}
-                </div>
-                <div style="margin: 0 0 0.5rem 0; color: rgba(229,231,235,0.70); font-size: 0.9rem; line-height: 1.4;">
-                {fn_desc}
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+    def keys(self):
+        return list(self._state.filtered_state.keys())
 
-            for cat_id in cats_by_fn.get(fn_id, []):
-                cat = categories.get(cat_id, {})
-                cat_title = cat.get("title", cat_id)
-                cat_desc = cat.get("description", "")
-
-                cat_checked = st.checkbox(
-                    cat_title,
-                    key=f"oe_csf_cat_{cat_id}",
-                    help=cat_desc if cat_desc else None,
-                )
-                if cat_checked:
-                    selected_cat_ids.append(cat_id)
-
-        selected_cat_ids = list(dict.fromkeys(selected_cat_ids))
-        st.session_state["oe_csf_categories_selected"] = selected_cat_ids
-
-        st.markdown("---")
-
-        # -----------------------------
-        # B) Select technical obligations (outcomes under selected categories)
-        # -----------------------------
-        selected_subcat_ids = []
-
-        if selected_cat_ids:
-            st.markdown(
-                """
-                <div style="margin: 0 0 0.35rem 0; font-weight: 700;">
-                Technical obligations (CSF outcomes)
-                </div>
-                <div style="margin: 0 0 0.75rem 0; color: rgba(229,231,235,0.65); font-size: 0.9rem; line-height: 1.4;">
-                Select the outcomes that are directly implicated by this decision point.
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+    def __contains__(self, key):
+        return key in self._state
 
-            for cat_id in selected_cat_ids:
-                cat = categories.get(cat_id, {})
-                cat_title = cat.get("title", cat_id)
-                cat_desc = cat.get("description", "")
-
-                st.markdown(
-                    f"""
-                    <div style="margin: 0.5rem 0 0.25rem 0; font-weight: 800;">
-                    {cat_title}
-                    </div>
-                    <div style="margin: 0 0 0.4rem 0; color: rgba(229,231,235,0.70); font-size: 0.9rem; line-height: 1.35;">
-                    {cat_desc}
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-
-                for sid in subs_by_cat.get(cat_id, []):
-                    s_text = (subcats.get(sid, {}) or {}).get("text", sid)
-                    s_checked = st.checkbox(
-                        s_text,
-                        key=f"oe_csf_sub_{sid}",
-                    )
-                    if s_checked:
-                        selected_subcat_ids.append(sid)
-
-        selected_subcat_ids = list(dict.fromkeys(selected_subcat_ids))
-        st.session_state["oe_csf_outcomes_selected"] = selected_subcat_ids
-
-        st.markdown("---")
-
-        # -----------------------------
-        # C) Additional technical obligations (only if needed)
-        # -----------------------------
-        addl_text = st.text_area(
-            "Additional technical obligations (optional)",
-            key="oe_technical_additional_text",
-            height=120,
-            placeholder=(
-                "Use short phrases. One per line.\n"
-                "Examples:\n"
-                "- Preserve forensic evidence\n"
-                "- Maintain continuity of 911 dispatch workflows\n"
-                "- Prevent lateral movement across segmented networks"
-            ),
-        )
+    def __getitem__(self, key):
+        return self._state[key]
 
-        addl_lines = [ln.strip("•- \t").strip() for ln in (addl_text or "").splitlines()]
-        addl_considerations = [ln for ln in addl_lines if ln]
-
-        # -----------------------------
-        # D) Unified list for Step 9 (obligations)
-        # -----------------------------
-        unified = []
-
-        # Primary: selected CSF outcomes as obligations
-        for sid in selected_subcat_ids:
-            text = (subcats.get(sid, {}) or {}).get("text", sid)
-            text_short = (text[:180] + "…") if len(text) > 180 else text
-            unified.append(text_short)
-
-        # Secondary (optional): include selected category titles as high-level obligations
-        # Comment this in if you want category-level obligations in Step 9 as well.
-        # for cat_id in selected_cat_ids:
-        #     unified.append((categories.get(cat_id, {}) or {}).get("title", cat_id))
-
-        unified.extend(addl_considerations)
-
-        # De-dupe, preserve order
-        unified = list(dict.fromkeys([u for u in unified if u]))
-
-        st.session_state["oe_technical_considerations"] = unified
-
-
-    # ==========================================================
-    # STEP 5: STAKEHOLDER IDENTIFICATION
-    # ==========================================================
-    elif step == 5:
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            Which stakeholders are affected by or involved in this decision?
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    def __setitem__(self, key, value):
+        self._state[key] = value
+
+    def __delitem__(self, key):
+        del self._state[key]
 
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 0.75rem 0;
-                font-size: 0.9rem;
-                color: rgba(229,231,235,0.65);
-                line-height: 1.4;
-            ">
-            Select all that apply. If a stakeholder is missing, add it under “Other.”
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
 
-        selected_stakeholders = []
+def get_spill_manager() -> SpillManager:
+    return shared_spill_manager(
+        OE_SPILL_DIR, OE_SPILL_TTL, _oe_externalized, _OE_SPILL_DROP.__contains__, _SessionStateView,
+    )
 
-        # Scannable list (NO fixed-height container so "Other" sits directly under the last item)
-        for stakeholder in STAKEHOLDER_OPTIONS:
-            if st.checkbox(stakeholder, key=f"oe_stakeholders_{hash(stakeholder)}"):
-                selected_stakeholders.append(stakeholder)
 
+def _oe_runtime_session():
+    """(Streamlit session ID, its session state object), or (None, None) outside a script run."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-        # "Other" row: checkbox left, textbox right (appears immediately when checked)
-        col_l, col_r = st.columns([1, 2], gap="large")
+    ctx = get_script_run_ctx()
+    if not ctx:
+        return None, None
+    # ctx.session_state is a thread-safe wrapper made anew for every script run;
+    # the SessionState inside it lives as long as the session, so that is what
+    # the spill manager tracks (and holds weakly).
+    return ctx.session_id, getattr(ctx.session_state, "_state", ctx.session_state)
 
-        with col_l:
-            add_other = st.checkbox(
-                "Other stakeholder(s) not listed",
-                key="oe_stakeholders_other_toggle",
-            )
 
-        other_text = ""
-        with col_r:
-            if add_other:
-                other_text = st.text_area(
-                    "Other stakeholders",
-                    key="oe_stakeholders_other_text",
-                    height=80,
-                    placeholder="Example: Regional 911 dispatch, county emergency management, union representatives",
-                    label_visibility="collapsed",
-                ).strip()
-            else:
-                st.empty()
+def oe_restore_spilled():
+    """Brings this session's state back if it was spilled (a no-op for a live session)."""
+    if OE_SPILL_TTL <= 0:
+        return
+    sid, state = _oe_runtime_session()
+    if sid:
+        mgr = get_spill_manager()
+        mgr.touch(sid, state)
+        mgr.release(sid)
 
-        # Parse “Other” into list (comma-separated), combine, de-dupe
-        other_list = [s.strip() for s in other_text.split(",") if s.strip()]
-        combined = list(dict.fromkeys(selected_stakeholders + other_list))
 
-        # Persist
-        st.session_state["oe_stakeholders"] = combined
+# Nesting depth of oe_session_begin on this script thread (fragments begin inside main's rerun)
+_oe_rerun = threading.local()
 
-    # ==========================================================
-    # STEP 6: Ethical Consideration(s) — PFCE-informed (mirrors Step 4)
-    # ==========================================================
-    elif step == 6:
 
-        # ---------- A) Ethical Salience Check (fast triage; optional) ----------
-        with st.container():
-            st.markdown('<div class="pfce-surfacing-anchor"></div>', unsafe_allow_html=True)
+def oe_session_begin():
+    """Start of every rerun: brings back a spilled session, then pulls shared state."""
+    _oe_rerun.depth = getattr(_oe_rerun, "depth", 0) + 1
+    if _oe_rerun.depth > 1:
+        return
+    if OE_SPILL_TTL > 0:
+        sid, state = _oe_runtime_session()
+        if sid:
+            get_spill_manager().touch(sid, state)
+    oe_session_pull()
 
-            csf_section_open(
-                "Ethical Salience Check",
-                "Select any statements that apply. This step helps surface whether ethical considerations are in play at this decision point."
-            )
 
-            selected_salience_ids = []
-            for item in PFCE_SURFACING_PROMPTS:
-                sid = item["id"]
-                text = item["prompt"]
-                if st.checkbox(text, key=f"oe_pfce_salience_{sid}"):
-                    selected_salience_ids.append(sid)
-
-            st.session_state["oe_pfce_salience_selected"] = selected_salience_ids
-            csf_section_close()
-
-        # Derive suggested principles (no gating)
-        suggested = []
-        for item in PFCE_SURFACING_PROMPTS:
-            if item["id"] in (st.session_state.get("oe_pfce_salience_selected") or []):
-                suggested.extend(item.get("maps_to", []))
-        suggested = list(dict.fromkeys(suggested))
-
-        # ---------- B) Select PFCE principle(s) (lenses) ----------
-        with st.container():
-            st.markdown('<div class="pfce-principles-anchor"></div>', unsafe_allow_html=True)
-
-            csf_section_open(
-                "PFCE Principles",
-                "Select any PFCE principles implicated by this decision point. Definitions are available as tooltips."
-            )
+def oe_session_end():
+    """End of every rerun: saves shared state; the session's idle time starts."""
+    _oe_rerun.depth = max(0, getattr(_oe_rerun, "depth", 0) - 1)
+    if _oe_rerun.depth:
+        return
+    try:
+        oe_session_push()
+    finally:
+        if OE_SPILL_TTL > 0:
+            sid, _ = _oe_runtime_session()
+            if sid:
+                get_spill_manager().release(sid)
 
-            if suggested:
-                st.caption("Suggested based on salience selections (optional): " + ", ".join(suggested))
 
-            selected_pfce = []
-            # Keep ordering stable and consistent with PFCE_DEFINITIONS
-            for pid in PFCE_DEFINITIONS.keys():
-                definition = (PFCE_DEFINITIONS.get(pid, "") or "").strip()
-                default_checked = pid in suggested
+# st.fragment (st.experimental_fragment before Streamlit 1.37); None if neither exists
+OE_FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
 
-                if st.checkbox(
-                    pid,
-                    key=f"oe_pfce_{pid}",
-                    value=default_checked,
-                    help=definition if definition else None,
-                ):
-                    selected_pfce.append(pid)
 
-            st.session_state["oe_pfce_principles"] = selected_pfce
+def oe_step_fragment(fn):
+    """
+    Makes `fn` a fragment: a widget inside it reruns only `fn`, not the whole
+    script. A fragment rerun skips main(), so `fn` brackets itself with
+    oe_session_begin/oe_session_end (no-ops inside a full rerun). Without
+    fragment support `fn` is an ordinary function.
+    """
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        oe_session_begin()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            oe_session_end()
 
-            if selected_pfce:
-                st.info("Principles selected: **" + ", ".join(selected_pfce) + "**")
-            else:
-                st.info("Principles selected: **None selected**")
+    return OE_FRAGMENT(run) if OE_FRAGMENT else fn
 
-            csf_section_close()
 
-        # ---------- C) Select ethical considerations (PFCE sub-nodes) ----------
-        # These are interpretive cues drawn from PFCE Fig. 1, not an exhaustive obligation list.
-        with st.container():
-            st.markdown('<div class="pfce-considerations-anchor"></div>', unsafe_allow_html=True)
+def step_status() -> dict:
+    """Which step modules this process has loaded and their import times (?status=steps)."""
+    from app.steps import import_timings
 
-            csf_section_open(
-                "Ethical Considerations",
-                "Select the PFCE ethical considerations implicated by this decision point. Add additional ethical considerations only if needed."
-            )
+    return import_timings()
 
-            ethical_selected = []
 
-            selected_pfce = st.session_state.get("oe_pfce_principles", []) or []
-            if not selected_pfce:
-                st.info("No PFCE principles selected. You may proceed without selecting ethical considerations.")
-            else:
-                for pid in selected_pfce:
-                    # Section header per principle
-                    st.markdown(f"**{pid}**")
-
-                    for idx, node in enumerate(PFCE_SUBNODES.get(pid, []), start=1):
-                        if st.checkbox(node, key=f"oe_pfce_node_{pid}_{idx}"):
-                            ethical_selected.append(f"{pid}: {node}")
-
-            st.markdown("---")
-
-            addl_text = st.text_area(
-                "Additional ethical considerations (optional)",
-                key="oe_ethical_additional_text",
-                height=110,
-                placeholder=(
-                    "Use short phrases. One per line.\n"
-                    "Examples:\n"
-                    "- Risk of undermining public trust through delayed disclosure\n"
-                    "- Disproportionate impact on residents without alternative service access"
-                ),
-                label_visibility="collapsed",
-            )
+def session_status() -> dict:
+    """Spill counters for this process (?status=sessions)."""
+    if OE_SPILL_TTL <= 0:
+        return {"spill": "off"}
+    return {"spill_ttl_seconds": OE_SPILL_TTL, **get_spill_manager().stats()}
 
-            addl_lines = [ln.strip("•- \t").strip() for ln in (addl_text or "").splitlines()]
-            addl_items = [ln for ln in addl_lines if ln]
 
-            # Unified list for Step 9 / export
-            unified = list(dict.fromkeys([x for x in (ethical_selected + addl_items) if x]))
-            st.session_state["oe_ethical_considerations"] = unified
+CSF_EXPORT_PATH = Path("data/csf-export.json")  # update if you renamed the file
 
-            csf_section_close()
+# Seconds between checks of the export for changes (hot reload)
+CSF_RELOAD_INTERVAL = 5.0
 
-        # Keep the old oe_pfce_pressure structure in a harmless default state (so nothing downstream breaks)
-        # You can remove this once you fully migrate Step 9 to use oe_ethical_considerations instead.
-        st.session_state["oe_pfce_pressure"] = {
-            "summary": "",
-            "principles": st.session_state.get("oe_pfce_principles", []) or [],
-            "salience_selected": st.session_state.get("oe_pfce_salience_selected", []) or [],
-        }
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                      
-
-    # ==========================================================
-    # STEP 7: TENSION IDENTIFICATION (selection-based)
-    # ==========================================================
-    elif step == 7:
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            Identify the central decision tension at this decision point.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+# Session key holding (step, version, catalog) for the step the user is on
+CSF_CATALOG_PIN_KEY = "_oe_csf_catalog_pin"
 
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 0.75rem 0;
-                font-size: 0.9rem;
-                color: rgba(229,231,235,0.65);
-                line-height: 1.4;
-            ">
-            Select two obligations or commitments that cannot both be fully satisfied at this decision point.
-            These may be ethical, technical, or both.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
 
-        # Pull obligations from prior steps
-        tech = st.session_state.get("oe_technical_considerations", []) or []
-        ethical = st.session_state.get("oe_ethical_considerations", []) or []
-
-        # Minimal guardrails (no gating)
-        if not tech and not ethical:
-            st.info("No technical or ethical obligations were recorded in prior steps.")
-            st.session_state["oe_tension_a"] = ""
-            st.session_state["oe_tension_b"] = ""
-            st.session_state["oe_tension_type"] = "Not specified"
-            st.session_state["oe_tension_statement"] = ""
-        else:
-            # Build a unified list of selectable obligations with stable IDs
-            items = []  # each item: {"id":..., "text":..., "origin":...}
-
-            for i, t in enumerate(tech):
-                items.append({"id": f"tech::{i}", "text": t, "origin": "technical"})
-
-            for i, e in enumerate(ethical):
-                items.append({"id": f"eth::{i}", "text": e, "origin": "ethical"})
-
-            placeholder_id = "__none__"
-
-            # Maps for display and lookup
-            id_to_text = {it["id"]: it["text"] for it in items}
-            id_to_origin = {it["id"]: it["origin"] for it in items}
-
-            # Selection UI: use IDs as the values, show text to user
-            with st.container():
-                st.markdown('<div class="tension-anchor"></div>', unsafe_allow_html=True)
-
-                csf_section_open(
-                    "Decision Tension",
-                    "Select the two competing obligations that best represent the tension."
-                )
-
-                all_ids = [placeholder_id] + [it["id"] for it in items]
-
-                a_id = st.selectbox(
-                    "Obligation / Commitment A",
-                    options=all_ids,
-                    index=0,
-                    key="oe_tension_a_id",
-                    format_func=lambda x: "— Select an obligation —" if x == placeholder_id else id_to_text.get(x, ""),
-                )
-
-                # Filter B list to prevent choosing the same item twice
-                b_ids = [placeholder_id] + [it["id"] for it in items if it["id"] != a_id]
-
-                b_id = st.selectbox(
-                    "Obligation / Commitment B",
-                    options=b_ids,
-                    index=0,
-                    key="oe_tension_b_id",
-                    format_func=lambda x: "— Select an obligation —" if x == placeholder_id else id_to_text.get(x, ""),
-                )
-
-                a_clean = "" if a_id == placeholder_id else id_to_text.get(a_id, "").strip()
-                b_clean = "" if b_id == placeholder_id else id_to_text.get(b_id, "").strip()
-
-                st.session_state["oe_tension_a"] = a_clean
-                st.session_state["oe_tension_b"] = b_clean
-                st.session_state["oe_tension_statement"] = f"{a_clean}  ⟷  {b_clean}".strip(" ⟷ ")
-
-                # Infer tension type only when both are selected
-                if a_clean and b_clean:
-                    a_type = id_to_origin.get(a_id, "")
-                    b_type = id_to_origin.get(b_id, "")
-
-                    if a_type == "ethical" and b_type == "ethical":
-                        ttype = "Ethical–Ethical"
-                    elif a_type == "technical" and b_type == "technical":
-                        ttype = "Technical–Technical"
-                    elif (a_type in ("ethical", "technical")) and (b_type in ("ethical", "technical")):
-                        ttype = "Ethical–Technical"
-                    else:
-                        ttype = "Not specified"
-
-                    st.session_state["oe_tension_type"] = ttype
-                    st.caption(f"Tension type inferred: **{ttype}**")
-
-                elif a_clean or b_clean:
-                    st.session_state["oe_tension_type"] = "Not specified"
-                    st.caption("Partial tension noted. Select both sides to capture the tension.")
-                else:
-                    st.session_state["oe_tension_type"] = "Not specified"
-                    st.caption("No tension recorded.")
-
-                csf_section_close()
-
-            # Optional override (only after both are selected)
-            if st.session_state.get("oe_tension_a") and st.session_state.get("oe_tension_b"):
-                override = st.checkbox("Override inferred tension type (optional)", key="oe_tension_override_toggle")
-                if override:
-                    st.radio(
-                        "Tension type",
-                        options=["Not specified", "Ethical–Technical", "Technical–Technical", "Ethical–Ethical"],
-                        index=["Not specified", "Ethical–Technical", "Technical–Technical", "Ethical–Ethical"].index(
-                            st.session_state.get("oe_tension_type", "Not specified")
-                        ),
-                        key="oe_tension_type",
-                        horizontal=True,
-                    )
+def get_csf_store(path: str) -> CatalogStore:
+    """
+    Process-wide, versioned CSF catalog store shared by every session. The
+    catalog is built from the snapshot when current, otherwise the JSON
+    export, and is rebuilt in the background when the export changes.
+    app/serve.py warms the same store before the server starts; without it
+    the first session to need the catalog builds it and any others wait.
+    """
+    store = shared_store(path)
+    store.start_watcher(CSF_RELOAD_INTERVAL)
+    return store
 
 
-    # ==========================================================
-    # STEP 8: INSTITUTIONAL AND GOVERNANCE CONSTRAINTS
-    # ==========================================================
-    elif step == 8:
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 6px 0;
-                font-weight: 500;
-                color: rgba(229,231,235,0.90);
-                font-size: 1.05rem;
-                line-height: 1.45;
-            ">
-            What institutional or governance constraints shape this decision?
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+def csf_catalog_status() -> dict:
+    """Readiness of the shared catalog (does not trigger a build)."""
+    return shared_store(str(CSF_EXPORT_PATH)).status()
+
 
-        st.markdown(
-            """
-            <div style="
-                margin: 0 0 0.75rem 0;
-                font-size: 0.9rem;
-                color: rgba(229,231,235,0.65);
-                line-height: 1.4;
-            ">
-            Select all that apply. These constraints limit or shape feasible actions or justifications.
-            </div>
-            """,
-            unsafe_allow_html=True
+def get_csf_catalog(step: int) -> CsfCatalog:
+    """
+    The catalog this session sees on `step`. A session keeps the version it
+    entered the step with, even if a newer one is swapped in meanwhile; it
+    picks up the new version when it moves to another step.
+    """
+    pin = st.session_state.get(CSF_CATALOG_PIN_KEY)
+    if pin and pin[0] == step:
+        return pin[2]
+
+    version, catalog = get_csf_store(str(CSF_EXPORT_PATH)).current()
+    st.session_state[CSF_CATALOG_PIN_KEY] = (step, version, catalog)
+    return catalog
+
+
+def csf_rollup_summary(catalog: CsfCatalog, sub_ids) -> str:
+    """e.g. 'GOVERN (GV): 3 outcomes in 2 categories · PROTECT (PR): 1 outcome in 1 category'"""
+    parts = []
+    for fn_id, cats in catalog.tree.rollup(sub_ids).items():
+        fn = catalog.functions.get(fn_id)
+        n_subs = sum(len(v) for v in cats.values())
+        parts.append(
+            f"{fn.title if fn else fn_id} ({fn_id}): "
+            f"{n_subs} outcome{'s' if n_subs != 1 else ''} in "
+            f"{len(cats)} categor{'ies' if len(cats) != 1 else 'y'}"
         )
+    return " · ".join(parts)
 
-        selected_constraints = []
 
-        for c in TEMP_CONSTRAINT_OPTIONS:
-            if st.checkbox(c, key=f"oe_constraint_{c}"):
-                selected_constraints.append(c)
+# Session key holding (catalog version, summary lines) for the current record
+OE_EXPORT_CACHE_KEY = "_oe_export_cache"
 
-        # "Other" constraint (inline)
-        col_l, col_r = st.columns([1, 2], gap="large")
 
-        with col_l:
-            add_other = st.checkbox(
-                "Other constraint(s) not listed",
-                key="oe_constraints_other_toggle",
-            )
+def oe_export_lines() -> list:
+    """
+    The record's summary lines for export. Cached until oe_sync_record
+    reports a change or a new catalog version is swapped in.
+    """
+    version, catalog = get_csf_store(str(CSF_EXPORT_PATH)).current()
+    cached = st.session_state.get(OE_EXPORT_CACHE_KEY)
+    if cached and cached[0] == version:
+        return cached[1]
+    rec = st.session_state.get(OE_RECORD_KEY) or engine.init_record()
+    lines = engine.summary_lines(rec, catalog)
+    st.session_state[OE_EXPORT_CACHE_KEY] = (version, lines)
+    return lines
 
-        other_text = ""
-        with col_r:
-            if add_other:
-                other_text = st.text_area(
-                    "Other constraints",
-                    key="oe_constraints_other",
-                    height=80,
-                    placeholder="Example: Pending litigation, labor agreement provisions, state-level oversight",
-                    label_visibility="collapsed",
-                ).strip()
-            else:
-                st.empty()
 
-        # Combine + de-dupe
-        other_list = [s.strip() for s in other_text.split(",") if s.strip()]
-        combined = list(dict.fromkeys(selected_constraints + other_list))
+def _render_open_header(step: int):
+    step_title = html.escape(OE_STEP_TITLES.get(step) or OE_STEP_TITLES.get(1, "Step"))
+
+    st.markdown(
+        f"""
+        <div class="oe-step-heading">
+          <h2>{step_title}</h2>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
 
-        # Persist
-        st.session_state["oe_constraints"] = combined
+    st.markdown('<hr class="oe-rule">', unsafe_allow_html=True)
 
-        # Feedback + gating
-        if combined:
-            st.info("Constraints identified: **" + ", ".join(combined) + "**")
-        else:
-            st.info("Constraints identified: **None selected**")
 
+def render_open_ended():
+    oe_init_record()
+    oe_migrate_session_state()
 
-    # ==========================================================
-    # STEP 9: DECISION + OUTPUT 
-    # ==========================================================
-    elif step == 9:
-        _render_step_tile_html(
-            "Record the decision in operational terms, then generate a structured rationale for demonstration purposes.",
-        )
+    if "oe_step" not in st.session_state:
+        st.session_state["oe_step"] = 1
 
-        st.text_area(
-            "Decision (operational)",
-            key="oe_decision_documentation",
-            height=120,
-            placeholder="Example: Disconnect additional systems while confirming scope; preserve critical service workflows via manual workarounds.",
-        )
+    total_steps = OE_TOTAL_STEPS
+    step = int(st.session_state["oe_step"])
+
+    step = max(1, min(step, total_steps))
+    st.session_state["oe_step"] = step
+
+    # The CSF catalog pin (see get_csf_catalog) only lasts while the session stays on one step
+    pin = st.session_state.get(CSF_CATALOG_PIN_KEY)
+    if pin and pin[0] != step:
+        del st.session_state[CSF_CATALOG_PIN_KEY]
+
+    # Widgets of a step left earlier (or of a resumed record) show what the record holds
+    _oe_restore_step_widgets(step)
+
+    _render_open_header(step)
+    st.progress(step / float(total_steps))
+
+    record_id = st.session_state.get(OE_RECORD_ID_KEY)
+    saved_note = f" · autosaved as record {html.escape(record_id)}" if record_id else ""
+
+    st.markdown(
+        f"""
+        <div class="oe-step-meta">
+            Step {step} of {total_steps}{saved_note}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    
 
-        # ✅ Sync record ONLY here (or on Next/Prev)
-        oe_sync_record()
-        rec = st.session_state[OE_RECORD_KEY]
+    # One module per step, imported on first use (see app/steps)
+    from app.steps import step_module
 
-        # export rec (PDF generation, etc.) goes here
+    step_module(step).render(step)
 
 
     # NAV CONTROLS (NO GATING)
@@ -1303,21 +813,43 @@ def render_open_ended():
 
         with col_l:
             if step > 1:
-                if st.button("◀ Previous", key=f"oenav_prev_{step}"):
+                if st.button("◀ Previous", key=oe_widget_key("oenav_prev", step)):
+                    oe_autosave(step, step - 1)
                     st.session_state["oe_step"] = step - 1
-                    _safe_rerun()
+                    safe_rerun()
             else:
                 st.empty()
 
         with col_r:
             if step < total_steps:
-                if st.button("Next ▶", key=f"oenav_next_{step}"):
+                if st.button("Next ▶", key=oe_widget_key("oenav_next", step)):
+                    oe_autosave(step, step + 1)
                     st.session_state["oe_step"] = step + 1
-                    _safe_rerun()
+                    safe_rerun()
             else:
                 if st.button("Generate PDF", key="oe_generate_pdf", use_container_width=False):
+                    oe_autosave(step, step)
                     st.session_state["oe_generate"] = True
-                    _safe_rerun()
+                    safe_rerun()
+
+        with st.expander("Share / resume link"):
+            st.caption(
+                "The link carries this walkthrough's state itself; nothing is stored on the server. "
+                "Anyone with the link can read what has been entered."
+            )
+            if st.button("Create link", key="oenav_share"):
+                token = oe_share_token(step)
+                if token:
+                    st.code(oe_share_url(token), language=None)
+                    st.caption(
+                        f"Copy this link ({len(token)} characters of state). It shows the walkthrough "
+                        "as it is now; this page's own address (and autosaved record) is unchanged."
+                    )
+                else:
+                    st.warning(
+                        "This walkthrough holds too much text to fit in a link. "
+                        "Use the autosaved record link (Next ▶ saves it) instead."
+                    )
 
 
 
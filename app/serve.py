@@ -0,0 +1,83 @@
+"""
+Server entry point: builds the CSF catalog, then starts Streamlit.
+
+    python app/serve.py [--ready-file PATH] [streamlit run options...]
+
+The catalog is loaded into the process-wide store before the server starts
+listening, so the first sessions after a deploy find it ready instead of
+racing to build it. Streamlit runs in this same process and reuses the
+warmed store.
+
+Readiness: the catalog status (version, build time) is logged. With
+--ready-file it is also written there as JSON once the catalog is loaded,
+for container health checks (pair it with Streamlit's /_stcore/health for
+the server itself). In the browser, ?status=catalog shows the same status.
+
+The stylesheet is checked first (app.theme.offline_problems): the server
+does not start if it would fetch anything off-site or a file it names, such
+as the Inter font, is missing from app/static/.
+
+Several processes behind a proxy: pass --session-backend (or set
+OE_SESSION_BACKEND) to the same "sqlite:PATH" or "redis://host:port/db" in
+each, so a session's state follows it to whichever process serves it.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app import open_ended
+from app.open_ended import CSF_EXPORT_PATH, CSF_RELOAD_INTERVAL
+from app.theme import offline_problems, write_theme_bundle
+from logic.csf_store import warm_up
+
+log = logging.getLogger("app.serve")
+
+
+def _write_ready_file(path: str, status: dict):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(status, f)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--ready-file", help="write the catalog status here as JSON once loaded")
+    ap.add_argument("--session-backend", help='shared session state: "sqlite:PATH" or "redis://host:port/db"')
+    args, streamlit_args = ap.parse_known_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    # CSF_EXPORT_PATH is relative to the project root, as under `streamlit run`.
+    os.chdir(ROOT_DIR)
+
+    # Before anything signals readiness: a bad stylesheet means no ready file.
+    problems = offline_problems()
+    for problem in problems:
+        log.error("stylesheet: %s", problem)
+    if problems:
+        return 1
+    log.info("stylesheet bundle: app/static/%s", write_theme_bundle())
+
+    status = warm_up(str(CSF_EXPORT_PATH), watch_interval=CSF_RELOAD_INTERVAL)
+    log.info("CSF catalog ready: v%d in %.3fs", status["version"], status["build_seconds"])
+    if args.ready_file:
+        _write_ready_file(args.ready_file, status)
+    if args.session_backend:
+        open_ended.OE_SESSION_BACKEND = os.environ["OE_SESSION_BACKEND"] = args.session_backend
+    log.info("session state: %s", open_ended.OE_SESSION_BACKEND or "in-process")
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(ROOT_DIR / "app" / "main.py"), *streamlit_args]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""
+Static HTML for the page (landing page, sidebar panels, footer, banner),
+prepared once per process.
+
+The HTML is written indented in app/main.py; html_block() strips it so
+Markdown does not take it for a code block. app/main.py runs from the top
+on every rerun, so static_html() keeps each prepared string here, keyed by
+the literal's content: the first rerun in the process prepares it and later
+reruns only emit the cached string.
+"""
+import textwrap
+
+_rendered = {}
+
+
+def html_block(s: str) -> str:
+    # Prevent Markdown from treating indented HTML as a code block.
+    return "\n".join(line.lstrip() for line in textwrap.dedent(s).splitlines())
+
+
+def static_html(source: str) -> str:
+    """html_block(source), prepared on the first call for this content and cached."""
+    out = _rendered.get(source)
+    if out is None:
+        out = _rendered.setdefault(source, html_block(source))
+    return out
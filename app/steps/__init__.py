@@ -0,0 +1,62 @@
+"""
+Walkthrough steps, one module each, imported the first time a session
+reaches the step and cached for the rest of the process.
+
+STEP_MODULES maps each step of app.open_ended.OE_STEP_TITLES to its module
+here; every module has render(step). step_module() is a dict lookup once a
+step is loaded. What only one step uses loads with it: reportlab and the
+PDF builder with Step 9, the CSF search, pickers and reference pages with
+Step 4. The option tables (logic.framework, logic.record) do not: the
+engine and app.open_ended need them on every step to sync, restore and
+migrate the record. import_timings() reports how long each loaded step
+took to import (?status=steps).
+
+Step modules build on the public helpers of app.open_ended (session keys,
+oe_bit_checkbox, oe_callback, oe_step_fragment, csf_rollup_summary, ...),
+never on its underscore names.
+"""
+import importlib
+import threading
+import time
+
+STEP_MODULES = {
+    1: "scenario",
+    2: "decision_point",
+    3: "procedural_context",
+    4: "technical",
+    5: "stakeholders",
+    6: "ethical",
+    7: "tension",
+    8: "constraints",
+    9: "decision",
+}
+
+_loaded = {}
+_import_ms = {}
+_lock = threading.Lock()
+
+
+def step_module(step: int):
+    """The module that renders `step` (imported on first use). KeyError for an unknown step."""
+    module = _loaded.get(step)
+    if module is None:
+        with _lock:
+            module = _loaded.get(step)
+            if module is None:
+                t0 = time.perf_counter()
+                module = importlib.import_module(f"{__name__}.{STEP_MODULES[step]}")
+                _import_ms[step] = (time.perf_counter() - t0) * 1e3
+                _loaded[step] = module
+    return module
+
+
+def import_timings() -> dict:
+    """{step: {"module", "loaded", "import_ms"}} for every step; import_ms is None until loaded."""
+    return {
+        step: {
+            "module": f"{__name__}.{name}",
+            "loaded": step in _loaded,
+            "import_ms": round(_import_ms[step], 3) if step in _import_ms else None,
+        }
+        for step, name in STEP_MODULES.items()
+    }
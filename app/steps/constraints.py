@@ -0,0 +1,69 @@
+"""Step 8: Institutional and Governance Constraints."""
+import streamlit as st
+
+from app.open_ended import (
+    OE_CONSTRAINT_BITS_KEY,
+    oe_bit_checkbox,
+    oe_set_input,
+)
+from logic import engine
+from logic.framework import TEMP_CONSTRAINT_OPTIONS
+from logic.record import CONSTRAINT_BITS
+
+
+def render(step: int):
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        What institutional or governance constraints shape this decision?
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown(
+        """
+        <div class="oe-hint">
+        Select all that apply. These constraints limit or shape feasible actions or justifications.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    for i, c in enumerate(TEMP_CONSTRAINT_OPTIONS):
+        oe_bit_checkbox(c, OE_CONSTRAINT_BITS_KEY, i)
+
+    # "Other" constraint (inline)
+    col_l, col_r = st.columns([1, 2], gap="large")
+
+    with col_l:
+        add_other = st.checkbox(
+            "Other constraint(s) not listed",
+            key="oe_constraints_other_toggle",
+        )
+
+    other_text = ""
+    with col_r:
+        if add_other:
+            other_text = st.text_area(
+                "Other constraints",
+                key="oe_constraints_other",
+                height=80,
+                placeholder="Example: Pending litigation, labor agreement provisions, state-level oversight",
+                label_visibility="collapsed",
+            ).strip()
+        else:
+            st.empty()
+
+    # Combine + de-dupe
+    selected_constraints = CONSTRAINT_BITS.decode(st.session_state.get(OE_CONSTRAINT_BITS_KEY, 0))
+    combined = engine.unique(selected_constraints + engine.parse_comma_list(other_text))
+
+    # Persist
+    oe_set_input("constraints_selected", combined)
+
+    # Feedback + gating
+    if combined:
+        st.info("Constraints identified: **" + ", ".join(combined) + "**")
+    else:
+        st.info("Constraints identified: **None selected**")
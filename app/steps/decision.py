@@ -0,0 +1,83 @@
+"""
+Step 9: Decision (and documented rationale), and the PDF export; reportlab
+is only imported with this step.
+"""
+from io import BytesIO
+import textwrap
+
+from reportlab.lib.pagesizes import LETTER
+from reportlab.pdfgen import canvas
+import streamlit as st
+
+from app.open_ended import (
+    OE_RECORD_KEY,
+    oe_export_lines,
+    oe_mark_dirty,
+    oe_sync_record,
+)
+
+
+def _render_step_tile_html(title: str, body_html: str = ""):
+    st.markdown(
+        f"""
+        <div class="listbox walkthrough-tile">
+          <div class="walkthrough-step-title">{title}</div>
+          {body_html}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def _build_pdf(title: str, lines: list[str]) -> BytesIO:
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=LETTER)
+    width, height = LETTER
+
+    x = 54
+    y = height - 54
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(x, y, title[:120])
+    y -= 24
+
+    c.setFont("Helvetica", 10)
+
+    lines.extend(oe_export_lines())
+
+    for raw in lines:
+        wrapped = textwrap.wrap(raw, width=100) if raw else [""]
+        for wline in wrapped:
+            if y < 72:
+                c.showPage()
+                c.setFont("Helvetica", 10)
+                y = height - 54
+            c.drawString(x, y, wline)
+            y -= 14
+        y -= 6
+
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
+def render(step: int):
+    _render_step_tile_html(
+        "Record the decision in operational terms, then generate a structured rationale for demonstration purposes.",
+    )
+
+    st.text_area(
+        "Decision (operational)",
+        key="oe_decision_documentation",
+        on_change=oe_mark_dirty,
+        args=("decision_text",),
+        height=120,
+        placeholder="Example: Disconnect additional systems while confirming scope; preserve critical service workflows via manual workarounds.",
+    )
+
+    # ✅ Sync record ONLY here (or on Next/Prev)
+    oe_sync_record(9)
+    rec = st.session_state[OE_RECORD_KEY]
+
+    # export rec (PDF generation, etc.) goes here
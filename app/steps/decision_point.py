@@ -0,0 +1,27 @@
+"""Step 2: Decision Point."""
+import streamlit as st
+
+from app.open_ended import oe_mark_dirty
+
+
+def render(step: int):
+    # Instruction text above the input
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        What is the specific operational decision being considered?
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Text box with ONLY guidance as placeholder
+    scenario_description = st.text_area(
+        "Decision Point",
+        key="oe_decision_point",
+        on_change=oe_mark_dirty,
+        args=("decision_point",),
+        height=120,
+        placeholder="(Example: Whether to further isolate additional network segments to prevent potential ransomware spread.)",
+        label_visibility="collapsed",
+    )
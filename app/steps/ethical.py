@@ -0,0 +1,143 @@
+"""
+Step 6: Ethical Obligation(s), PFCE-informed: salience check, principles and
+ethical considerations (PFCE sub-nodes).
+"""
+import streamlit as st
+
+from app.open_ended import (
+    OE_NODE_BITS_KEY,
+    OE_PRINCIPLE_BITS_KEY,
+    OE_SALIENCE_BITS_KEY,
+    OE_SYNCED_STEPS_KEY,
+    csf_section_close,
+    csf_section_open,
+    oe_bit_checkbox,
+    oe_callback,
+    oe_set_input,
+    oe_toggle_bit,
+)
+from logic import engine
+from logic.framework import PFCE_DEFINITIONS, PFCE_SUBNODES, PFCE_SURFACING_PROMPTS
+from logic.record import PFCE_NODE_BITS, PRINCIPLE_BITS, SALIENCE_BITS
+
+
+@oe_callback
+def _oe_toggle_salience(i: int):
+    oe_toggle_bit(OE_SALIENCE_BITS_KEY, i)
+    # Suggested principles are ticked along with the prompt until Step 6 has been filled in
+    if 6 in st.session_state.get(OE_SYNCED_STEPS_KEY, ()) or not st.session_state[OE_SALIENCE_BITS_KEY] >> i & 1:
+        return
+    suggested, _ = PRINCIPLE_BITS.encode(engine.derive_suggested_principles([SALIENCE_BITS.options[i]]))
+    st.session_state[OE_PRINCIPLE_BITS_KEY] = st.session_state.get(OE_PRINCIPLE_BITS_KEY, 0) | suggested
+
+
+def render(step: int):
+    # ---------- A) Ethical Salience Check (fast triage; optional) ----------
+    with st.container():
+        st.markdown('<div class="pfce-surfacing-anchor"></div>', unsafe_allow_html=True)
+
+        csf_section_open(
+            "Ethical Salience Check",
+            "Select any statements that apply. This step helps surface whether ethical considerations are in play at this decision point."
+        )
+
+        salience_bits = st.session_state.get(OE_SALIENCE_BITS_KEY, 0)
+        for i, item in enumerate(PFCE_SURFACING_PROMPTS):
+            st.checkbox(
+                item["prompt"],
+                value=bool(salience_bits >> i & 1),
+                on_change=_oe_toggle_salience,
+                args=(i,),
+            )
+
+        oe_set_input("pfce_salience_selected", SALIENCE_BITS.decode(salience_bits))
+        csf_section_close()
+
+    # Derive suggested principles (no gating)
+    suggested = engine.derive_suggested_principles(st.session_state.get("oe_pfce_salience_selected"))
+
+    # ---------- B) Select PFCE principle(s) (lenses) ----------
+    with st.container():
+        st.markdown('<div class="pfce-principles-anchor"></div>', unsafe_allow_html=True)
+
+        csf_section_open(
+            "PFCE Principles",
+            "Select any PFCE principles implicated by this decision point. Definitions are available as tooltips."
+        )
+
+        if suggested:
+            st.caption("Suggested based on salience selections (optional): " + ", ".join(suggested))
+
+        # Keep ordering stable and consistent with PFCE_DEFINITIONS
+        for pid in PFCE_DEFINITIONS.keys():
+            definition = (PFCE_DEFINITIONS.get(pid, "") or "").strip()
+            oe_bit_checkbox(
+                pid,
+                OE_PRINCIPLE_BITS_KEY,
+                PRINCIPLE_BITS.position(pid),
+                help=definition if definition else None,
+            )
+
+        selected_pfce = PRINCIPLE_BITS.decode(st.session_state.get(OE_PRINCIPLE_BITS_KEY, 0))
+        oe_set_input("pfce_principles", selected_pfce)
+
+        if selected_pfce:
+            st.info("Principles selected: **" + ", ".join(selected_pfce) + "**")
+        else:
+            st.info("Principles selected: **None selected**")
+
+        csf_section_close()
+
+    # ---------- C) Select ethical considerations (PFCE sub-nodes) ----------
+    # These are interpretive cues drawn from PFCE Fig. 1, not an exhaustive obligation list.
+    with st.container():
+        st.markdown('<div class="pfce-considerations-anchor"></div>', unsafe_allow_html=True)
+
+        csf_section_open(
+            "Ethical Considerations",
+            "Select the PFCE ethical considerations implicated by this decision point. Add additional ethical considerations only if needed."
+        )
+
+        shown_nodes = 0
+        if not selected_pfce:
+            st.info("No PFCE principles selected. You may proceed without selecting ethical considerations.")
+        else:
+            for pid in selected_pfce:
+                # Section header per principle
+                st.markdown(f"**{pid}**")
+
+                for node in PFCE_SUBNODES.get(pid, []):
+                    i = PFCE_NODE_BITS.position((pid, node))
+                    shown_nodes |= 1 << i
+                    oe_bit_checkbox(node, OE_NODE_BITS_KEY, i)
+
+        st.markdown("---")
+
+        addl_text = st.text_area(
+            "Additional ethical considerations (optional)",
+            key="oe_ethical_additional_text",
+            height=110,
+            placeholder=(
+                "Use short phrases. One per line.\n"
+                "Examples:\n"
+                "- Risk of undermining public trust through delayed disclosure\n"
+                "- Disproportionate impact on residents without alternative service access"
+            ),
+            label_visibility="collapsed",
+        )
+
+        # Sub-nodes plus these make up the Step 6 obligations (engine.ethical_obligations)
+        # Only sub-nodes of the selected principles count
+        ethical_selected = PFCE_NODE_BITS.decode(st.session_state.get(OE_NODE_BITS_KEY, 0) & shown_nodes)
+        oe_set_input("pfce_nodes", ethical_selected)
+        oe_set_input("ethical_additional", engine.parse_lines(addl_text))
+
+        csf_section_close()
+
+    # Keep the old oe_pfce_pressure structure in a harmless default state (so nothing downstream breaks)
+    # You can remove this once you fully migrate Step 9 to use the record's ethical obligations instead.
+    st.session_state["oe_pfce_pressure"] = {
+        "summary": "",
+        "principles": st.session_state.get("oe_pfce_principles", []) or [],
+        "salience_selected": st.session_state.get("oe_pfce_salience_selected", []) or [],
+    }
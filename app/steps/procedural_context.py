@@ -0,0 +1,32 @@
+"""Step 3: Procedural Context (the CSF function the situation falls under)."""
+import streamlit as st
+
+from app.open_ended import oe_set_input
+from logic.framework import CSF_FUNCTION_PROMPTS
+
+
+def render(step: int):
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        Which question best matches the procedural situation you are addressing?
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    selected = st.radio(
+        label="Procedural Context",
+        options=list(CSF_FUNCTION_PROMPTS.keys()),
+        index=None,  # no default selection
+        format_func=lambda k: CSF_FUNCTION_PROMPTS[k]["prompt"],
+        key="oe_csf_function_choice",
+        label_visibility="collapsed",
+    )
+
+    if selected:
+        oe_set_input("procedural_context", selected)
+        label = CSF_FUNCTION_PROMPTS.get(selected, {}).get("label", selected)
+        st.info(f"Procedural context informed by NIST CSF Function: **{label}**")
+    else:
+        oe_set_input("procedural_context", "")
@@ -0,0 +1,32 @@
+"""Step 1: Scenario Description."""
+import streamlit as st
+
+from app.open_ended import oe_mark_dirty
+
+
+def render(step: int):
+    # Instruction text above the input
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        Describe the situation requiring a decision. Include:
+        <ul class="tight-list">
+            <li>What happened or what is being proposed</li>
+            <li>When the decision must be made</li>
+            <li>What constraints exist (time, resources, information)</li>
+        </ul>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Text box with ONLY guidance as placeholder
+    scenario_description = st.text_area(
+        "Scenario Description",
+        key="oe_scenario_description",
+        on_change=oe_mark_dirty,
+        args=("scenario_description",),
+        height=120,
+        placeholder="(Example: Following a suspected ransomware incident, some municipal systems have been restored while others remain offline. A decision is required on whether to further isolate network segments to limit potential spread, which would disrupt services that are currently functioning. The decision must be made quickly with limited information about the scope of compromise.)",
+        label_visibility="collapsed",
+    )
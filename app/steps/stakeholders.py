@@ -0,0 +1,81 @@
+"""Step 5: Stakeholder(s) Identification."""
+import streamlit as st
+
+from app.open_ended import (
+    OE_STAKEHOLDER_BITS_KEY,
+    OE_SYNCED_STEPS_KEY,
+    oe_bit_checkbox,
+    oe_set_input,
+)
+from logic import engine
+from logic.framework import STAKEHOLDER_OPTIONS, THIRD_PARTY_STAKEHOLDER
+from logic.record import STAKEHOLDER_BITS
+
+
+def render(step: int):
+    synced_steps = st.session_state.get(OE_SYNCED_STEPS_KEY, ())
+
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        Which stakeholders are affected by or involved in this decision?
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown(
+        """
+        <div class="oe-hint">
+        Select all that apply. If a stakeholder is missing, add it under “Other.”
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Third-party-risk outcomes from Step 4 pre-select vendors/MSPs (no gating)
+    third_party_outcomes = st.session_state.get("oe_csf_third_party_outcomes", []) or []
+    suggested = {THIRD_PARTY_STAKEHOLDER} if third_party_outcomes else set()
+    if suggested:
+        st.caption(
+            f"Suggested because selected CSF outcomes involve third-party risk "
+            f"({', '.join(third_party_outcomes)}): {THIRD_PARTY_STAKEHOLDER}"
+        )
+
+    # Suggestions only pre-fill a step the user has not filled in yet
+    if OE_STAKEHOLDER_BITS_KEY not in st.session_state and 5 not in synced_steps:
+        st.session_state[OE_STAKEHOLDER_BITS_KEY] = STAKEHOLDER_BITS.encode(suggested)[0]
+
+    # Scannable list (NO fixed-height container so "Other" sits directly under the last item)
+    for i, stakeholder in enumerate(STAKEHOLDER_OPTIONS):
+        oe_bit_checkbox(stakeholder, OE_STAKEHOLDER_BITS_KEY, i)
+
+
+    # "Other" row: checkbox left, textbox right (appears immediately when checked)
+    col_l, col_r = st.columns([1, 2], gap="large")
+
+    with col_l:
+        add_other = st.checkbox(
+            "Other stakeholder(s) not listed",
+            key="oe_stakeholders_other_toggle",
+        )
+
+    other_text = ""
+    with col_r:
+        if add_other:
+            other_text = st.text_area(
+                "Other stakeholders",
+                key="oe_stakeholders_other_text",
+                height=80,
+                placeholder="Example: Regional 911 dispatch, county emergency management, union representatives",
+                label_visibility="collapsed",
+            ).strip()
+        else:
+            st.empty()
+
+    # Parse “Other” into list (comma-separated), combine, de-dupe
+    selected_stakeholders = STAKEHOLDER_BITS.decode(st.session_state.get(OE_STAKEHOLDER_BITS_KEY, 0))
+    combined = engine.unique(selected_stakeholders + engine.parse_comma_list(other_text))
+
+    # Persist
+    oe_set_input("stakeholders_combined", combined)
@@ -0,0 +1,369 @@
+"""
+Step 4: Technical Obligation(s): CSF categories and outcomes, with search,
+informative references and additional obligations. The three pickers are
+fragments, so a toggle reruns only its own picker.
+"""
+import html
+
+import streamlit as st
+
+from app.open_ended import (
+    OE_CSF_BITS_KEY,
+    OE_FRAGMENT,
+    csf_rollup_summary,
+    get_csf_catalog,
+    oe_bit_checkbox,
+    oe_callback,
+    oe_csf_bits,
+    oe_set_input,
+    oe_step_fragment,
+    oe_toggle_bit,
+    oe_widget_key,
+    safe_rerun,
+)
+from logic import engine
+from logic.csf_catalog import CsfCatalog
+
+
+CSF_REFS_PAGE_SIZE = 20
+
+
+def _render_outcome_references(catalog: CsfCatalog, sid: str):
+    """
+    Informative references for one outcome. Only the rows on the current
+    page are materialized from the catalog's reference table.
+    """
+    refs = catalog.references
+    n_refs = refs.count(sid)
+    if not n_refs:
+        st.caption(f"{sid}: no informative references in the CSF export.")
+        return
+
+    doc_counts = refs.doc_counts(sid)
+    doc_labels = {d.index: f"{d.name} ({d.version})" if d.version else d.name for d, _ in doc_counts}
+    doc_totals = {d.index: n for d, n in doc_counts}
+
+    doc_index = st.selectbox(
+        "Reference document",
+        options=[None] + list(doc_labels.keys()),
+        format_func=lambda i: f"All documents ({n_refs})" if i is None else f"{doc_labels[i]} ({doc_totals[i]})",
+        key=oe_widget_key("oe_csf_refs_doc", sid),
+    )
+
+    total = n_refs if doc_index is None else doc_totals[doc_index]
+    n_pages = -(-total // CSF_REFS_PAGE_SIZE)
+    page = 1
+    if n_pages > 1:
+        page = st.number_input(
+            f"Page (of {n_pages})",
+            min_value=1,
+            max_value=n_pages,
+            value=1,
+            step=1,
+            key=oe_widget_key("oe_csf_refs_page", sid, None if doc_index is None else refs.documents[doc_index].id),
+        )
+
+    start = (page - 1) * CSF_REFS_PAGE_SIZE
+    rows = refs.page(sid, start, start + CSF_REFS_PAGE_SIZE, doc_index)
+
+    # One markdown element per page, not one per row.
+    st.markdown("\n".join(
+        f"- {html.escape(doc_labels[r.document.index])}: `{r.element_id}`" for r in rows
+    ))
+
+
+CSF_SEARCH_LIMIT = 8
+
+
+@oe_callback
+def _select_csf_outcome(cat_pos: int, sub_pos: int):
+    # on_click callback: runs before the checkboxes are created on the next rerun.
+    st.session_state[OE_CSF_BITS_KEY] = st.session_state.get(OE_CSF_BITS_KEY, 0) | 1 << cat_pos | 1 << sub_pos
+
+
+def _render_csf_search(catalog: CsfCatalog, fn_ids: list):
+    query = st.text_input(
+        "Search CSF outcomes",
+        key="oe_csf_search",
+        placeholder="Search outcomes, categories and implementation examples (e.g. backups, supplier, logging)",
+    ).strip()
+    if not query:
+        return
+
+    allowed_fns = set(fn_ids)
+    hits = []
+    for sid, _score in catalog.search.search(query):
+        sub = catalog.subcategories[sid]
+        cat = catalog.categories.get(sub.category)
+        if cat and cat.function in allowed_fns:
+            hits.append((sid, sub, cat))
+            if len(hits) == CSF_SEARCH_LIMIT:
+                break
+
+    if not hits:
+        st.caption("No matching CSF outcomes.")
+        return
+
+    csf_bits = oe_csf_bits(catalog)
+    tree = catalog.tree
+    for sid, sub, cat in hits:
+        col_l, col_r = st.columns([5, 1], gap="small")
+        with col_l:
+            st.markdown(f"**{sid}** · {html.escape(cat.title)}  \n{html.escape(sub.text)}")
+        with col_r:
+            if csf_bits >> tree.position(sid) & 1:
+                st.caption("Selected")
+            else:
+                st.button(
+                    "Select",
+                    key=oe_widget_key("oe_csf_search_pick", sid),
+                    on_click=_select_csf_outcome,
+                    args=(tree.position(cat.id), tree.position(sid)),
+                )
+
+
+# ---------- Step 4 pickers (fragments: a toggle reruns only its own picker) ----------
+
+# Set when a category is toggled: the outcome picker lists the ticked categories' outcomes
+OE_CSF_CATS_CHANGED_KEY = "_oe_csf_cats_changed"
+
+
+@oe_callback
+def _oe_toggle_csf_category(i: int):
+    oe_toggle_bit(OE_CSF_BITS_KEY, i)
+    if OE_FRAGMENT:
+        st.session_state[OE_CSF_CATS_CHANGED_KEY] = True
+
+
+def _csf_shown_cats(catalog: CsfCatalog, fn_ids: list) -> int:
+    shown = 0
+    for fn_id in fn_ids:
+        if fn_id in catalog.functions:
+            shown |= catalog.tree.child_mask(fn_id)
+    return shown
+
+
+@oe_step_fragment
+def _render_csf_category_picker(catalog: CsfCatalog, fn_ids: list):
+    """A) Technical areas (categories), grouped by function."""
+    if st.session_state.pop(OE_CSF_CATS_CHANGED_KEY, False):
+        # The outcome picker depends on the categories: rerun the whole step
+        safe_rerun()
+
+    tree = catalog.tree
+    csf_bits = oe_csf_bits(catalog)
+    for fn_id in fn_ids:
+        fn = catalog.functions.get(fn_id)
+        fn_title = fn.title if fn else fn_id
+        fn_desc = fn.description if fn else ""
+
+        st.markdown(
+            f"""
+            <div class="oe-group-title">
+            {fn_title}
+            </div>
+            <div class="oe-group-desc">
+            {fn_desc}
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+        for cat_id in catalog.cats_by_fn.get(fn_id, ()):
+            cat = catalog.categories.get(cat_id)
+            cat_title = cat.title if cat else cat_id
+            cat_desc = cat.description if cat else ""
+            pos = tree.position(cat_id)
+
+            # Same as oe_bit_checkbox, but a toggle also reruns the outcome picker
+            st.checkbox(
+                cat_title,
+                value=bool(csf_bits >> pos & 1),
+                on_change=_oe_toggle_csf_category,
+                args=(pos,),
+                help=cat_desc if cat_desc else None,
+            )
+
+    # Ticked & shown categories
+    oe_set_input("csf_categories", tree.ids_in(csf_bits & _csf_shown_cats(catalog, fn_ids)))
+
+
+@oe_step_fragment
+def _render_csf_outcome_picker(catalog: CsfCatalog, fn_ids: list):
+    """
+    B) Technical obligations: the outcomes under the ticked categories, with
+    the roll-up, the examples flag and the informative references, which
+    all follow the selected outcomes.
+    """
+    tree = catalog.tree
+    # Selections are set operations on the bitset: ticked outcomes & the outcomes under ticked categories.
+    csf_bits = oe_csf_bits(catalog)
+    selected_cat_ids = tree.ids_in(csf_bits & _csf_shown_cats(catalog, fn_ids))
+    shown_subs = 0
+    for cat_id in selected_cat_ids:
+        shown_subs |= tree.subcategory_mask(cat_id)
+    selected_subs = csf_bits & shown_subs
+    third_party_subs = catalog.party_sets.get("third", 0)
+
+    if selected_cat_ids:
+        st.markdown(
+            """
+            <div class="oe-section-label">
+            Technical obligations (CSF outcomes)
+            </div>
+            <div class="oe-hint">
+            Select the outcomes that are directly implicated by this decision point.
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+        third_party_only = st.toggle(
+            "Only show outcomes involving third-party (vendor/MSP) risk",
+            key="oe_csf_third_party_only",
+        )
+
+        example_sids = []
+        for cat_id in selected_cat_ids:
+            cat = catalog.categories.get(cat_id)
+            cat_title = cat.title if cat else cat_id
+            cat_desc = cat.description if cat else ""
+
+            st.markdown(
+                f"""
+                <div class="oe-group-title oe-group-title-tight">
+                {cat_title}
+                </div>
+                <div class="oe-group-desc oe-group-desc-tight">
+                {cat_desc}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            for sid in catalog.subs_by_cat.get(cat_id, ()):
+                pos = tree.position(sid)
+                # Already-selected outcomes stay visible so the filter never drops a selection.
+                if third_party_only and not (third_party_subs | selected_subs) >> pos & 1:
+                    continue
+
+                oe_bit_checkbox(catalog.subcategory_text(sid), OE_CSF_BITS_KEY, pos)
+                if sid in catalog.examples:
+                    example_sids.append(sid)
+
+        # Like the references below: one outcome's examples at a time, so a rerun
+        # does not rebuild example text for every outcome on screen.
+        if example_sids:
+            examples_sid = st.selectbox(
+                "Implementation examples",
+                options=[None] + example_sids,
+                format_func=lambda x: "— Show implementation examples for an outcome —" if x is None
+                else f"{x} ({len(catalog.examples[x])} examples)",
+                key="oe_csf_examples_outcome",
+            )
+            if examples_sid:
+                st.markdown("\n".join(f"- {html.escape(ex.text)}" for ex in catalog.examples[examples_sid]))
+
+    selected_subcat_ids = tree.ids_in(selected_subs)
+    oe_set_input("csf_outcomes", selected_subcat_ids)
+    oe_set_input("csf_functions", list(tree.rollup(selected_subcat_ids)))
+    st.session_state["oe_csf_third_party_outcomes"] = tree.ids_in(selected_subs & third_party_subs)
+
+    if selected_subcat_ids:
+        st.caption("Selected outcomes by CSF Function: " + csf_rollup_summary(catalog, selected_subcat_ids))
+
+    include_examples = False
+    if selected_subcat_ids:
+        include_examples = st.checkbox(
+            "Include implementation examples for the selected outcomes in the decision record",
+            key="oe_csf_include_examples",
+        )
+    # The record keeps a flag; example text is resolved from the catalog on export.
+    oe_set_input("csf_include_examples", include_examples)
+
+    # -----------------------------
+    # Informative references (SP 800-53, SSDF, SP 800-37, ...) for selected outcomes
+    # -----------------------------
+    if selected_subcat_ids:
+        st.markdown(
+            """
+            <div class="oe-section-label oe-section-label-spaced">
+            Informative references
+            </div>
+            <div class="oe-hint">
+            Choose a selected outcome to see where it maps in other NIST and industry documents.
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+        # One outcome at a time: the panel costs the same however many outcomes are selected.
+        refs_sid = st.selectbox(
+            "Outcome",
+            options=[None] + selected_subcat_ids,
+            format_func=lambda x: "— Select an outcome —" if x is None
+            else f"{x} ({catalog.references.count(x)} references)",
+            key="oe_csf_refs_outcome",
+            label_visibility="collapsed",
+        )
+        if refs_sid:
+            _render_outcome_references(catalog, refs_sid)
+
+
+@oe_step_fragment
+def _render_technical_additional():
+    """C) Additional technical obligations (only if needed)."""
+    addl_text = st.text_area(
+        "Additional technical obligations (optional)",
+        key="oe_technical_additional_text",
+        height=120,
+        placeholder=(
+            "Use short phrases. One per line.\n"
+            "Examples:\n"
+            "- Preserve forensic evidence\n"
+            "- Maintain continuity of 911 dispatch workflows\n"
+            "- Prevent lateral movement across segmented networks"
+        ),
+    )
+
+    # Selected CSF outcomes plus these make up the Step 4 obligations (engine.technical_obligations)
+    oe_set_input("technical_additional", engine.parse_lines(addl_text))
+
+
+def render(step: int):
+    catalog = get_csf_catalog(step)
+
+    selected_fn = st.session_state.get("oe_csf_function", "")
+    fn_ids = [selected_fn] if selected_fn else list(catalog.functions.keys())
+
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        Identify the technical obligations implicated by this decision.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown(
+        """
+        <div class="oe-hint oe-hint-wide">
+        First, select the relevant CSF technical areas (categories). Then, select the specific CSF outcomes (technical obligations) implicated by this decision.
+        Add additional technical obligations only if they are not captured by the CSF outcomes.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Ranked search across the outcomes shown below (selecting a result ticks its category too)
+    _render_csf_search(catalog, fn_ids)
+
+    # Each part reruns on its own when one of its widgets changes (see oe_step_fragment)
+    _render_csf_category_picker(catalog, fn_ids)
+
+    st.markdown("---")
+
+    _render_csf_outcome_picker(catalog, fn_ids)
+
+    st.markdown("---")
+
+    _render_technical_additional()
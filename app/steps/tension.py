@@ -0,0 +1,131 @@
+"""Step 7: Tension Identification (two obligations from Steps 4 and 6)."""
+import streamlit as st
+
+from app.open_ended import (
+    OE_RECORD_KEY,
+    csf_rollup_summary,
+    csf_section_close,
+    csf_section_open,
+    get_csf_catalog,
+    oe_mark_dirty,
+    oe_set_input,
+    oe_sync_record,
+)
+from logic import engine
+from logic.framework import TENSION_TYPES
+
+
+def render(step: int):
+    st.markdown(
+        """
+        <div class="oe-prompt">
+        Identify the central decision tension at this decision point.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown(
+        """
+        <div class="oe-hint">
+        Select two obligations or commitments that cannot both be fully satisfied at this decision point.
+        These may be ethical, technical, or both.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Pull obligations from prior steps (outcome text is resolved from the catalog)
+    catalog = get_csf_catalog(step)
+    oe_sync_record(4, 6)
+    items = engine.tension_options(st.session_state[OE_RECORD_KEY], catalog)
+
+    csf_outcomes = st.session_state.get("oe_csf_outcomes_selected", []) or []
+    if csf_outcomes:
+        st.caption(
+            "Technical obligations span: "
+            + csf_rollup_summary(catalog, csf_outcomes)
+        )
+
+    # Minimal guardrails (no gating)
+    if not items:
+        st.info("No technical or ethical obligations were recorded in prior steps.")
+        oe_set_input("tension_a", "")
+        oe_set_input("tension_b", "")
+        oe_set_input("tension_type", engine.NOT_SPECIFIED)
+        st.session_state["oe_tension_statement"] = ""
+    else:
+        placeholder_id = "__none__"
+
+        # Maps for display and lookup
+        id_to_text = {it.id: it.text for it in items}
+        id_to_origin = {it.id: it.origin for it in items}
+
+        # Selection UI: use IDs as the values, show text to user
+        with st.container():
+            st.markdown('<div class="tension-anchor"></div>', unsafe_allow_html=True)
+
+            csf_section_open(
+                "Decision Tension",
+                "Select the two competing obligations that best represent the tension."
+            )
+
+            all_ids = [placeholder_id] + [it.id for it in items]
+
+            a_id = st.selectbox(
+                "Obligation / Commitment A",
+                options=all_ids,
+                index=0,
+                key="oe_tension_a_id",
+                format_func=lambda x: "— Select an obligation —" if x == placeholder_id else id_to_text.get(x, ""),
+            )
+
+            # Filter B list to prevent choosing the same item twice
+            b_ids = [placeholder_id] + [it.id for it in items if it.id != a_id]
+
+            b_id = st.selectbox(
+                "Obligation / Commitment B",
+                options=b_ids,
+                index=0,
+                key="oe_tension_b_id",
+                format_func=lambda x: "— Select an obligation —" if x == placeholder_id else id_to_text.get(x, ""),
+            )
+
+            a_clean = "" if a_id == placeholder_id else id_to_text.get(a_id, "").strip()
+            b_clean = "" if b_id == placeholder_id else id_to_text.get(b_id, "").strip()
+
+            # The record stores the references; the text is only for display
+            oe_set_input("tension_a", "" if a_id == placeholder_id else a_id)
+            oe_set_input("tension_b", "" if b_id == placeholder_id else b_id)
+            st.session_state["oe_tension_statement"] = engine.tension_statement(a_clean, b_clean)
+
+            # Infer tension type only when both are selected
+            if a_clean and b_clean:
+                ttype = engine.infer_tension_type(id_to_origin.get(a_id, ""), id_to_origin.get(b_id, ""))
+                oe_set_input("tension_type", ttype)
+                st.caption(f"Tension type inferred: **{ttype}**")
+
+            elif a_clean or b_clean:
+                oe_set_input("tension_type", engine.NOT_SPECIFIED)
+                st.caption("Partial tension noted. Select both sides to capture the tension.")
+            else:
+                oe_set_input("tension_type", engine.NOT_SPECIFIED)
+                st.caption("No tension recorded.")
+
+            csf_section_close()
+
+        # Optional override (only after both are selected)
+        if st.session_state.get("oe_tension_a") and st.session_state.get("oe_tension_b"):
+            override = st.checkbox("Override inferred tension type (optional)", key="oe_tension_override_toggle")
+            if override:
+                st.radio(
+                    "Tension type",
+                    options=TENSION_TYPES,
+                    index=TENSION_TYPES.index(
+                        st.session_state.get("oe_tension_type", engine.NOT_SPECIFIED)
+                    ),
+                    key="oe_tension_type",
+                    on_change=oe_mark_dirty,
+                    args=("tension_type",),
+                    horizontal=True,
+                )
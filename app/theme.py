@@ -0,0 +1,156 @@
+"""
+The app's stylesheet, served once as a static, content-hashed file instead
+of being re-sent with every rerun.
+
+app/theme.css is the source. write_theme_bundle() copies it to
+app/static/theme.<hash>.css, which Streamlit serves at /app/static/ (see
+enableStaticServing in .streamlit/config.toml); a new hash means a new URL,
+so the browser can keep the file for good. Pages carry only class names.
+The bundle is written at startup (app/serve.py) or at build time
+(python -m app.theme), never while serving a page, and older bundles are
+removed then.
+
+Streamlit serves .css static files as text/plain with nosniff, which a
+<link rel="stylesheet"> would refuse, so inject_theme() renders a small
+loader instead: it fetches the bundle (from the browser cache after the
+first load) and puts it in a <style> element in the page head, where it
+stays across reruns. The loader also opens the sidebar once per page load.
+Under a bare `streamlit run` with no bundle written, the stylesheet is
+inlined instead.
+
+Everything the stylesheet loads (the Inter font) is served from
+app/static/ too, so pages render on a network with no outside access;
+offline_problems() checks that.
+"""
+import hashlib
+import logging
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+THEME_SOURCE = Path(__file__).with_name("theme.css")
+STATIC_DIR = Path(__file__).with_name("static")
+
+_STATIC_URL = "app/static/"
+
+log = logging.getLogger(__name__)
+
+_LOADER = """<script>
+(function () {
+  const win = window, doc = win.document, name = "%(name)s";
+  const current = doc.getElementById("oe-theme");
+  if (!current || current.dataset.bundle !== name) {
+    fetch(new URL("%(static)s" + name, win.location.href), {cache: "force-cache"})
+      .then(r => r.ok ? r.text() : Promise.reject(r.status))
+      .then(css => {
+        const el = doc.getElementById("oe-theme") || doc.head.appendChild(doc.createElement("style"));
+        el.id = "oe-theme";
+        el.dataset.bundle = name;
+        el.textContent = css;
+      })
+      .catch(err => console.warn("theme bundle not loaded:", err));
+  }
+
+  if (win.__oeSidebarOpened) return;
+  win.__oeSidebarOpened = true;
+  const selectors = [
+    'button[data-testid="collapsedControl"]',
+    'button[aria-label="Expand sidebar"]',
+    'button[title="Expand sidebar"]',
+    'button[aria-label*="sidebar"]',
+    'button[title*="sidebar"]'
+  ];
+  function tryOpen(attempt) {
+    const sidebar = doc.querySelector('section[data-testid="stSidebar"]');
+    const toggle = selectors.map(s => doc.querySelector(s)).find(Boolean);
+    // When collapsed, the sidebar is only a few pixels wide
+    if (sidebar && toggle && sidebar.getBoundingClientRect().width < 120) {
+      toggle.click();
+      return;
+    }
+    // Retry while Streamlit finishes layout
+    if (attempt < 20) setTimeout(() => tryOpen(attempt + 1), 120);
+  }
+  tryOpen(0);
+})();
+</script>"""
+
+
+@lru_cache(maxsize=1)
+def theme_bundle() -> str:
+    """File name of the current bundle under app/static/ (a hash of app/theme.css; nothing is written)."""
+    return f"theme.{hashlib.blake2s(THEME_SOURCE.read_bytes(), digest_size=8).hexdigest()}.css"
+
+
+def write_theme_bundle() -> str:
+    """
+    Writes the current bundle to app/static/ and removes older theme.*.css
+    bundles. Run at startup or build time; returns the file name.
+    """
+    css = THEME_SOURCE.read_bytes()
+    name = theme_bundle()
+    path = STATIC_DIR / name
+    if not path.is_file() or path.read_bytes() != css:
+        STATIC_DIR.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{name}.{os.getpid()}.tmp")
+        tmp.write_bytes(css)
+        os.replace(tmp, path)
+    for stale in STATIC_DIR.glob("theme.*.css"):
+        if stale.name != name:
+            stale.unlink(missing_ok=True)
+    return name
+
+
+def loader_html() -> str:
+    return _LOADER % {"static": _STATIC_URL, "name": theme_bundle()}
+
+
+_URL = re.compile(r"""url\(\s*['"]?([^'")\s]+)""")
+
+
+def offline_problems(css: str = None) -> list:
+    """
+    What in the stylesheet (app/theme.css by default) would reach off-site or
+    hold up rendering: @import, absolute URLs, @font-face rules without
+    font-display: swap, and local files that are not there.
+    """
+    if css is None:
+        css = THEME_SOURCE.read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    problems = [f"@import blocks rendering: {m.group(0).strip()}" for m in re.finditer(r"@import[^;]*;", css)]
+    for url in _URL.findall(css):
+        if re.match(r"([a-z][a-z0-9+.-]*:)?//", url, re.I):
+            problems.append(f"fetches off-site: {url}")
+        elif url.startswith(_STATIC_URL) and not (STATIC_DIR / url[len(_STATIC_URL):]).is_file():
+            problems.append(f"missing file: app/static/{url[len(_STATIC_URL):]}")
+    for block in re.findall(r"@font-face\s*\{[^}]*\}", css):
+        if not re.search(r"font-display\s*:\s*swap", block):
+            problems.append("@font-face without font-display: swap")
+    return problems
+
+
+@lru_cache(maxsize=1)
+def _inline_style() -> str:
+    log.warning("app/static/%s not written (run app/serve.py or python -m app.theme); inlining the stylesheet",
+                theme_bundle())
+    return f"<style>{THEME_SOURCE.read_text(encoding='utf-8')}</style>"
+
+
+def inject_theme():
+    """Renders the loader; call once per rerun, before any content."""
+    import streamlit as st
+
+    if not (STATIC_DIR / theme_bundle()).is_file():
+        st.html(_inline_style())
+    st.html(loader_html(), unsafe_allow_javascript=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    problems = offline_problems()
+    for problem in problems:
+        log.error("stylesheet: %s", problem)
+    if problems:
+        raise SystemExit(1)
+    log.info("stylesheet bundle: app/static/%s", write_theme_bundle())
@@ -0,0 +1,71 @@
+"""
+Reader latency of CatalogStore.current() while the catalog is being rebuilt
+and swapped in a background thread, compared with an idle store.
+
+    python -m benchmarks.bench_catalog_reload [--seconds S]
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _read_latencies(store, seconds: float):
+    times = []
+    seen = set()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t0 = time.perf_counter()
+        version, catalog = store.current()
+        catalog.subcategory_text("GV.OC-01")
+        times.append((time.perf_counter() - t0) * 1e6)
+        seen.add(version)
+        time.sleep(0)  # let the rebuild thread run, like a real rerun would
+    return times, seen
+
+
+def _report(label, times):
+    times.sort()
+    p99 = times[int(len(times) * 0.99) - 1]
+    print(f"{label:<20}{len(times):>10,}{statistics.median(times):>12.2f}{p99:>10.2f}{times[-1]:>12.1f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args(argv)
+
+    from logic.csf_store import CatalogStore
+
+    store = CatalogStore(ROOT_DIR / "data" / "csf-export.json")
+    store.current()
+
+    print(f"{'':<20}{'reads':>10}{'median us':>12}{'p99 us':>10}{'max us':>12}")
+    idle, _ = _read_latencies(store, args.seconds)
+    _report("idle", idle)
+
+    stop = threading.Event()
+    rebuilds = [0]
+
+    def rebuild_loop():
+        while not stop.is_set():
+            store.reload(force=True)
+            rebuilds[0] += 1
+
+    t = threading.Thread(target=rebuild_loop, daemon=True)
+    t.start()
+    busy, seen = _read_latencies(store, args.seconds)
+    stop.set()
+    t.join()
+    _report("during rebuilds", busy)
+    print(f"\n{rebuilds[0]} rebuilds swapped in; readers saw {len(seen)} distinct versions")
+    print("(max latency during rebuilds is GIL scheduling, not lock waiting: readers take no lock)")
+
+
+if __name__ == "__main__":
+    main()
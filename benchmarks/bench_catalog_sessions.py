@@ -0,0 +1,115 @@
+"""
+Per-rerun latency and per-session memory of the Step 4 catalog lookup with
+50 simulated sessions, comparing:
+
+  before: @st.cache_data over the raw index dict (every call unpickles a copy)
+  after:  @st.cache_resource over the shared, immutable CsfCatalog
+
+Also times real Step 4 reruns through streamlit.testing's AppTest.
+
+    python -m benchmarks.bench_catalog_sessions [--sessions N] [--reruns N]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+SOURCE = str(ROOT_DIR / "data" / "csf-export.json")
+
+
+def _step4_reads_legacy(index):
+    functions, categories, subcats = index["functions"], index["categories"], index["subcats"]
+    cats_by_fn, subs_by_cat = index["cats_by_fn"], index["subs_by_cat"]
+    n = 0
+    for fn_id in functions:
+        for cat_id in cats_by_fn.get(fn_id, []):
+            n += len(categories[cat_id]["title"])
+            for sid in subs_by_cat.get(cat_id, []):
+                n += len(subcats[sid]["text"])
+    return n
+
+
+def _step4_reads_catalog(catalog):
+    n = 0
+    for fn_id in catalog.functions:
+        for cat_id in catalog.cats_by_fn.get(fn_id, ()):
+            n += len(catalog.categories[cat_id].title)
+            for sid in catalog.subs_by_cat.get(cat_id, ()):
+                n += len(catalog.subcategories[sid].text)
+    return n
+
+
+def _measure(loader, reads, sessions: int, reruns: int):
+    loader(SOURCE)  # warm the cache: we are measuring reruns, not the cold build
+
+    times = []
+    for _ in range(reruns):
+        for _ in range(sessions):
+            t0 = time.perf_counter()
+            reads(loader(SOURCE))
+            times.append(time.perf_counter() - t0)
+
+    # Every session sitting on Step 4 holds the loader's result for its rerun.
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    held = [loader(SOURCE) for _ in range(sessions)]
+    per_session = (tracemalloc.get_traced_memory()[0] - base) / sessions
+    tracemalloc.stop()
+    del held
+    return statistics.median(times) * 1000, max(times) * 1000, per_session
+
+
+def _apptest_reruns(sessions: int):
+    from streamlit.testing.v1 import AppTest
+
+    from logic.csf_catalog import load_csf_catalog
+
+    # Category checkboxes have no widget key (they flip a bit of the Step 4 bitset): find one by label
+    label = load_csf_catalog(SOURCE).categories["GV.OC"].title
+    times = []
+    for _ in range(sessions):
+        at = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=60)
+        at.session_state["landing_complete"] = True
+        at.session_state["oe_step"] = 4
+        at.run()
+        next(cb for cb in at.checkbox if cb.label == label).check()
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=50)
+    ap.add_argument("--reruns", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    import streamlit as st
+    from logic.csf_catalog import load_csf_catalog
+    from logic.csf_snapshot import load_csf_index
+
+    before = st.cache_data(show_spinner=False)(load_csf_index)
+    after = st.cache_resource(show_spinner=False)(load_csf_catalog)
+
+    print(f"{args.sessions} sessions x {args.reruns} reruns on Step 4")
+    print(f"{'':<8}{'median ms':>12}{'max ms':>10}{'KiB/session':>14}")
+    for label, loader, reads in (
+        ("before", before, _step4_reads_legacy),
+        ("after", after, _step4_reads_catalog),
+    ):
+        med, worst, mem = _measure(loader, reads, args.sessions, args.reruns)
+        print(f"{label:<8}{med:>12.3f}{worst:>10.3f}{mem / 1024:>14.1f}")
+
+    print()
+    print(f"AppTest Step 4 rerun (median of {args.sessions}): {_apptest_reruns(args.sessions):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Cold start with N sessions asking for the catalog at once: every caller
+building its own copy (what N cold first requests used to race into) vs.
+CatalogStore's single-flight build, and the cost once warmed up.
+
+    python -m benchmarks.bench_catalog_warmup [--sessions N]
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+EXPORT = ROOT_DIR / "data" / "csf-export.json"
+
+
+def _concurrent(n: int, fn):
+    """Runs fn() on n threads released together; returns (wall s, slowest caller s)."""
+    gate = threading.Barrier(n + 1)
+    waits = []
+
+    def worker():
+        gate.wait()
+        t0 = time.perf_counter()
+        fn()
+        waits.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    gate.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, max(waits)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    from logic.csf_catalog import load_csf_catalog
+    from logic.csf_store import CatalogStore
+
+    builds = [0]
+
+    def counting_loader(path):
+        builds[0] += 1
+        return load_csf_catalog(path)
+
+    print(f"{'':<16}{'builds':>8}{'wall ms':>10}{'slowest ms':>12}")
+
+    wall, slowest = _concurrent(args.sessions, lambda: counting_loader(EXPORT))
+    print(f"{'racing':<16}{builds[0]:>8}{wall * 1e3:>10.1f}{slowest * 1e3:>12.1f}")
+
+    builds[0] = 0
+    store = CatalogStore(EXPORT, loader=counting_loader)
+    wall, slowest = _concurrent(args.sessions, store.current)
+    print(f"{'single-flight':<16}{builds[0]:>8}{wall * 1e3:>10.1f}{slowest * 1e3:>12.1f}")
+
+    builds[0] = 0
+    wall, slowest = _concurrent(args.sessions, store.current)
+    print(f"{'warmed':<16}{builds[0]:>8}{wall * 1e3:>10.1f}{slowest * 1e3:>12.1f}")
+
+    status = store.status()
+    print(f"\nstatus: ready={status['ready']} v{status['version']} build {status['build_seconds'] * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
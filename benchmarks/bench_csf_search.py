@@ -0,0 +1,70 @@
+"""
+Build time of the CSF search index and query latency, including the
+partial words produced while typing.
+
+    python -m benchmarks.bench_csf_search [--rounds N]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+QUERIES = (
+    "backup",
+    "ransomware backup restore",
+    "third party supplier risk",
+    "incident response plan",
+    "log monitoring",
+    "access control privileged accounts",
+    "asset inventory",
+    "vulnerability",
+    "GV.OC-01",
+    "training awareness",
+)
+
+BUDGET_MS = 5.0
+
+
+def _typed(query: str):
+    """Every prefix a user produces while typing `query`."""
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    from logic.csf_catalog import CsfCatalog
+    from logic.csf_snapshot import load_csf_index
+
+    index = load_csf_index(ROOT_DIR / "data" / "csf-export.json")
+    t0 = time.perf_counter()
+    catalog = CsfCatalog(index)
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"catalog build incl. search index: {build_ms:.1f} ms, {len(catalog.search.doc_ids)} outcomes")
+
+    keystrokes = [p for q in QUERIES for p in _typed(q)]
+    times = []
+    for _ in range(args.rounds):
+        for q in keystrokes:
+            t0 = time.perf_counter()
+            catalog.search.search(q)
+            times.append((time.perf_counter() - t0) * 1000)
+
+    times.sort()
+    p99 = times[int(len(times) * 0.99) - 1]
+    print(f"{len(times):,} queries: median {statistics.median(times):.3f} ms, "
+          f"p99 {p99:.3f} ms, max {times[-1]:.3f} ms (budget {BUDGET_MS} ms)")
+    print()
+    for q in QUERIES[:4]:
+        top = catalog.search.search(q, limit=3)
+        print(f"{q!r:>32} -> {', '.join(sid for sid, _ in top)}")
+
+
+if __name__ == "__main__":
+    main()
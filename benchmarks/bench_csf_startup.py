@@ -0,0 +1,71 @@
+"""
+Cold-start cost of loading the CSF index: JSON parser vs. binary snapshot.
+
+Each sample runs in a fresh interpreter so nothing is warm. Reports wall time
+of the load call and the resident-memory growth it caused.
+
+    python -m benchmarks.bench_csf_startup [--runs N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SOURCE = ROOT_DIR / "data" / "csf-export.json"
+
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+from logic import csf_index, csf_snapshot
+before = rss_kb()
+t0 = time.perf_counter()
+if {mode!r} == "json":
+    index = csf_index.parse_csf_export({source!r})
+else:
+    index = csf_snapshot.read_snapshot({source!r})
+    assert index is not None, "snapshot missing or stale"
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def _sample(mode: str) -> dict:
+    code = _CHILD.format(root=str(ROOT_DIR), mode=mode, source=str(SOURCE))
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT_DIR))
+    from logic.csf_snapshot import write_snapshot
+
+    snap = write_snapshot(SOURCE)
+    print(f"source   {SOURCE.stat().st_size:>10,} bytes")
+    print(f"snapshot {snap.stat().st_size:>10,} bytes")
+    print()
+    print(f"{'loader':<10}{'median ms':>12}{'min ms':>10}{'RSS +KiB':>12}")
+
+    for mode in ("json", "snapshot"):
+        samples = [_sample(mode) for _ in range(args.runs)]
+        secs = [s["seconds"] * 1000 for s in samples]
+        rss = statistics.median(s["rss_kb"] for s in samples)
+        print(f"{mode:<10}{statistics.median(secs):>12.1f}{min(secs):>10.1f}{rss:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
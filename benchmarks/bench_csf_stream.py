@@ -0,0 +1,69 @@
+"""
+Load time and peak RSS of the whole-document JSON parser vs. the streaming
+parser on synthetic exports at 1x, 10x and 100x the size of the CSF export.
+
+Each sample runs in a fresh interpreter; peak RSS is the child's ru_maxrss.
+
+    python -m benchmarks.bench_csf_stream [--scales 1,10,100] [--json-max-scale N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, {root!r})
+from logic import csf_index
+
+t0 = time.perf_counter()
+if {mode!r} == "json":
+    index = csf_index.build_csf_index(json.loads(Path({path!r}).read_text(encoding="utf-8")))
+else:
+    index = csf_index.parse_csf_export({path!r})
+elapsed = time.perf_counter() - t0
+print(json.dumps({{
+    "seconds": elapsed,
+    "peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "subcats": len(index["subcats"]),
+}}))
+"""
+
+
+def _sample(mode: str, path: Path) -> dict:
+    code = _CHILD.format(root=str(ROOT_DIR), mode=mode, path=str(path))
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scales", default="1,10,100")
+    ap.add_argument("--json-max-scale", type=int, default=100,
+                    help="skip the whole-document parser above this scale (it needs several GiB at 100x)")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT_DIR))
+    from benchmarks.gen_synthetic_export import write_synthetic_export
+
+    print(f"{'scale':>6}{'file MiB':>10}{'loader':>8}{'seconds':>10}{'peak RSS MiB':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in (int(s) for s in args.scales.split(",")):
+            path = write_synthetic_export(scale, Path(tmp) / f"export-{scale}x.json")
+            size_mib = path.stat().st_size / 2**20
+            for mode in ("json", "stream"):
+                if mode == "json" and scale > args.json_max_scale:
+                    print(f"{scale:>6}{size_mib:>10.1f}{mode:>8}{'skipped':>10}")
+                    continue
+                r = _sample(mode, path)
+                print(f"{scale:>6}{size_mib:>10.1f}{mode:>8}{r['seconds']:>10.2f}{r['peak_kb'] / 1024:>14.1f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
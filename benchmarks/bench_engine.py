@@ -0,0 +1,97 @@
+"""
+Micro-benchmarks for the headless reasoning engine (logic/engine.py), plus
+batch throughput: sync, validate and export N records without Streamlit.
+
+    python -m benchmarks.bench_engine [--records N]
+"""
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _values(i: int) -> dict:
+    """Inputs of a fully filled-in walkthrough, varied a little by `i`."""
+    from logic.record import text_ref
+
+    tension_refs = [
+        "csf:RS.MA-01", "csf:RS.CO-02", text_ref("tech", "Preserve forensic evidence"),
+        "pfce:5", text_ref("eth", f"Extra concern {i}"),
+    ]
+    return {
+        "scenario_description": f"  Ransomware scenario {i}  ",
+        "decision_point": "Whether to isolate network segment B",
+        "procedural_context": "RS",
+        "csf_categories": ["RS.MA", "RS.CO"],
+        "csf_outcomes": ["RS.MA-01", "RS.MA-02", "RS.CO-02"],
+        "csf_functions": ["RS"],
+        "csf_include_examples": i % 2,
+        "technical_additional": ["Preserve forensic evidence", f"Keep dispatch {i} running"],
+        "stakeholders_combined": ["Local Residents/Businesses", "IT/Cybersecurity Team"],
+        "pfce_salience_selected": ["harm_disadvantage", "public_justification"],
+        "pfce_principles": ["Justice", "Non-maleficence"],
+        "pfce_nodes": [("Justice", "Procedural fairness"), ("Non-maleficence", "Data harm")],
+        "ethical_additional": [f"Extra concern {i}"],
+        "tension_a": tension_refs[i % 3],
+        "tension_b": tension_refs[3 + i % 2],
+        "tension_type": "Ethical–Technical",
+        "constraints_selected": ["Time sensitivity or urgency"],
+        "constraints_other": "",
+        "decision_text": "Isolate segment B; keep dispatch on manual workflow",
+        "decision_rationale": "",
+    }
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--records", type=int, default=10_000)
+    args = ap.parse_args(argv)
+
+    from logic import engine, record
+    from logic.csf_catalog import load_csf_catalog
+
+    catalog = load_csf_catalog(ROOT_DIR / "data" / "csf-export.json")
+    values = _values(0)
+    rec = engine.sync_record(engine.init_record(), values)
+    blob = record.to_bytes(rec)
+
+    cases = [
+        ("init_record", lambda: engine.init_record()),
+        ("sync_record", lambda: engine.sync_record(rec, values)),
+        ("derive_suggested_principles", lambda: engine.derive_suggested_principles(values["pfce_salience_selected"])),
+        ("tension_options", lambda: engine.tension_options(rec, catalog)),
+        ("infer_tension_type", lambda: engine.infer_tension_type("technical", "ethical")),
+        ("validate_record", lambda: engine.validate_record(rec, catalog)),
+        ("export_dict", lambda: engine.export_dict(rec, catalog)),
+        ("to_json", lambda: record.to_json(rec)),
+        ("to_bytes", lambda: record.to_bytes(rec)),
+        ("from_bytes", lambda: record.from_bytes(blob)),
+    ]
+    print(f"{'operation':<30}{'us/call':>10}")
+    for name, fn in cases:
+        print(f"{name:<30}{_per_call_us(fn, 2000):>10.2f}")
+
+    inputs = [_values(i) for i in range(args.records)]
+    t0 = time.perf_counter()
+    problems = 0
+    for v in inputs:
+        r = engine.sync_record(engine.init_record(), v)
+        problems += bool(engine.validate_record(r, catalog))
+        engine.export_dict(r, catalog)
+        engine.summary_lines(r, catalog)
+    elapsed = time.perf_counter() - t0
+    print(f"\nbatch: {args.records:,} records synced, validated and exported in {elapsed:.2f}s "
+          f"({args.records / elapsed:,.0f}/s, {problems} with problems)")
+    print(f"streamlit imported: {'streamlit' in sys.modules}")
+
+
+if __name__ == "__main__":
+    main()
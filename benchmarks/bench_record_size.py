@@ -0,0 +1,61 @@
+"""
+Per-session memory and storage size of the decision record: the old nested
+dict holding resolved text (what engine.export_dict still produces) vs. the
+compact ID/bitset record and its canonical JSON and binary forms.
+
+    python -m benchmarks.bench_record_size [--records N]
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _retained_kib(build, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(i) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del kept
+    return size / n / 1024
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--records", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    from benchmarks.bench_engine import _values
+    from logic import engine, record
+    from logic.csf_catalog import load_csf_catalog
+
+    catalog = load_csf_catalog(ROOT_DIR / "data" / "csf-export.json")
+    inputs = [_values(i) for i in range(args.records)]
+    # Examples included, so the dict carries their text as the old record did.
+    for v in inputs:
+        v["csf_include_examples"] = 1
+    records = [engine.sync_record(engine.init_record(), v) for v in inputs]
+
+    dict_kib = _retained_kib(lambda i: engine.export_dict(records[i], catalog), args.records)
+    rec_kib = _retained_kib(lambda i: engine.sync_record(engine.init_record(), inputs[i]), args.records)
+
+    rec = records[0]
+    legacy_json = len(json.dumps(engine.export_dict(rec, catalog), ensure_ascii=False).encode("utf-8"))
+    canon_json = len(record.to_json(rec).encode("utf-8"))
+    binary = len(record.to_bytes(rec))
+
+    print(f"{'':<28}{'memory KiB/session':>20}{'stored bytes':>14}")
+    print(f"{'nested dict with text':<28}{dict_kib:>20.2f}{legacy_json:>14,}")
+    print(f"{'compact record (JSON)':<28}{rec_kib:>20.2f}{canon_json:>14,}")
+    print(f"{'compact record (binary)':<28}{'':>20}{binary:>14,}")
+    assert record.from_json(record.to_json(rec)) == rec and record.from_bytes(record.to_bytes(rec)) == rec
+
+
+if __name__ == "__main__":
+    main()
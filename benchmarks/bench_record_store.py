@@ -0,0 +1,69 @@
+"""
+Cost of autosaving on step navigation: RecordStore.save() (queued, written in
+batches by the writer thread) vs. writing and committing the record inside
+the click, and how many transactions each needs.
+
+    python -m benchmarks.bench_record_store [--sessions N] [--steps N]
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _report(label, times, writes):
+    times.sort()
+    p99 = times[int(len(times) * 0.99) - 1]
+    print(f"{label:<22}{statistics.median(times):>12.1f}{p99:>10.1f}{writes:>14,}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=50)
+    ap.add_argument("--steps", type=int, default=9)
+    args = ap.parse_args(argv)
+
+    from benchmarks.bench_engine import _values
+    from logic import engine
+    from logic.record_store import _UPSERT, RecordStore, new_record_id, record_row
+
+    sessions = [(new_record_id(), engine.sync_record(engine.init_record(), _values(i)))
+                for i in range(args.sessions)]
+
+    print(f"{'':<22}{'median us':>12}{'p99 us':>10}{'transactions':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Same database setup, but every click writes and commits its own row.
+        RecordStore(Path(tmp) / "direct.sqlite3").close()
+        db = sqlite3.connect(Path(tmp) / "direct.sqlite3", isolation_level=None)
+        db.execute("PRAGMA synchronous=NORMAL")
+        times = []
+        for step in range(1, args.steps + 1):
+            for record_id, rec in sessions:
+                t0 = time.perf_counter()
+                with db:
+                    db.execute("BEGIN")
+                    db.execute(_UPSERT, record_row(record_id, rec, step))
+                times.append((time.perf_counter() - t0) * 1e6)
+        db.close()
+        _report("commit per click", times, args.sessions * args.steps)
+
+        store = RecordStore(Path(tmp) / "batched.sqlite3", flush_interval=0.05)
+        times = []
+        for step in range(1, args.steps + 1):
+            for record_id, rec in sessions:
+                t0 = time.perf_counter()
+                store.save(record_id, rec, step)
+                times.append((time.perf_counter() - t0) * 1e6)
+            time.sleep(0.01)  # users click a few times a second, not in a tight loop
+        store.close()
+        _report("save() (batched)", times, store.writes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cost of copying a fully filled-in walkthrough into its record: the full sync
+(every input re-read and rewritten, as oe_sync_record did on every call) vs.
+the incremental sync of only the inputs marked dirty (engine.sync_changes),
+including reading the values out of a session-state-like dict.
+
+    python -m benchmarks.bench_record_sync [--number N]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--number", type=int, default=5000)
+    args = ap.parse_args(argv)
+
+    from benchmarks.bench_engine import _values
+    from logic import engine
+
+    session = _values(0)  # stands in for st.session_state, keyed by input name
+    all_names = list(engine._SETTERS)
+    rec = engine.sync_record(engine.init_record(), session)
+
+    def full():
+        values = {name: session.get(name) for name in all_names}
+        engine.sync_record(rec, values, all_names)
+
+    def incremental(names):
+        values = {name: session.get(name) for name in names}
+        return engine.sync_changes(rec, values, names)
+
+    cases = [
+        ("full sync (all inputs)", all_names, full),
+        ("incremental, Step 4 dirty", engine.STEP_INPUTS[4], None),
+        ("incremental, 1 input dirty", ("decision_text",), None),
+        ("incremental, nothing dirty", (), None),
+    ]
+    print(f"{'':<30}{'us/call':>10}{'inputs':>8}")
+    for label, names, fn in cases:
+        stmt = fn or (lambda names=names: incremental(names))
+        print(f"{label:<30}{_per_call_us(stmt, args.number):>10.2f}{len(names):>8}")
+
+    # A real edit: the change set carries only the field that changed.
+    session = dict(session, decision_text="Isolate segments B and C")
+    changes = incremental(("decision_text",))
+    print(f"\nchange set after editing the decision: {sorted(changes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Memory held by the CSF informative references, measured with tracemalloc:
+
+  before: one dict per reference, with doc name/version/url copied in
+  after:  ReferenceTable (one CsfDocument per document + per-subcategory
+          parallel arrays of doc index and interned element id)
+
+    python -m benchmarks.bench_reference_table
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+SOURCE = ROOT_DIR / "data" / "csf-export.json"
+
+
+def _legacy_refs(raw):
+    """The dict-per-reference loop load_csf_export_index used to run."""
+    elements = raw["response"]["elements"]
+    doc_map = {d.get("doc_identifier"): d for d in elements["documents"] if d.get("doc_identifier")}
+    refs_by_subcat = {}
+    for r in elements["relationships"]:
+        if r.get("relationship_identifier") != "external_reference":
+            continue
+        if r.get("source_doc_identifier") != "CSF_2_0_0":
+            continue
+        dest_doc = r.get("dest_doc_identifier")
+        d = doc_map.get(dest_doc, {})
+        refs_by_subcat.setdefault(r.get("source_element_identifier"), []).append({
+            "doc_name": d.get("name") or dest_doc,
+            "doc_version": d.get("version") or "",
+            "doc_url": d.get("website") or "",
+            "dest_element_identifier": r.get("dest_element_identifier") or "",
+        })
+    return refs_by_subcat
+
+
+def _table(raw):
+    from logic.csf_catalog import ReferenceTable
+    from logic.csf_index import build_csf_index
+
+    index = build_csf_index(raw)
+    return ReferenceTable(index["documents"], index["refs_by_subcat"])
+
+
+def _traced(build, raw):
+    gc.collect()
+    tracemalloc.start()
+    obj = build(raw)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def _lookup_ns(fn, keys, rounds=200):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for k in keys:
+            fn(k)
+    return (time.perf_counter() - t0) / (rounds * len(keys)) * 1e9
+
+
+def main():
+    raw = json.loads(SOURCE.read_text(encoding="utf-8"))
+
+    legacy, legacy_bytes = _traced(_legacy_refs, raw)
+    table, table_bytes = _traced(_table, raw)
+
+    # _table also builds the rest of the index; measure it alone and subtract.
+    from logic.csf_index import build_csf_index
+
+    def _rest(raw):
+        index = build_csf_index(raw)
+        del index["documents"], index["refs_by_subcat"]
+        return index
+
+    _, rest_bytes = _traced(_rest, raw)
+    table_bytes = max(table_bytes - rest_bytes, 0)
+
+    n_refs = sum(len(v) for v in legacy.values())
+    print(f"references: {n_refs:,} across {len(legacy)} CSF elements, {len(table.documents)} documents")
+    print(f"before: {legacy_bytes / 1024:>9.1f} KiB")
+    print(f"after:  {table_bytes / 1024:>9.1f} KiB  ({1 - table_bytes / legacy_bytes:.0%} less)")
+
+    keys = list(legacy)
+    print()
+    print(f"lookup by subcategory: before {_lookup_ns(legacy.get, keys):.0f} ns, "
+          f"after {_lookup_ns(table.arrays, keys):.0f} ns (arrays), "
+          f"{_lookup_ns(table.for_subcategory, keys):.0f} ns (materialized)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Per-rerun cost of rebuilding the walkthrough's checkbox selections, and the
+session-state entries they take: one key per checkbox (oe_csf_cat_*,
+oe_csf_sub_*, oe_stakeholders_*, oe_pfce_*, oe_constraint_*) looped over on
+every rerun vs. one bitset per step decoded with set operations.
+
+    python -m benchmarks.bench_selection_bits [--number N]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--number", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    from logic.csf_catalog import load_csf_catalog
+    from logic.framework import PFCE_SUBNODES, STAKEHOLDER_OPTIONS, TEMP_CONSTRAINT_OPTIONS
+    from logic.record import CONSTRAINT_BITS, PFCE_NODE_BITS, STAKEHOLDER_BITS
+
+    catalog = load_csf_catalog(ROOT_DIR / "data" / "csf-export.json")
+    tree = catalog.tree
+    fn_ids = list(catalog.functions)
+    all_cats = [c for fn in fn_ids for c in catalog.cats_by_fn[fn]]
+    all_subs = [s for c in all_cats for s in catalog.subs_by_cat[c]]
+
+    # Roughly a third of everything ticked
+    cats = all_cats[::3]
+    subs = [s for c in cats for s in catalog.subs_by_cat[c]][::2]
+    stakeholders = STAKEHOLDER_OPTIONS[::3]
+    nodes = [(pid, n) for pid, ns in PFCE_SUBNODES.items() for n in ns][::3]
+    constraints = TEMP_CONSTRAINT_OPTIONS[::3]
+
+    # One session key per checkbox (unticked boxes still hold False once rendered)
+    per_key = {f"oe_csf_cat_{c}": c in cats for c in all_cats}
+    per_key.update({f"oe_csf_sub_{s}": s in subs for s in all_subs})
+    per_key.update({f"oe_stakeholders_{hash(s)}": s in stakeholders for s in STAKEHOLDER_OPTIONS})
+    per_key.update({f"oe_pfce_node_{pid}_{i}": (pid, n) in nodes
+                    for pid, ns in PFCE_SUBNODES.items() for i, n in enumerate(ns, start=1)})
+    per_key.update({f"oe_constraint_{c}": c in constraints for c in TEMP_CONSTRAINT_OPTIONS})
+
+    bitsets = {
+        "oe_csf_bits": tree.mask(cats + subs),
+        "oe_stakeholder_bits": STAKEHOLDER_BITS.encode(stakeholders)[0],
+        "oe_pfce_node_bits": PFCE_NODE_BITS.encode(nodes)[0],
+        "oe_constraint_bits": CONSTRAINT_BITS.encode(constraints)[0],
+    }
+
+    def rebuild_per_key():
+        sel_cats = [c for fn in fn_ids for c in catalog.cats_by_fn[fn] if per_key[f"oe_csf_cat_{c}"]]
+        sel_subs = [s for c in sel_cats for s in catalog.subs_by_cat[c] if per_key[f"oe_csf_sub_{s}"]]
+        sel_st = [s for s in STAKEHOLDER_OPTIONS if per_key[f"oe_stakeholders_{hash(s)}"]]
+        sel_nodes = [(pid, n) for pid, ns in PFCE_SUBNODES.items()
+                     for i, n in enumerate(ns, start=1) if per_key[f"oe_pfce_node_{pid}_{i}"]]
+        sel_con = [c for c in TEMP_CONSTRAINT_OPTIONS if per_key[f"oe_constraint_{c}"]]
+        return sel_cats, sel_subs, sel_st, sel_nodes, sel_con
+
+    fn_mask = 0
+    for fn in fn_ids:
+        fn_mask |= tree.child_mask(fn)
+
+    def rebuild_bits():
+        csf = bitsets["oe_csf_bits"]
+        cat_bits = csf & fn_mask
+        sub_mask = 0
+        for c in tree.ids_in(cat_bits):
+            sub_mask |= tree.subcategory_mask(c)
+        return (
+            tree.ids_in(cat_bits),
+            tree.ids_in(csf & sub_mask),
+            STAKEHOLDER_BITS.decode(bitsets["oe_stakeholder_bits"]),
+            PFCE_NODE_BITS.decode(bitsets["oe_pfce_node_bits"]),
+            CONSTRAINT_BITS.decode(bitsets["oe_constraint_bits"]),
+        )
+
+    assert rebuild_per_key() == rebuild_bits()
+
+    print(f"{'':<26}{'us/rerun':>10}{'session keys':>14}")
+    print(f"{'one key per checkbox':<26}{_per_call_us(rebuild_per_key, args.number):>10.2f}{len(per_key):>14}")
+    print(f"{'one bitset per step':<26}{_per_call_us(rebuild_bits, args.number):>10.2f}{len(bitsets):>14}")
+
+    # Set operations straight on the bitsets, e.g. outcomes two records share
+    other = tree.mask(all_subs[::4])
+    shared = bitsets["oe_csf_bits"] & other & catalog.party_sets.get("third", 0)
+    print(f"\nthird-party outcomes shared with another record: {tree.ids_in(shared)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Memory held by idle sessions before and after they are spilled to disk
+(logic.session_spill), snapshot size on disk, and the latency a user sees
+on the first rerun after coming back (restore). With Streamlit installed,
+also checks through streamlit.testing's AppTest that a spilled session is
+restored under a real script run, before a checkbox callback reads it.
+
+    python -m benchmarks.bench_session_spill [--sessions N]
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _check_app(directory):
+    """A Step 5 checkbox ticked on a spilled session keeps the other ticked stakeholders."""
+    from streamlit.testing.v1 import AppTest
+
+    from app import open_ended
+    from logic.framework import STAKEHOLDER_OPTIONS
+
+    key = open_ended.OE_STAKEHOLDER_BITS_KEY
+    open_ended.OE_SPILL_DIR = Path(directory)
+    mgr = open_ended.get_spill_manager()
+    mgr.stop()
+    # AppTest reads widget values back from session state (a browser sends them), so spill the bitset only
+    mgr.include = key.__eq__
+
+    at = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=60)
+    at.session_state["landing_complete"] = True
+    at.session_state["oe_step"] = 5
+    at.session_state[key] = 0b101100
+    at.run()
+    mgr.ttl = 0
+    assert mgr.spill_idle() == 1 and key not in at.session_state
+    next(cb for cb in at.checkbox if cb.label == STAKEHOLDER_OPTIONS[1]).check()
+    at.run()
+    assert not at.exception, at.exception
+    assert at.session_state[key] == 0b101110, bin(at.session_state[key])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    from benchmarks.bench_session_store import _include, _session_state
+    from logic.session_spill import SpillManager
+
+    clock = _Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        mgr = SpillManager(tmp, ttl=60, include=_include,
+                           drop=lambda k: k == "_oe_csf_catalog_pin", clock=clock)
+
+        expected = _session_state(0)  # imports happen outside the measurement
+        tracemalloc.start()
+        sessions = {}
+        for i in range(args.sessions):
+            state = sessions[f"s{i}"] = _session_state(i)
+            mgr.touch(f"s{i}", state)
+            mgr.release(f"s{i}")
+        held = tracemalloc.get_traced_memory()[0]
+
+        clock.now += 61
+        spilled = mgr.spill_idle()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        on_disk = sum(p.stat().st_size for p in Path(tmp).glob("*.snap"))
+
+        restore_ms = [mgr.touch(sid, state) for sid, state in sessions.items()]
+        assert sessions["s0"]["oe_record"] == expected["oe_record"]
+        assert sessions["s0"]["oe_synced_steps"] == expected["oe_synced_steps"]
+
+        print(f"sessions: {args.sessions}, spilled: {spilled}")
+        print(f"memory held:   {held / 1024:>8.1f} KiB live -> {after / 1024:.1f} KiB after spilling "
+              f"({(held - after) / args.sessions / 1024:.2f} KiB per session)")
+        print(f"on disk:       {on_disk / args.sessions:>8.0f} bytes per session (zlib)")
+        print(f"restore:       {statistics.median(restore_ms):>8.3f} ms median, {max(restore_ms):.3f} ms max")
+        print(json.dumps(mgr.stats(), indent=2))
+
+        try:
+            import streamlit  # noqa: F401
+        except ImportError:
+            print("\nstreamlit is not installed: AppTest restore check skipped")
+            return
+        logging.getLogger("streamlit").setLevel(logging.ERROR)
+        _check_app(Path(tmp) / "app")
+        print("\nspilled session restored before a checkbox callback (AppTest): ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Per-rerun latency that externalized session state adds (logic.session_store),
+for the SQLite store and the Redis-protocol store against the local stand-in
+(benchmarks/resp_standin.py), on the session state of a filled-in walkthrough:
+
+  idle rerun:  pull() finds the same version, push() finds nothing changed
+  edit rerun:  pull() as above, push() saves after one input changed
+  failover:    the first rerun on a process that has never seen the session
+
+Also checks that two processes saving the same session merge their changes,
+and that the Redis-protocol store carries on after its connection drops.
+
+    python -m benchmarks.bench_session_store [--reruns N]
+"""
+import argparse
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _session_state(i: int) -> dict:
+    """Roughly what st.session_state holds at Step 9 of a filled-in walkthrough."""
+    from benchmarks.bench_engine import _values
+    from logic import engine
+
+    values = _values(i)
+    rec = engine.sync_record(engine.init_record(), values)
+    state = {"landing_complete": True, "oe_step": 9, "oe_record": rec, "oe_record_id": f"rec{i}"}
+    state.update({f"oe_{k}": v for k, v in engine.record_inputs(rec).items()})
+    state.update({
+        "oe_csf_bits": (1 << 40) | (1 << 77) | (1 << 90),
+        "oe_stakeholder_bits": 0b1010,
+        "oe_pfce_node_bits": 0b100001,
+        "oe_synced_steps": set(range(1, 10)),
+        "oe_dirty_inputs": set(),
+        "oe_unsaved_changes": {},
+        "oe_pfce_pressure": {"summary": "", "principles": ["Justice"], "salience_selected": []},
+        "oe_csf_refs_outcome": "RS.MA-01",
+        "oe_state_version": 2,
+        "_oe_csf_catalog_pin": (9, 1, object()),  # process-local, never externalized
+    })
+    return state
+
+
+def _include(key) -> bool:
+    return isinstance(key, str) and (key.startswith("oe_") or key == "landing_complete")
+
+
+def _time_us(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1e6
+
+
+def _run(label, store, reruns):
+    from logic.session_store import SessionSync, new_session_id
+
+    sid = new_session_id()
+    state = _session_state(0)
+    sync = SessionSync(store, sid, _include)
+    sync.pull(state)
+    sync.push(state)
+
+    idle, edit = [], []
+    for n in range(reruns):
+        idle.append(_time_us(lambda: (sync.pull(state), sync.push(state))))
+        state["oe_decision_text"] = f"Isolate segment B (revision {n})"
+        edit.append(_time_us(lambda: (sync.pull(state), sync.push(state))))
+
+    failover = []
+    for _ in range(min(reruns, 200)):
+        fresh = {}
+        other = SessionSync(store, sid, _include)
+        failover.append(_time_us(lambda: other.pull(fresh)))
+    assert fresh["oe_record"] == state["oe_record"] and "_oe_csf_catalog_pin" not in fresh
+
+    for name, times in (("idle rerun", idle), ("edit rerun", edit), ("failover", failover)):
+        times.sort()
+        p99 = times[int(len(times) * 0.99) - 1]
+        print(f"{label:<10}{name:<14}{statistics.median(times):>12.1f}{p99:>10.1f}")
+
+
+def _check_merge(store):
+    from logic.session_store import SessionSync, new_session_id
+
+    sid = new_session_id()
+    a_state, b_state = _session_state(1), {}
+    a, b = SessionSync(store, sid, _include), SessionSync(store, sid, _include)
+    a.pull(a_state)
+    a.push(a_state)
+    b.pull(b_state)
+    # Both processes change a different key of the same session without seeing the other.
+    a_state["oe_decision_text"] = "from process A"
+    a.push(a_state)
+    b_state["oe_step"] = 3
+    b.push(b_state)
+    # push() only merges the stored body (widgets exist by then); B takes A's value at its next pull
+    assert b.conflicts == 1 and b_state["oe_decision_text"] != "from process A"
+    b.pull(b_state)
+    assert b_state["oe_decision_text"] == "from process A" and b_state["oe_step"] == 3
+    a.pull(a_state)
+    assert a_state["oe_step"] == 3 and a_state["oe_decision_text"] == "from process A"
+
+
+def _check_reconnect(store):
+    from logic.session_store import SessionSync, new_session_id
+
+    state = _session_state(2)
+    sync = SessionSync(store, new_session_id(), _include)
+    sync.pull(state)
+    sync.push(state)
+    # As if the server had restarted: the next command finds the socket closed.
+    store._conn._sock.shutdown(socket.SHUT_RDWR)
+    state["oe_decision_text"] = "after reconnect"
+    assert sync.push(state) and store.load(sync.session_id)[0] == 2
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--reruns", type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    from benchmarks.resp_standin import RespStandin
+    from logic.session_store import RedisSessionStore, SqliteSessionStore, encode_value
+
+    state = _session_state(0)
+    size = sum(len(encode_value(v)) for k, v in state.items() if _include(k))
+    print(f"externalized keys: {sum(map(_include, state))}, ~{size:,} bytes of JSON\n")
+    print(f"{'store':<10}{'':<14}{'median us':>12}{'p99 us':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteSessionStore(Path(tmp) / "sessions.sqlite3")
+        _run("sqlite", store, args.reruns)
+        _check_merge(store)
+        store.close()
+
+    server = RespStandin().start()
+    host, port = server.server_address[:2]
+    store = RedisSessionStore(host, port)
+    _run("resp", store, args.reruns)
+    _check_merge(store)
+    _check_reconnect(store)
+    store.close()
+    server.shutdown()
+    print("\nconcurrent saves from two processes merged: ok")
+    print("resp store reconnected after its connection dropped: ok")
+
+
+if __name__ == "__main__":
+    main()
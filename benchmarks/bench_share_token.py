@@ -0,0 +1,56 @@
+"""
+Size and cost of share/resume tokens (logic.share_token) for a filled-in
+walkthrough: token length (what ends up in the URL) next to the record's
+binary and JSON forms, and encode/decode time per call.
+
+    python -m benchmarks.bench_share_token [--number N]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--number", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    from benchmarks.bench_engine import _values
+    from logic import engine
+    from logic.record import to_bytes, to_json
+    from logic.share_token import from_token, to_token
+
+    first_five = [name for s in range(1, 6) for name in engine.STEP_INPUTS[s]]
+    cases = [
+        ("empty (step 1)", engine.init_record(), 1),
+        ("half (step 5)", engine.sync_record(engine.init_record(), _values(0), first_five), 5),
+        ("full (step 9)", engine.sync_record(engine.init_record(), _values(0)), 9),
+    ]
+    print(f"{'record':<16}{'token chars':>12}{'binary B':>10}{'json B':>9}{'encode us':>11}{'decode us':>11}")
+    for label, rec, step in cases:
+        token = to_token(rec, step)
+        assert from_token(token) == (rec, step)
+        enc = _per_call_us(lambda: to_token(rec, step), args.number)
+        dec = _per_call_us(lambda: from_token(token), args.number)
+        print(f"{label:<16}{len(token):>12}{len(to_bytes(rec)):>10}{len(to_json(rec).encode()):>9}"
+              f"{enc:>11.1f}{dec:>11.1f}")
+
+    for bad in ("", "not-a-token", to_token(cases[2][1], 9)[:-5]):
+        try:
+            from_token(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted a bad token: {bad!r}")
+    print("\nmalformed and truncated tokens rejected: ok")
+
+
+if __name__ == "__main__":
+    main()
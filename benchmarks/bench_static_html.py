@@ -0,0 +1,82 @@
+"""
+Per-rerun cost of the page's static HTML (landing page, sidebar panels,
+banner; app/static_html.py): stripping every literal with html_block() on
+each rerun vs. emitting the string static_html() prepared once per process.
+The literals are read from app/main.py. With Streamlit installed, whole
+reruns of the landing page and of Step 1 are also timed through
+streamlit.testing's AppTest.
+
+    python -m benchmarks.bench_static_html [--number N] [--reruns N]
+"""
+import argparse
+import ast
+import logging
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _literals() -> list:
+    """String literals passed to static_html() in app/main.py."""
+    tree = ast.parse((ROOT_DIR / "app" / "main.py").read_text(encoding="utf-8"))
+    return [
+        node.args[0].value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "static_html"
+        and node.args and isinstance(node.args[0], ast.Constant)
+    ]
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def _rerun_ms(at, reruns: int) -> float:
+    times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    assert not at.exception, at.exception
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--number", type=int, default=2000)
+    ap.add_argument("--reruns", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    from app.static_html import html_block, static_html
+
+    literals = _literals()
+    assert [static_html(s) for s in literals] == [html_block(s) for s in literals]
+    size = sum(len(s) for s in literals)
+    print(f"{len(literals)} static literals, {size:,} chars in app/main.py\n")
+    print(f"{'per rerun':<34}{'us':>8}")
+    print(f"{'html_block() on every literal':<34}{_per_call_us(lambda: [html_block(s) for s in literals], args.number):>8.1f}")
+    print(f"{'static_html() (cached strings)':<34}{_per_call_us(lambda: [static_html(s) for s in literals], args.number):>8.1f}")
+
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("\nstreamlit is not installed: whole-rerun timings skipped")
+        return
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    print(f"\n{'page':<14}{'rerun ms':>10}")
+    for label, state in (("landing", {}), ("step 1", {"landing_complete": True, "oe_step": 1})):
+        at = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=120)
+        for k, v in state.items():
+            at.session_state[k] = v
+        at.run()
+        print(f"{label:<14}{_rerun_ms(at, args.reruns):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Cost of one Step 4 toggle: a whole-script rerun (what every checkbox used to
+trigger) vs. a rerun of just the fragment that owns the widget (the
+category picker, the outcome picker, the additional-obligations box). Both
+are timed through streamlit.testing's AppTest: the full page from
+app/main.py, and each fragment's body on its own page, which is what a
+fragment rerun executes.
+
+    python -m benchmarks.bench_step4_fragments [--reruns N] [--outcomes N]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def _fragment_page():
+    # Runs as its own script under AppTest: imports happen inside.
+    import inspect
+
+    import streamlit as st
+
+    from app import open_ended
+    from app.steps import technical
+
+    catalog = open_ended.get_csf_catalog(4)
+    fn_ids = list(catalog.functions)
+    part = st.session_state["bench_part"]
+    if part == "categories":
+        inspect.unwrap(technical._render_csf_category_picker)(catalog, fn_ids)
+    elif part == "outcomes":
+        inspect.unwrap(technical._render_csf_outcome_picker)(catalog, fn_ids)
+    else:
+        inspect.unwrap(technical._render_technical_additional)()
+
+
+def _prepare(at, catalog, n_outcomes: int):
+    from app.open_ended import OE_CSF_BITS_KEY, OE_CSF_BITS_LAYOUT_KEY
+
+    picked = list(catalog.subcategories)[:n_outcomes]
+    cats = {catalog.subcategories[sid].category for sid in picked}
+    at.session_state["landing_complete"] = True
+    at.session_state["oe_step"] = 4
+    at.session_state[OE_CSF_BITS_KEY] = catalog.tree.mask(sorted(cats) + picked)
+    at.session_state[OE_CSF_BITS_LAYOUT_KEY] = catalog.tree.layout
+    at.run()
+    assert not at.exception, at.exception
+    return picked
+
+
+def _toggle_ms(at, pos: int, reruns: int) -> float:
+    from app.open_ended import OE_CSF_BITS_KEY
+
+    times = []
+    for _ in range(reruns):
+        at.session_state[OE_CSF_BITS_KEY] ^= 1 << pos
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    assert not at.exception, at.exception
+    return statistics.median(times) * 1000
+
+
+def _text_ms(at, reruns: int) -> float:
+    times = []
+    for n in range(reruns):
+        at.session_state["oe_technical_additional_text"] = f"Preserve forensic evidence\nRevision {n}"
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    assert not at.exception, at.exception
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--reruns", type=int, default=15)
+    ap.add_argument("--outcomes", type=int, default=25, help="outcomes ticked before timing")
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    from streamlit.testing.v1 import AppTest
+
+    from logic.csf_catalog import load_csf_catalog
+
+    catalog = load_csf_catalog(ROOT_DIR / "data" / "csf-export.json")
+
+    full = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=120)
+    picked = _prepare(full, catalog, args.outcomes)
+    outcome_pos = catalog.tree.position(picked[-1])
+    cat_pos = catalog.tree.position(catalog.subcategories[picked[0]].category)
+
+    print(f"{args.outcomes} outcomes ticked; median of {args.reruns} toggles\n")
+    print(f"{'toggle':<22}{'whole script ms':>17}{'fragment ms':>13}")
+    for label, part, pos in (
+        ("outcome checkbox", "outcomes", outcome_pos),
+        ("category checkbox", "categories", cat_pos),
+        ("additional text", "additional", None),
+    ):
+        page = AppTest.from_function(_fragment_page, default_timeout=120)
+        page.session_state["bench_part"] = part
+        _prepare(page, catalog, args.outcomes)
+        if pos is None:
+            whole = _text_ms(full, args.reruns)
+            frag = _text_ms(page, args.reruns)
+        else:
+            whole = _toggle_ms(full, pos, args.reruns)
+            frag = _toggle_ms(page, pos, args.reruns)
+        print(f"{label:<22}{whole:>17.1f}{frag:>13.1f}")
+    print("\n(a category toggle also reruns the whole step afterwards: the outcomes listed depend on it)")
+
+
+if __name__ == "__main__":
+    main()
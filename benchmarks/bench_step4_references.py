@@ -0,0 +1,83 @@
+"""
+Step 4 rerun time as the number of selected CSF outcomes grows, with the
+informative-references panel closed and with one outcome open. The panel's
+own element count is reported to show it does not grow with the selection;
+the remaining growth is the outcome checkboxes themselves.
+
+    python -m benchmarks.bench_step4_references [--reruns N]
+"""
+import argparse
+import logging
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+SIZES = (0, 10, 25, 50, 106)
+_REF_ROW = re.compile(r"- .+: `[^`]+`$")
+
+
+def _session(catalog, n_outcomes: int, open_panel: bool):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=120)
+    at.session_state["landing_complete"] = True
+    at.session_state["oe_step"] = 4
+
+    picked = list(catalog.subcategories)[:n_outcomes]
+    for sid in picked:
+        at.session_state[f"oe_csf_cat_{catalog.subcategories[sid].category}"] = True
+        at.session_state[f"oe_csf_sub_{sid}"] = True
+    if open_panel and picked:
+        # The outcome with the most references, i.e. the worst page to render.
+        at.session_state["oe_csf_refs_outcome"] = max(picked, key=catalog.references.count)
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def _panel_elements(at) -> int:
+    """Elements emitted by the references panel (selectors, pager, rows)."""
+    widgets = [w for w in (*at.selectbox, *at.number_input) if (w.key or "").startswith("oe_csf_refs_")]
+    # Only the panel's page of rows: "- <document>: `<element id>`" on every line.
+    rows = sum(
+        len(lines)
+        for lines in (m.value.split("\n") for m in at.markdown)
+        if all(_REF_ROW.match(line) for line in lines)
+    )
+    return len(widgets) + rows
+
+
+def _rerun_ms(at, reruns: int) -> float:
+    times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--reruns", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    from logic.csf_catalog import load_csf_catalog
+
+    catalog = load_csf_catalog(ROOT_DIR / "data" / "csf-export.json")
+
+    print(f"{'outcomes':>9}{'closed ms':>11}{'open ms':>10}{'panel elements':>16}")
+    for n in SIZES:
+        closed = _rerun_ms(_session(catalog, n, open_panel=False), args.reruns)
+        at = _session(catalog, n, open_panel=True)
+        opened = _rerun_ms(at, args.reruns)
+        print(f"{n:>9}{closed:>11.1f}{opened:>10.1f}{_panel_elements(at):>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Styling bytes sent per rerun: the stylesheet inlined as a <style> block on
+every rerun vs. the static bundle (app/theme.py), which the browser fetches
+once and then serves from its cache while each rerun carries only the
+loader. With Streamlit installed, each walkthrough step is also rendered
+through streamlit.testing's AppTest to count the markdown bytes a rerun
+sends and how many of them are styling (<style> blocks, style= attributes),
+with outbound network connections refused.
+
+Also checks that the stylesheet fetches nothing off-site, does not block
+rendering on its font and that the font it names is in app/static/
+(app.theme.offline_problems).
+
+    python -m benchmarks.bench_theme [--reruns N]
+"""
+import argparse
+import gzip
+import logging
+import re
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+_STYLING = re.compile(r"<style>.*?</style>|style=(\"[^\"]*\"|'[^']*')", re.S)
+
+
+def _refuse_outbound():
+    """Makes every socket connection to a non-loopback address fail, as on an air-gapped network."""
+    connect = socket.socket.connect
+
+    def local_only(sock, address):
+        host = address[0] if isinstance(address, tuple) else None
+        if host is not None and host not in ("127.0.0.1", "::1", "localhost"):
+            raise OSError(f"outbound connection refused: {host}")
+        return connect(sock, address)
+
+    socket.socket.connect = local_only
+
+
+def _steps(reruns: int):
+    from streamlit.testing.v1 import AppTest
+
+    print(f"\n{'step':>5}{'markdown B/rerun':>18}{'styling B':>11}{'rerun ms':>10}")
+    for step in range(1, 10):
+        at = AppTest.from_file(str(ROOT_DIR / "app" / "main.py"), default_timeout=120)
+        at.session_state["landing_complete"] = True
+        at.session_state["oe_step"] = step
+        at.run()
+        assert not at.exception, at.exception
+        times = []
+        for _ in range(reruns):
+            t0 = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - t0)
+        bodies = [m.value for m in at.markdown]
+        total = sum(len(b.encode("utf-8")) for b in bodies)
+        styling = sum(len(m.group(0).encode("utf-8")) for b in bodies for m in _STYLING.finditer(b))
+        print(f"{step:>5}{total:>18,}{styling:>11,}{statistics.median(times) * 1000:>10.1f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--reruns", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    from app.theme import STATIC_DIR, THEME_SOURCE, loader_html, offline_problems, write_theme_bundle
+
+    css = THEME_SOURCE.read_bytes()
+    inline = len(b"<style>\n" + css + b"\n</style>")
+    name = write_theme_bundle()
+    bundle = (STATIC_DIR / name).read_bytes()
+    assert bundle == css
+    loader = len(loader_html().encode("utf-8"))
+
+    print(f"bundle: app/static/{name}")
+    print(f"{'':<34}{'first load B':>14}{'each rerun B':>14}")
+    print(f"{'stylesheet inlined every rerun':<34}{inline:>14,}{inline:>14,}")
+    print(f"{'static bundle + loader':<34}{len(bundle) + loader:>14,}{loader:>14,}")
+    print(f"{'  (bundle gzipped)':<34}{len(gzip.compress(bundle)):>14,}")
+
+    problems = offline_problems()
+    assert not problems, problems
+    print("\nno off-site fetches, render-blocking font loads or missing font files: ok")
+
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("\nstreamlit is not installed: per-step rerun payloads skipped")
+        return
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    _refuse_outbound()
+    _steps(args.reruns)
+
+
+if __name__ == "__main__":
+    main()
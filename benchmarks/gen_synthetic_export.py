@@ -0,0 +1,77 @@
+"""
+Writes a synthetic multi-framework export N times the size of
+data/csf-export.json.
+
+The CSF elements and relationships are kept as-is. Every document, element
+and relationship is then copied N-1 more times under other document
+identifiers (SYN<k>_...), which stands in for the extra frameworks of a full
+OLIR crosswalk set. The CSF index built from the output is therefore the same
+at every scale; only the raw JSON grows.
+
+    python -m benchmarks.gen_synthetic_export SCALE OUT_PATH
+"""
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SOURCE = ROOT_DIR / "data" / "csf-export.json"
+
+_DOC_KEYS = ("doc_identifier", "source_doc_identifier", "dest_doc_identifier", "provenance_doc_identifier")
+
+
+def _retarget(item: dict, prefix: str) -> dict:
+    out = dict(item)
+    for k in _DOC_KEYS:
+        if k in out and out[k]:
+            out[k] = prefix + out[k]
+    return out
+
+
+def _write_array(f, items, scale: int, retarget: bool):
+    f.write("[")
+    first = True
+    for k in range(scale):
+        prefix = f"SYN{k}_"
+        for item in items:
+            if k and retarget:
+                item = _retarget(item, prefix)
+            elif k:
+                continue
+            if not first:
+                f.write(",")
+            first = False
+            f.write("\n")
+            f.write(json.dumps(item, indent=2))
+    f.write("\n]")
+
+
+def write_synthetic_export(scale: int, out_path, source=SOURCE) -> Path:
+    raw = json.loads(Path(source).read_text(encoding="utf-8"))
+    resp = raw["response"]
+    root = resp["elements"]
+
+    out_path = Path(out_path)
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write('{"response": {"requestType": %s, "elements": {' % json.dumps(resp.get("requestType")))
+        for i, key in enumerate(("documents", "elements", "relationship_types", "relationships")):
+            if i:
+                f.write(", ")
+            f.write(json.dumps(key) + ": ")
+            _write_array(f, root.get(key, []), scale, retarget=key != "relationship_types")
+        f.write("}}}\n")
+    return out_path
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: python -m benchmarks.gen_synthetic_export SCALE OUT_PATH", file=sys.stderr)
+        return 2
+    out = write_synthetic_export(int(argv[0]), argv[1])
+    print(f"wrote {out} ({out.stat().st_size:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
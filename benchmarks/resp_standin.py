@@ -0,0 +1,132 @@
+"""
+Local stand-in for a Redis server: the subset of RESP2 that
+logic.session_store.RedisSessionStore uses (PING, SELECT, GET, SET [EX n],
+DEL, WATCH, UNWATCH, MULTI, EXEC, DISCARD), in memory, on a thread. EX is
+accepted and ignored. For running the store without a Redis install.
+
+    python -m benchmarks.resp_standin [--port N]
+"""
+import argparse
+import socketserver
+import threading
+
+
+class _Data:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.revs = {}  # key -> write counter, for WATCH
+
+    def write(self, key, value):
+        if value is None:
+            self.values.pop(key, None)
+        else:
+            self.values[key] = value
+        self.revs[key] = self.revs.get(key, 0) + 1
+
+
+def _bulk(b):
+    return b"$-1\r\n" if b is None else b"$%d\r\n%s\r\n" % (len(b), b)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        data = self.server.data
+        watched = {}
+        queue = None
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            if queue is not None and name not in (b"EXEC", b"DISCARD", b"MULTI", b"WATCH"):
+                queue.append(args)
+                self.wfile.write(b"+QUEUED\r\n")
+                continue
+            if name == b"MULTI":
+                queue = []
+                reply = b"+OK\r\n"
+            elif name == b"DISCARD":
+                queue, watched = None, {}
+                reply = b"+OK\r\n"
+            elif name == b"EXEC":
+                with data.lock:
+                    if any(data.revs.get(k, 0) != rev for k, rev in watched.items()):
+                        reply = b"*-1\r\n"
+                    else:
+                        replies = [self._run(data, a) for a in queue or ()]
+                        reply = b"*%d\r\n" % len(replies) + b"".join(replies)
+                queue, watched = None, {}
+            elif name == b"WATCH":
+                with data.lock:
+                    for k in args[1:]:
+                        watched[k] = data.revs.get(k, 0)
+                reply = b"+OK\r\n"
+            elif name == b"UNWATCH":
+                watched = {}
+                reply = b"+OK\r\n"
+            else:
+                with data.lock:
+                    reply = self._run(data, args)
+            self.wfile.write(reply)
+
+    @staticmethod
+    def _run(data, args):
+        name = args[0].upper()
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            return _bulk(data.values.get(args[1]))
+        if name == b"SET":
+            data.write(args[1], args[2])
+            return b"+OK\r\n"
+        if name == b"DEL":
+            n = sum(1 for k in args[1:] if k in data.values)
+            for k in args[1:]:
+                data.write(k, None)
+            return b":%d\r\n" % n
+        return b"-ERR unknown command '%s'\r\n" % args[0]
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        n = int(line[1:-2])
+        args = []
+        for _ in range(n):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+
+class RespStandin(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.data = _Data()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RespStandin":
+        threading.Thread(target=self.serve_forever, name="resp-standin", daemon=True).start()
+        return self
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--port", type=int, default=6379)
+    args = ap.parse_args(argv)
+    server = RespStandin(port=args.port)
+    print(f"listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
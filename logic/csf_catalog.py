@@ -0,0 +1,319 @@
+"""
+Read-only CSF catalog shared by every session in the process.
+
+The catalog is built once from the index produced by logic.csf_index (or its
+snapshot) and is never mutated afterwards: lookups are MappingProxyType views
+over dicts of NamedTuples, and every list is a tuple. Because nothing can be
+changed through it, callers can share one instance instead of each getting a
+private copy.
+"""
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+from typing import NamedTuple
+
+from logic.csf_index import NODE_CATEGORY, NODE_SUBCATEGORY
+from logic.record import iter_bits, range_mask
+from logic.csf_search import CsfSearchIndex
+from logic.csf_snapshot import load_csf_index
+
+
+class CsfFunction(NamedTuple):
+    id: str
+    title: str
+    description: str
+
+
+class CsfCategory(NamedTuple):
+    id: str
+    title: str
+    description: str
+    function: str
+
+
+class CsfSubcategory(NamedTuple):
+    id: str
+    text: str
+    category: str
+
+
+class CsfExample(NamedTuple):
+    id: str
+    text: str
+    subcategory: str
+
+
+class CsfParty(NamedTuple):
+    id: str
+    title: str
+    text: str
+    bit: int
+
+
+class CsfDocument:
+    """One informative-reference document (SP 800-53, SSDF, ...); shared by all its references."""
+
+    __slots__ = ("index", "id", "name", "version", "url")
+
+    def __init__(self, index: int, id: str, name: str, version: str, url: str):
+        self.index = index
+        self.id = id
+        self.name = name
+        self.version = version
+        self.url = url
+
+    def __repr__(self):
+        return f"CsfDocument({self.id!r})"
+
+
+class CsfReference:
+    __slots__ = ("document", "element_id")
+
+    def __init__(self, document: CsfDocument, element_id: str):
+        self.document = document
+        self.element_id = element_id
+
+    def __repr__(self):
+        return f"CsfReference({self.document.id!r}, {self.element_id!r})"
+
+
+class ReferenceTable:
+    """
+    Informative references per subcategory, stored as parallel arrays
+    (document index, element id) against one interned CsfDocument per
+    document. CsfReference objects are only created when asked for.
+    """
+
+    __slots__ = ("documents", "_by_subcat")
+
+    _EMPTY = (array("H"), ())
+
+    def __init__(self, documents, refs_by_subcat):
+        self.documents = tuple(CsfDocument(i, *row) for i, row in enumerate(documents))
+        self._by_subcat = MappingProxyType(dict(refs_by_subcat))
+
+    def count(self, sid: str) -> int:
+        return len(self._by_subcat.get(sid, self._EMPTY)[1])
+
+    def arrays(self, sid: str):
+        """(doc_indexes, element_ids) for `sid`; both empty if it has no references."""
+        return self._by_subcat.get(sid, self._EMPTY)
+
+    def for_subcategory(self, sid: str) -> tuple:
+        doc_idxs, elem_ids = self._by_subcat.get(sid, self._EMPTY)
+        docs = self.documents
+        return tuple(CsfReference(docs[d], e) for d, e in zip(doc_idxs, elem_ids))
+
+    def doc_counts(self, sid: str) -> tuple:
+        """((CsfDocument, n_refs), ...) for `sid`, in document order."""
+        doc_idxs = self._by_subcat.get(sid, self._EMPTY)[0]
+        out = []
+        i = 0
+        while i < len(doc_idxs):
+            j = bisect_right(doc_idxs, doc_idxs[i], i)
+            out.append((self.documents[doc_idxs[i]], j - i))
+            i = j
+        return tuple(out)
+
+    def page(self, sid: str, start: int, stop: int, doc_index: int = None) -> tuple:
+        """
+        Materializes only references [start:stop) of `sid`, optionally
+        restricted to one document.
+        """
+        doc_idxs, elem_ids = self._by_subcat.get(sid, self._EMPTY)
+        lo, hi = 0, len(doc_idxs)
+        if doc_index is not None:
+            lo = bisect_left(doc_idxs, doc_index)
+            hi = bisect_right(doc_idxs, doc_index, lo)
+        start, stop = min(lo + start, hi), min(lo + stop, hi)
+        docs = self.documents
+        return tuple(CsfReference(docs[doc_idxs[i]], elem_ids[i]) for i in range(start, stop))
+
+
+class CsfTree:
+    """
+    Function -> category -> subcategory hierarchy as flat arrays laid out
+    breadth-first (see logic.csf_index._build_tree). Parent, function and
+    child/descendant ranges are all single array reads. A selection of nodes
+    can be held as one bitset over tree positions (mask / ids_in).
+
+    Positions change when the catalog does; `layout` is a digest of the ID
+    order, so a bitset kept with its layout can be told apart from one over
+    another version of the tree.
+    """
+
+    __slots__ = ("ids", "types", "parent", "child_start", "child_end", "function", "layout", "_pos")
+
+    def __init__(self, tree: dict):
+        self.ids = tree["ids"]
+        self.types = tree["types"]
+        self.parent = tree["parent"]
+        self.child_start = tree["child_start"]
+        self.child_end = tree["child_end"]
+        self.function = tree["function"]
+        self.layout = hashlib.blake2s("\n".join(self.ids).encode("utf-8"), digest_size=8).hexdigest()
+        self._pos = MappingProxyType({nid: i for i, nid in enumerate(self.ids)})
+
+    def position(self, nid: str) -> int:
+        return self._pos[nid]
+
+    def parent_id(self, nid: str):
+        p = self.parent[self._pos[nid]]
+        return self.ids[p] if p >= 0 else None
+
+    def function_id(self, nid: str) -> str:
+        return self.ids[self.function[self._pos[nid]]]
+
+    def children(self, nid: str) -> tuple:
+        i = self._pos[nid]
+        return self.ids[self.child_start[i]:self.child_end[i]]
+
+    def subcategory_range(self, nid: str) -> tuple:
+        """[start, end) positions of the subcategories at or under `nid`."""
+        i = self._pos[nid]
+        if self.types[i] == NODE_SUBCATEGORY:
+            return i, i + 1
+        if self.types[i] == NODE_CATEGORY:
+            return self.child_start[i], self.child_end[i]
+        first, last = self.child_start[i], self.child_end[i] - 1
+        if last < first:
+            return 0, 0
+        # BFS layout: the categories' children are one contiguous block.
+        return self.child_start[first], self.child_end[last]
+
+    def child_mask(self, nid: str) -> int:
+        """Bitset of the positions of `nid`'s children."""
+        i = self._pos[nid]
+        return range_mask(self.child_start[i], self.child_end[i])
+
+    def subcategory_mask(self, nid: str) -> int:
+        """Bitset of the subcategories at or under `nid`."""
+        return range_mask(*self.subcategory_range(nid))
+
+    def mask(self, nids) -> int:
+        """Bitset of the positions of `nids` (unknown IDs are ignored)."""
+        pos = self._pos
+        bits = 0
+        for nid in nids:
+            i = pos.get(nid)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def ids_in(self, bits: int) -> list:
+        """Node IDs of the set bits, in tree (framework) order."""
+        ids = self.ids
+        return [ids[i] for i in iter_bits(bits & range_mask(0, len(ids)))]
+
+    def rollup(self, sub_ids) -> dict:
+        """{FN_ID: {CAT_ID: [SUB_ID, ...]}} for `sub_ids`, in framework order."""
+        out = {}
+        ids, parent, function = self.ids, self.parent, self.function
+        for i in sorted(self._pos[sid] for sid in sub_ids if sid in self._pos):
+            out.setdefault(ids[function[i]], {}).setdefault(ids[parent[i]], []).append(ids[i])
+        return out
+
+
+def _frozen(d: dict) -> MappingProxyType:
+    return MappingProxyType(d)
+
+
+class CsfCatalog:
+    """
+    Immutable view over the CSF export index.
+
+    Attributes:
+      functions: {FN_ID: CsfFunction}
+      categories: {CAT_ID: CsfCategory}
+      subcategories: {SUB_ID: CsfSubcategory}
+      cats_by_fn: {FN_ID: (CAT_ID, ...)}
+      subs_by_cat: {CAT_ID: (SUB_ID, ...)}
+      tree: CsfTree (hierarchy built from the export's projections)
+      examples: {SUB_ID: (CsfExample, ...)}  implementation examples
+      parties: {PARTY_ID: CsfParty}  deduplicated ("first", "third")
+      party_masks: {SUB_ID: int}  bitmask over CsfParty.bit
+      party_sets: {PARTY_ID: int}  bitset of the outcomes (tree positions) involving the party
+      references: ReferenceTable of informative references by SUB_ID
+      search: CsfSearchIndex ranking SUB_IDs for free-text queries
+    """
+
+    __slots__ = (
+        "functions",
+        "categories",
+        "subcategories",
+        "cats_by_fn",
+        "subs_by_cat",
+        "tree",
+        "examples",
+        "parties",
+        "party_masks",
+        "party_sets",
+        "references",
+        "search",
+    )
+
+    def __init__(self, index):
+        functions = index["functions"]
+        categories = index["categories"]
+        subcats = index["subcats"]
+
+        set_ = object.__setattr__
+        set_(self, "functions", _frozen({
+            fid: CsfFunction(fid, f["title"], f["description"]) for fid, f in functions.items()
+        }))
+        set_(self, "categories", _frozen({
+            cid: CsfCategory(cid, c["title"], c["description"], c["function"])
+            for cid, c in categories.items()
+        }))
+        set_(self, "subcategories", _frozen({
+            sid: CsfSubcategory(sid, s["text"], s["category"]) for sid, s in subcats.items()
+        }))
+        set_(self, "cats_by_fn", _frozen({k: tuple(v) for k, v in index["cats_by_fn"].items()}))
+        set_(self, "subs_by_cat", _frozen({k: tuple(v) for k, v in index["subs_by_cat"].items()}))
+        set_(self, "tree", CsfTree(index["tree"]))
+        set_(self, "examples", _frozen({
+            sid: tuple(CsfExample(eid, text, sid) for eid, text in exs)
+            for sid, exs in index["examples_by_subcat"].items()
+        }))
+        set_(self, "parties", _frozen({
+            pid: CsfParty(pid, title, text, bit) for bit, (pid, title, text) in enumerate(index["parties"])
+        }))
+        set_(self, "party_masks", _frozen(dict(index["party_mask"])))
+        set_(self, "party_sets", _frozen({
+            p.id: self.tree.mask(sid for sid, m in self.party_masks.items() if m >> p.bit & 1)
+            for p in self.parties.values()
+        }))
+        set_(self, "references", ReferenceTable(index["documents"], index["refs_by_subcat"]))
+        set_(self, "search", CsfSearchIndex(self._search_fields()))
+
+    def _search_fields(self):
+        for sid, sub in self.subcategories.items():
+            cat = self.categories.get(sub.category)
+            fn = self.functions.get(cat.function) if cat else None
+            fields = [("outcome", sid), ("outcome", sub.text)]
+            fields.extend(("example", ex.text) for ex in self.examples.get(sid, ()))
+            if cat:
+                fields.append(("category", f"{cat.title} {cat.description}"))
+            if fn:
+                fields.append(("function", f"{fn.title} {fn.description}"))
+            yield sid, fields
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CsfCatalog is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("CsfCatalog is read-only")
+
+    def party_bit(self, party_id: str) -> int:
+        """Mask bit for `party_id`, or 0 if the export has no such party."""
+        p = self.parties.get(party_id)
+        return (1 << p.bit) if p else 0
+
+    def subcategory_text(self, sid: str) -> str:
+        s = self.subcategories.get(sid)
+        return s.text if s else sid
+
+
+def load_csf_catalog(path) -> CsfCatalog:
+    return CsfCatalog(load_csf_index(path))
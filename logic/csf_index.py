@@ -0,0 +1,285 @@
+"""
+Parser for the NIST CSF reference-tool export (data/csf-export.json).
+
+Kept free of Streamlit so it can run in offline build steps and benchmarks.
+parse_csf_export() streams the file; build_csf_index() indexes a document
+that is already in memory.
+"""
+import sys
+from array import array
+
+from logic.json_stream import iter_array_items
+
+CSF_DOC_ID = "CSF_2_0_0"
+
+
+class CsfIndexBuilder:
+    """
+    Builds indexes from the NIST CSF reference-tool export schema, one record
+    at a time, so callers can feed it from a parsed document or a stream.
+    Only what the index needs is retained; elements and relationships of
+    other documents are dropped as they arrive. Records may arrive in any
+    order; cross-references are resolved in finish().
+
+    finish() returns a dict with:
+      functions: {FN_ID: {"title":..., "description":...}}
+      categories: {CAT_ID: {"title":..., "description":..., "function": FN_ID}}
+      subcats: {SUB_ID: {"text":..., "category": CAT_ID}}
+      cats_by_fn: {FN_ID: [CAT_ID, ...]}
+      subs_by_cat: {CAT_ID: [SUB_ID, ...]}
+      tree: function -> category -> subcategory hierarchy as flat arrays (see _build_tree)
+      documents: ((doc_identifier, name, version, url), ...)  one row per referenced document
+      refs_by_subcat: {SUB_ID: (doc_indexes, element_ids)}
+        parallel arrays: doc_indexes is an array("H") of positions in `documents`,
+        element_ids a tuple of interned dest_element_identifier strings,
+        sorted by document
+      examples_by_subcat: {SUB_ID: ((EXAMPLE_ID, text), ...)}  implementation examples,
+        linked to their subcategory by `projection` relationships
+      parties: ((PARTY_ID, title, text), ...)  deduplicated party elements ("first", "third");
+        a party's position is its bit in party_mask
+      party_mask: {SUB_ID: int}  bitmask of the parties a subcategory is projected to
+    """
+
+    def __init__(self):
+        self.doc_meta = {}
+        self.functions = {}
+        self.categories = {}
+        self.subcats = {}
+        self.example_text = {}
+        self.party_bit = {}
+        self.parties = []
+        self.projections = []
+        self.doc_index = {}
+        self.refs_by_subcat = {}
+
+    def add_document(self, d: dict):
+        doc_id = d.get("doc_identifier")
+        if doc_id:
+            self.doc_meta[doc_id] = (d.get("name") or doc_id, d.get("version") or "", d.get("website") or "")
+
+    def add_element(self, e: dict):
+        if e.get("doc_identifier") != CSF_DOC_ID:
+            return
+
+        et = e.get("element_type")
+        eid = e.get("element_identifier")
+        title = (e.get("title") or "").strip()
+        text = (e.get("text") or "").strip()
+
+        if et == "function":
+            self.functions[eid] = {"title": title or eid, "description": text}
+
+        elif et == "category":
+            self.categories[eid] = {"title": title or eid, "description": text, "function": ""}
+
+        elif et == "subcategory":
+            self.subcats[eid] = {"text": text, "category": ""}
+
+        elif et == "implementation_example":
+            self.example_text[eid] = text
+
+        elif et == "party":
+            # The export repeats "first"/"third" once per subcategory; keep one of each.
+            if eid not in self.party_bit:
+                self.party_bit[eid] = len(self.parties)
+                self.parties.append((eid, title or eid, text))
+
+    def add_relationship(self, r: dict):
+        if r.get("source_doc_identifier") != CSF_DOC_ID:
+            return
+
+        rel = r.get("relationship_identifier")
+        if rel == "projection":
+            # Classified in finish(), once every element type is known.
+            self.projections.append((r.get("source_element_identifier"), r.get("dest_element_identifier")))
+            return
+
+        if rel != "external_reference":
+            return
+
+        src_subcat = r.get("source_element_identifier")  # e.g., GV.OC-01
+        dest_doc = r.get("dest_doc_identifier")
+        dest_elem = r.get("dest_element_identifier")
+
+        # One row per document; references only carry its position.
+        di = self.doc_index.get(dest_doc)
+        if di is None:
+            di = self.doc_index[dest_doc] = len(self.doc_index)
+
+        doc_idxs, elem_ids = self.refs_by_subcat.setdefault(src_subcat, (array("H"), []))
+        doc_idxs.append(di)
+        elem_ids.append(sys.intern(dest_elem or ""))
+
+    def finish(self) -> dict:
+        functions, categories, subcats = self.functions, self.categories, self.subcats
+        example_text, party_bit = self.example_text, self.party_bit
+
+        # --- Projections: hierarchy, implementation examples, parties ---
+        parent_of = {}
+        conflicts = []
+        examples_by_subcat = {}
+        party_mask = {}
+        for src, dest in self.projections:
+            if (src in functions and dest in categories) or (src in categories and dest in subcats):
+                prev = parent_of.setdefault(dest, src)
+                if prev != src:
+                    conflicts.append(f"{dest} is projected from both {prev} and {src}")
+            elif src in subcats and dest in example_text:
+                # Subcategory -> implementation example (e.g. GV.OC-01 -> GV.OC-01.001)
+                examples_by_subcat.setdefault(src, []).append((dest, example_text[dest]))
+            elif src in subcats and dest in party_bit:
+                # Subcategory -> party (1st/3rd-party risk)
+                party_mask[src] = party_mask.get(src, 0) | (1 << party_bit[dest])
+
+        tree = _build_tree(functions, categories, subcats, parent_of, conflicts)
+
+        # Parent links and child lists come from the tree, not from parsing IDs.
+        ids, parent = tree["ids"], tree["parent"]
+        cats_by_fn = {fn_id: [] for fn_id in functions}
+        subs_by_cat = {cat_id: [] for cat_id in categories}
+        for i, nid in enumerate(ids):
+            if nid in categories:
+                categories[nid]["function"] = ids[parent[i]]
+                cats_by_fn[ids[parent[i]]].append(nid)
+            elif nid in subcats:
+                subcats[nid]["category"] = ids[parent[i]]
+                subs_by_cat[ids[parent[i]]].append(nid)
+
+        documents = [None] * len(self.doc_index)
+        for doc_id, di in self.doc_index.items():
+            documents[di] = (doc_id, *self.doc_meta.get(doc_id, (doc_id, "", "")))
+
+        # Group each element's references by document (stable), so one document's
+        # references form a contiguous range.
+        refs_by_subcat = {}
+        for sid, (idxs, elem_ids) in self.refs_by_subcat.items():
+            order = sorted(range(len(idxs)), key=idxs.__getitem__)
+            refs_by_subcat[sid] = (array("H", (idxs[i] for i in order)), tuple(elem_ids[i] for i in order))
+
+        return {
+            "functions": functions,
+            "categories": categories,
+            "subcats": subcats,
+            "cats_by_fn": cats_by_fn,
+            "subs_by_cat": subs_by_cat,
+            "tree": tree,
+            "documents": tuple(documents),
+            "refs_by_subcat": refs_by_subcat,
+            "examples_by_subcat": {
+                sid: tuple(sorted(set(exs))) for sid, exs in examples_by_subcat.items()
+            },
+            "parties": tuple(self.parties),
+            "party_mask": party_mask,
+        }
+
+
+def build_csf_index(raw: dict):
+    """Indexes an already-parsed export. See CsfIndexBuilder for the result."""
+    root = raw.get("response", {}).get("elements", {})
+
+    builder = CsfIndexBuilder()
+    for d in root.get("documents", []):
+        builder.add_document(d)
+    for e in root.get("elements", []):
+        builder.add_element(e)
+    for r in root.get("relationships", []):
+        builder.add_relationship(r)
+    return builder.finish()
+
+
+NODE_FUNCTION = 0
+NODE_CATEGORY = 1
+NODE_SUBCATEGORY = 2
+
+
+def _expected_parent(nid: str, node_type: int) -> str:
+    # CSF 2.0 ID convention, used only to validate the projections.
+    if node_type == NODE_CATEGORY:
+        return nid.split(".")[0]  # GV.OC -> GV
+    return nid.split("-")[0]  # GV.OC-01 -> GV.OC
+
+
+def _build_tree(functions, categories, subcats, parent_of, conflicts):
+    """
+    Lays the hierarchy out breadth-first so every node's children are
+    contiguous. Returns:
+      ids:         (NODE_ID, ...)       functions, then categories, then subcategories
+      types:       bytes                NODE_FUNCTION / NODE_CATEGORY / NODE_SUBCATEGORY
+      parent:      array("h")           parent position, -1 for functions
+      child_start: array("H")           children of node i are positions
+      child_end:   array("H")             [child_start[i], child_end[i])
+      function:    array("H")           position of the node's function (itself for functions)
+    Raises ValueError if a projection contradicts the ID convention, a node
+    has two parents, or a category/subcategory has no parent.
+    """
+    problems = list(conflicts)
+    for nid, node_type in [(c, NODE_CATEGORY) for c in categories] + [(s, NODE_SUBCATEGORY) for s in subcats]:
+        got = parent_of.get(nid)
+        if got is None:
+            problems.append(f"{nid} has no parent projection")
+        elif got != _expected_parent(nid, node_type):
+            problems.append(f"{nid} is projected from {got}, expected {_expected_parent(nid, node_type)}")
+    if problems:
+        raise ValueError("Invalid CSF hierarchy in export: " + "; ".join(problems[:10]))
+
+    children = {}
+    for nid in (*categories, *subcats):  # element order, so siblings keep export order
+        children.setdefault(parent_of[nid], []).append(nid)
+
+    ids = list(functions)
+    level = list(functions)
+    while level:
+        level = [c for nid in level for c in children.get(nid, ())]
+        ids.extend(level)
+
+    pos = {nid: i for i, nid in enumerate(ids)}
+    n = len(ids)
+    types = bytearray(n)
+    parent = array("h", [-1]) * n
+    child_start = array("H", [0]) * n
+    child_end = array("H", [0]) * n
+    function = array("H", [0]) * n
+
+    for i, nid in enumerate(ids):
+        if nid in categories:
+            types[i] = NODE_CATEGORY
+        elif nid in subcats:
+            types[i] = NODE_SUBCATEGORY
+        if nid in parent_of:
+            parent[i] = pos[parent_of[nid]]
+        kids = children.get(nid)
+        if kids:
+            child_start[i] = pos[kids[0]]
+            child_end[i] = pos[kids[-1]] + 1
+        # Parents precede children in BFS order, so theirs is already set.
+        function[i] = i if parent[i] < 0 else function[parent[i]]
+
+    return {
+        "ids": tuple(ids),
+        "types": bytes(types),
+        "parent": parent,
+        "child_start": child_start,
+        "child_end": child_end,
+        "function": function,
+    }
+
+
+_EXPORT_ROOT = ("response", "elements")
+
+
+def parse_csf_export(path, chunk: int = 1 << 16):
+    """
+    Streams the JSON export (the cold, uncached path) into a CsfIndexBuilder.
+    Memory is bounded by the index plus one record, not by the file size, so
+    this also copes with full multi-framework OLIR exports.
+    """
+    builder = CsfIndexBuilder()
+    handlers = {
+        _EXPORT_ROOT + ("documents",): builder.add_document,
+        _EXPORT_ROOT + ("elements",): builder.add_element,
+        _EXPORT_ROOT + ("relationships",): builder.add_relationship,
+    }
+    with open(path, encoding="utf-8") as f:
+        for key_path, item in iter_array_items(f, handlers, chunk):
+            handlers[key_path](item)
+    return builder.finish()
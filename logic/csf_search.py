@@ -0,0 +1,129 @@
+"""
+In-memory BM25 search over CSF outcomes (subcategories).
+
+Each outcome is indexed as one document made of weighted fields: its own
+text, its implementation examples, and the title/description of its category
+and function. Postings are stored as parallel arrays (document position,
+weighted term frequency) per term, so a query touches only the postings of
+its own terms. The last query term also matches as a prefix, which keeps
+partially typed words useful.
+"""
+import re
+from array import array
+from bisect import bisect_left
+from math import log
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the their "
+    "to was were which with e g eg".split()
+)
+
+# Field weights: a hit in the outcome's own text matters most.
+FIELD_WEIGHTS = {
+    "outcome": 2.0,
+    "example": 1.0,
+    "category": 1.0,
+    "function": 0.5,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _stem(tok: str) -> str:
+    # Deliberately tiny: enough to fold plurals and common verb forms together.
+    for suffix in ("ing", "ies", "ed", "es", "s"):
+        if len(tok) > len(suffix) + 3 and tok.endswith(suffix):
+            return tok[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return tok
+
+
+def tokenize(text: str) -> list:
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class CsfSearchIndex:
+    __slots__ = ("doc_ids", "_postings", "_terms", "_idf", "_norm")
+
+    def __init__(self, fields_by_doc):
+        """
+        fields_by_doc: iterable of (SUB_ID, [(field_name, text), ...]).
+        """
+        doc_ids = []
+        tfs = []
+        for sid, fields in fields_by_doc:
+            tf = {}
+            for field, text in fields:
+                w = FIELD_WEIGHTS[field]
+                for tok in tokenize(text):
+                    tf[tok] = tf.get(tok, 0.0) + w
+            doc_ids.append(sid)
+            tfs.append(tf)
+
+        n_docs = len(doc_ids)
+        doc_len = [sum(tf.values()) for tf in tfs]
+        avgdl = (sum(doc_len) / n_docs) if n_docs else 1.0
+
+        postings = {}
+        for pos, tf in enumerate(tfs):
+            for tok, f in tf.items():
+                docs, freqs = postings.setdefault(tok, (array("H"), array("f")))
+                docs.append(pos)
+                freqs.append(f)
+
+        # BM25 idf (Lucene variant, never negative)
+        self._idf = {
+            tok: log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for tok, (docs, _) in postings.items()
+        }
+        # Per-document length normalisation, precomputed once.
+        self._norm = array("f", (BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl) for dl in doc_len))
+        self._postings = postings
+        self._terms = tuple(sorted(postings))
+        self.doc_ids = tuple(doc_ids)
+
+    def _expand_prefix(self, prefix: str) -> list:
+        terms = self._terms
+        i = bisect_left(terms, prefix)
+        out = []
+        while i < len(terms) and terms[i].startswith(prefix):
+            out.append(terms[i])
+            i += 1
+        return out
+
+    def search(self, query: str, limit: int = None) -> list:
+        """[(SUB_ID, score), ...] best first; empty for an empty query."""
+        raw = _TOKEN_RE.findall(query.lower())
+        if not raw:
+            return []
+
+        terms = {}
+        for t in raw[:-1]:
+            if t not in _STOPWORDS:
+                terms[_stem(t)] = 1.0
+        # Search-as-you-type: the last word may be unfinished.
+        last = raw[-1]
+        if last not in _STOPWORDS or len(raw) == 1:
+            stemmed = _stem(last)
+            terms[stemmed] = 1.0
+            for t in self._expand_prefix(last):
+                terms.setdefault(t, 0.8)
+
+        scores = {}
+        norm = self._norm
+        for tok, boost in terms.items():
+            hit = self._postings.get(tok)
+            if hit is None:
+                continue
+            idf = self._idf[tok] * boost
+            docs, freqs = hit
+            for pos, f in zip(docs, freqs):
+                scores[pos] = scores.get(pos, 0.0) + idf * f * (BM25_K1 + 1) / (f + norm[pos])
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        ids = self.doc_ids
+        return [(ids[pos], score) for pos, score in ranked]
@@ -0,0 +1,114 @@
+"""
+Precompiled binary snapshot of the CSF export index.
+
+The JSON export is ~3 MB / 57k lines, and parsing it is the slowest part of a
+cold start. This module compiles the parsed index into a versioned binary file
+keyed by the SHA-256 of the source JSON, and loads it back via mmap.
+
+Build (offline, e.g. as a deploy step):
+
+    python -m logic.csf_snapshot data/csf-export.json
+
+Layout:
+    header  = MAGIC (8s) | format version (H) | pickle protocol (H) |
+              source sha256 (32s) | payload length (Q)
+    payload = pickle of the index dict produced by logic.csf_index
+
+A snapshot is used only when the magic, format version and source digest all
+match; anything else (missing, truncated, stale, older format) falls back to
+parsing the JSON.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+from pathlib import Path
+
+from logic.csf_index import parse_csf_export
+
+SNAPSHOT_MAGIC = b"CSFSNAP\x00"
+# Bump whenever the shape of the pickled index changes.
+SNAPSHOT_FORMAT_VERSION = 6
+SNAPSHOT_SUFFIX = ".snapshot"
+
+_PICKLE_PROTOCOL = 5
+_HEADER = struct.Struct("<8sHH32sQ")
+
+
+def default_snapshot_path(source) -> Path:
+    return Path(source).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def source_digest(source) -> bytes:
+    h = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def write_snapshot(source, snapshot=None) -> Path:
+    """Parses `source` and writes its snapshot atomically (tmp file + rename)."""
+    source = Path(source)
+    snapshot = Path(snapshot) if snapshot else default_snapshot_path(source)
+
+    digest = source_digest(source)
+    payload = pickle.dumps(parse_csf_export(source), protocol=_PICKLE_PROTOCOL)
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, _PICKLE_PROTOCOL, digest, len(payload)
+    )
+
+    tmp = snapshot.with_name(snapshot.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp, snapshot)
+    return snapshot
+
+
+def read_snapshot(source, snapshot=None):
+    """
+    Returns the index stored in the snapshot, or None if the snapshot is
+    missing, malformed, of another format version, or built from a different
+    source file.
+    """
+    snapshot = Path(snapshot) if snapshot else default_snapshot_path(source)
+    try:
+        with open(snapshot, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                return None
+            magic, version, _protocol, digest, length = _HEADER.unpack_from(mm, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+                return None
+            if len(mm) != _HEADER.size + length:
+                return None
+            if digest != source_digest(source):
+                return None
+            with memoryview(mm) as view:
+                return pickle.loads(view[_HEADER.size:])
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def load_csf_index(source, snapshot=None):
+    """Snapshot if it is current, otherwise the JSON parser."""
+    index = read_snapshot(source, snapshot)
+    if index is None:
+        index = parse_csf_export(source)
+    return index
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or len(argv) > 2:
+        print("usage: python -m logic.csf_snapshot SOURCE_JSON [SNAPSHOT_PATH]", file=sys.stderr)
+        return 2
+    out = write_snapshot(*argv)
+    print(f"wrote {out} ({out.stat().st_size:,} bytes, format v{SNAPSHOT_FORMAT_VERSION})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
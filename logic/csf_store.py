@@ -0,0 +1,154 @@
+"""
+Versioned holder for the process-wide CSF catalog, with hot reload.
+
+Readers call current() and get a (version, catalog) pair without taking a
+lock: the pair is replaced as a whole, never mutated, so a reader always
+sees one consistent catalog. A watcher thread polls the export's
+(mtime, size); when it changes, the new catalog is built on that thread and
+only the final swap is done under the lock. Rebuilds therefore never block
+a rerun. If a rebuild fails (e.g. the file is still being written), the old
+catalog stays current and the rebuild is retried once the file changes again.
+
+Builds are single-flight: one build runs at a time, and callers that arrive
+while the first version is being built wait for it instead of starting their
+own. shared_store() keeps one store per export path for the whole process, so
+a launcher can warm it up before the server accepts traffic (app/serve.py)
+and every session then finds it ready.
+"""
+import logging
+import os
+import threading
+import time
+
+from logic.csf_catalog import load_csf_catalog
+
+log = logging.getLogger(__name__)
+
+
+class CatalogStore:
+    def __init__(self, path, loader=load_csf_catalog):
+        self.path = str(path)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._current = (0, None)
+        self._build_seconds = None
+        self._loaded_at = None
+        self._last_error = None
+        self._fingerprint = None
+        self._failed_fingerprint = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def current(self):
+        """
+        (version, catalog); builds the first version on demand. Concurrent
+        first callers wait on the one build rather than each running it.
+        """
+        cur = self._current
+        if cur[1] is None:
+            self.reload()
+            cur = self._current
+        return cur
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuilds the catalog if the export changed (or `force`) and swaps it
+        in. Returns True if a new version was installed.
+        """
+        with self._build_lock:
+            # Re-checked under the build lock: a caller that waited on
+            # someone else's build finds the fresh version and returns.
+            fingerprint = self._stat()
+            if not force and self._current[1] is not None and fingerprint in (
+                self._fingerprint, self._failed_fingerprint
+            ):
+                return False
+
+            t0 = time.perf_counter()
+            try:
+                catalog = self._loader(self.path)
+            except Exception as e:
+                self._failed_fingerprint = fingerprint
+                self._last_error = f"{type(e).__name__}: {e}"
+                raise
+            elapsed = time.perf_counter() - t0
+
+            with self._lock:
+                version = self._current[0] + 1
+                self._current = (version, catalog)
+                self._fingerprint = fingerprint
+                self._build_seconds = elapsed
+                self._loaded_at = time.time()
+                self._last_error = None
+        log.info("CSF catalog v%d loaded from %s in %.3fs", version, self.path, elapsed)
+        return True
+
+    def status(self) -> dict:
+        """Readiness report: whether a catalog is loaded, its version and build time."""
+        with self._lock:
+            version, catalog = self._current
+            return {
+                "ready": catalog is not None,
+                "version": version,
+                "build_seconds": self._build_seconds,
+                "loaded_at": self._loaded_at,
+                "path": self.path,
+                "watching": self._watcher is not None,
+                "last_error": self._last_error,
+            }
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception:
+                log.exception("CSF catalog reload failed; keeping v%d", self._current[0])
+
+    def start_watcher(self, interval: float):
+        """Polls the export every `interval` seconds on a daemon thread (idempotent)."""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="csf-catalog-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watcher(self):
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stop.set()
+            watcher.join()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(path) -> CatalogStore:
+    """The process-wide store for the export at `path` (created on first use, not loaded)."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = CatalogStore(key)
+    return store
+
+
+def warm_up(path, watch_interval=None) -> dict:
+    """
+    Builds the shared store's first catalog now (blocking) and optionally
+    starts its watcher. Returns the store's status().
+    """
+    store = shared_store(path)
+    store.current()
+    if watch_interval:
+        store.start_watcher(watch_interval)
+    return store.status()
@@ -0,0 +1,358 @@
+"""
+Headless reasoning engine for the open-ended walkthrough.
+
+The step logic (Step 4 obligations, Step 6 salience -> principle
+suggestions, Step 7 tension options and type inference, Step 5/8 "Other"
+parsing) over the compact record in logic.record, as plain Python. Nothing
+here imports Streamlit: app/open_ended.py collects widget values and passes
+them in, and the same functions can validate, derive and export records in
+batch.
+
+Functions that turn a record back into text take the CSF catalog (anything
+with subcategory_text() and examples, normally the shared CsfCatalog). With
+catalog=None, outcome IDs stand in for their text.
+"""
+from typing import Mapping, NamedTuple
+
+from logic.framework import CSF_FUNCTION_PROMPTS, PFCE_SURFACING_PROMPTS
+from logic.record import (
+    CONSTRAINT_BITS,
+    PFCE_NODE_BITS,
+    PRINCIPLE_BITS,
+    SALIENCE_BITS,
+    STAKEHOLDER_BITS,
+    TENSION_TYPE_CODES,
+    DecisionRecord,
+    iter_bits,
+    range_problems,
+    text_ref,
+)
+
+NOT_SPECIFIED = "Not specified"
+
+# Selected CSF outcome text is shortened to this many characters in the
+# Step 4 obligations list (and so in the Step 7 tension options).
+OUTCOME_TEXT_LIMIT = 180
+
+_SALIENCE_MAPS = {item["id"]: tuple(item.get("maps_to", ())) for item in PFCE_SURFACING_PROMPTS}
+_TENSION_TYPE_INDEX = {t: i for i, t in enumerate(TENSION_TYPE_CODES)}
+
+# Obligation reference prefixes -> origin
+_REF_ORIGINS = {"csf": "technical", "tech": "technical", "pfce": "ethical", "eth": "ethical"}
+
+
+def init_record() -> DecisionRecord:
+    return DecisionRecord()
+
+
+# ---------- Input parsing ----------
+
+def unique(items) -> list:
+    """Drops empty items and duplicates, keeping first-seen order."""
+    return list(dict.fromkeys(x for x in items if x))
+
+
+def parse_lines(text: str) -> list:
+    """One item per line, bullets ("-", "•") stripped; blank lines dropped."""
+    return [ln for ln in (raw.strip("•- \t").strip() for raw in (text or "").splitlines()) if ln]
+
+
+def parse_comma_list(text: str) -> list:
+    return [s.strip() for s in (text or "").split(",") if s.strip()]
+
+
+def _text(values: Mapping, key: str) -> str:
+    return str(values.get(key, "") or "").strip()
+
+
+def _ids(values: Mapping, key: str) -> tuple:
+    return tuple(unique(values.get(key, ()) or ()))
+
+
+# Setters are (record fields written, setter(rec, values)).
+
+def _set_text(field, key):
+    def setter(rec, values):
+        setattr(rec, field, _text(values, key))
+    return (field,), setter
+
+
+def _set_ids(field, key):
+    def setter(rec, values):
+        setattr(rec, field, _ids(values, key))
+    return (field,), setter
+
+
+def _set_bits(field, key, table, others_field=None):
+    def setter(rec, values):
+        bits, others = table.encode(_ids(values, key))
+        setattr(rec, field, bits)
+        if others_field:
+            setattr(rec, others_field, others)
+    return ((field, others_field) if others_field else (field,)), setter
+
+
+def _set_include_examples(rec, values):
+    rec.include_examples = int(bool(values.get("csf_include_examples")))
+
+
+def _set_tension_type(rec, values):
+    rec.tension_type = _TENSION_TYPE_INDEX.get(_text(values, "tension_type"), 0)
+
+
+# Record input name -> (fields, setter)
+_SETTERS = {
+    "scenario_description": _set_text("scenario_description", "scenario_description"),
+    "decision_point": _set_text("decision_point", "decision_point"),
+    "procedural_context": _set_text("procedural_context", "procedural_context"),
+    "csf_categories": _set_ids("csf_categories", "csf_categories"),
+    "csf_outcomes": _set_ids("csf_outcomes", "csf_outcomes"),
+    "csf_functions": _set_ids("csf_functions", "csf_functions"),
+    "csf_include_examples": (("include_examples",), _set_include_examples),
+    "technical_additional": _set_ids("technical_additional", "technical_additional"),
+    "technical_other_notes": _set_text("technical_other_notes", "technical_other_notes"),
+    "stakeholders_combined": _set_bits("stakeholders", "stakeholders_combined", STAKEHOLDER_BITS, "stakeholders_other"),
+    "pfce_salience_selected": _set_bits("pfce_salience", "pfce_salience_selected", SALIENCE_BITS),
+    "pfce_principles": _set_bits("pfce_principles", "pfce_principles", PRINCIPLE_BITS),
+    "pfce_nodes": _set_bits("pfce_nodes", "pfce_nodes", PFCE_NODE_BITS),
+    "ethical_additional": _set_ids("ethical_additional", "ethical_additional"),
+    "pfce_pressure_summary": _set_text("pfce_pressure_summary", "pfce_pressure_summary"),
+    "tension_a": _set_text("tension_a", "tension_a"),
+    "tension_b": _set_text("tension_b", "tension_b"),
+    "tension_type": (("tension_type",), _set_tension_type),
+    "tradeoff_reasoning": _set_text("tradeoff_reasoning", "tradeoff_reasoning"),
+    "constraints_selected": _set_bits("constraints", "constraints_selected", CONSTRAINT_BITS, "constraints_other"),
+    "decision_text": _set_text("decision_text", "decision_text"),
+    "decision_rationale": _set_text("documented_rationale", "decision_rationale"),
+}
+
+# The inputs each walkthrough step collects
+STEP_INPUTS = {
+    1: ("scenario_description",),
+    2: ("decision_point",),
+    3: ("procedural_context",),
+    4: ("csf_categories", "csf_outcomes", "csf_functions", "csf_include_examples",
+        "technical_additional", "technical_other_notes"),
+    5: ("stakeholders_combined",),
+    6: ("pfce_salience_selected", "pfce_principles", "pfce_nodes", "ethical_additional", "pfce_pressure_summary"),
+    7: ("tension_a", "tension_b", "tension_type", "tradeoff_reasoning"),
+    8: ("constraints_selected",),
+    9: ("decision_text", "decision_rationale"),
+}
+
+
+def sync_record(rec: DecisionRecord, values: Mapping, names=None) -> DecisionRecord:
+    """
+    Copies the walkthrough's inputs into `rec`. `values` maps the record's
+    input names (the keys of OE_KEYMAP in app/open_ended.py) to their values.
+    Only the inputs in `names` are applied (all of them by default); missing
+    inputs count as empty. Option lists are folded into bitsets.
+    """
+    for name in _SETTERS if names is None else names:
+        _SETTERS[name][1](rec, values)
+    return rec
+
+
+def sync_changes(rec: DecisionRecord, values: Mapping, names) -> dict:
+    """
+    Applies only the inputs in `names` (typically the ones marked dirty) and
+    returns the change set: {record field: new value} for the fields whose
+    value actually changed. An empty dict means the record is unchanged.
+    """
+    changes = {}
+    for name in names:
+        fields, setter = _SETTERS[name]
+        before = [getattr(rec, f) for f in fields]
+        setter(rec, values)
+        for f, old in zip(fields, before):
+            new = getattr(rec, f)
+            if new != old:
+                changes[f] = new
+    return changes
+
+
+def record_inputs(rec: DecisionRecord) -> dict:
+    """The inverse of sync_record: input name -> value, e.g. to restore a saved record."""
+    return {
+        "scenario_description": rec.scenario_description,
+        "decision_point": rec.decision_point,
+        "procedural_context": rec.procedural_context,
+        "csf_categories": list(rec.csf_categories),
+        "csf_outcomes": list(rec.csf_outcomes),
+        "csf_functions": list(rec.csf_functions),
+        "csf_include_examples": bool(rec.include_examples),
+        "technical_additional": list(rec.technical_additional),
+        "technical_other_notes": rec.technical_other_notes,
+        "stakeholders_combined": STAKEHOLDER_BITS.decode(rec.stakeholders) + list(rec.stakeholders_other),
+        "pfce_salience_selected": SALIENCE_BITS.decode(rec.pfce_salience),
+        "pfce_principles": PRINCIPLE_BITS.decode(rec.pfce_principles),
+        "pfce_nodes": PFCE_NODE_BITS.decode(rec.pfce_nodes),
+        "ethical_additional": list(rec.ethical_additional),
+        "pfce_pressure_summary": rec.pfce_pressure_summary,
+        "tension_a": rec.tension_a,
+        "tension_b": rec.tension_b,
+        "tension_type": TENSION_TYPE_CODES[rec.tension_type],
+        "tradeoff_reasoning": rec.tradeoff_reasoning,
+        "constraints_selected": CONSTRAINT_BITS.decode(rec.constraints) + list(rec.constraints_other),
+        "decision_text": rec.decision_text,
+        "decision_rationale": rec.documented_rationale,
+    }
+
+
+def record_status(rec: DecisionRecord) -> str:
+    """"decided" once a decision has been written down, else "in_progress"."""
+    return "decided" if rec.decision_text else "in_progress"
+
+
+# ---------- Step logic ----------
+
+def shorten_outcome(text: str) -> str:
+    return (text[:OUTCOME_TEXT_LIMIT] + "…") if len(text) > OUTCOME_TEXT_LIMIT else text
+
+
+def outcome_text(catalog, sid: str) -> str:
+    return catalog.subcategory_text(sid) if catalog is not None else sid
+
+
+def derive_suggested_principles(salience_ids) -> list:
+    """Step 6: PFCE principles suggested by the ticked salience prompts, in prompt order."""
+    selected = set(salience_ids or ())
+    return unique(
+        p for item in PFCE_SURFACING_PROMPTS if item["id"] in selected for p in _SALIENCE_MAPS[item["id"]]
+    )
+
+
+class Obligation(NamedTuple):
+    id: str      # reference stored in the record ("csf:GV.SC-05", "pfce:12", text_ref("tech", text))
+    text: str
+    origin: str  # "technical" or "ethical"
+
+
+def technical_obligations(rec: DecisionRecord, catalog) -> list:
+    """Step 4: selected CSF outcomes (shortened), then additional obligations; duplicates dropped."""
+    items = [Obligation(f"csf:{sid}", shorten_outcome(outcome_text(catalog, sid)), "technical")
+             for sid in rec.csf_outcomes]
+    items += [Obligation(text_ref("tech", t), t, "technical") for t in rec.technical_additional]
+    return _unique_by_text(items)
+
+
+def ethical_obligations(rec: DecisionRecord) -> list:
+    """Step 6: selected PFCE sub-nodes ("Principle: node"), then additional considerations."""
+    nodes = PFCE_NODE_BITS.options
+    items = [Obligation(f"pfce:{i}", "{}: {}".format(*nodes[i]), "ethical")
+             for i in iter_bits(rec.pfce_nodes) if i < len(nodes)]
+    items += [Obligation(text_ref("eth", t), t, "ethical") for t in rec.ethical_additional]
+    return _unique_by_text(items)
+
+
+def _unique_by_text(items) -> list:
+    seen = set()
+    out = []
+    for it in items:
+        if it.text and it.text not in seen:
+            seen.add(it.text)
+            out.append(it)
+    return out
+
+
+def tension_options(rec: DecisionRecord, catalog) -> list:
+    """Step 7: the obligations recorded in Steps 4 and 6, keyed by record reference."""
+    return technical_obligations(rec, catalog) + ethical_obligations(rec)
+
+
+def ref_origin(ref: str) -> str:
+    return _REF_ORIGINS.get(ref.partition(":")[0], "") if ref else ""
+
+
+def infer_tension_type(a_origin: str, b_origin: str) -> str:
+    """Step 7: tension type from the origins of the two sides ("" when a side is unset)."""
+    if a_origin == "ethical" and b_origin == "ethical":
+        return "Ethical–Ethical"
+    if a_origin == "technical" and b_origin == "technical":
+        return "Technical–Technical"
+    if a_origin in ("ethical", "technical") and b_origin in ("ethical", "technical"):
+        return "Ethical–Technical"
+    return NOT_SPECIFIED
+
+
+def tension_statement(a: str, b: str) -> str:
+    return f"{a}  ⟷  {b}".strip(" ⟷ ")
+
+
+def tension_texts(rec: DecisionRecord, catalog) -> tuple:
+    """(side A text, side B text); "" for an unset or no longer resolvable side."""
+    by_ref = {o.id: o.text for o in tension_options(rec, catalog)}
+    return by_ref.get(rec.tension_a, ""), by_ref.get(rec.tension_b, "")
+
+
+# ---------- Validation and export ----------
+
+def validate_record(rec: DecisionRecord, catalog=None) -> list:
+    """Problems that make the record inconsistent with the framework (empty list if none)."""
+    problems = []
+    if rec.procedural_context and rec.procedural_context not in CSF_FUNCTION_PROMPTS:
+        problems.append(f"unknown procedural context {rec.procedural_context!r}")
+    if catalog is not None:
+        unknown = [sid for sid in rec.csf_outcomes if sid not in catalog.subcategories]
+        if unknown:
+            problems.append(f"unknown CSF outcomes {unknown}")
+    problems += range_problems(rec)
+    if rec.tension_a and rec.tension_a == rec.tension_b:
+        problems.append("both sides of the tension are the same obligation")
+    refs = {o.id for o in tension_options(rec, catalog)}
+    for side in (rec.tension_a, rec.tension_b):
+        if side and side not in refs:
+            problems.append(f"tension side {side!r} is not a recorded obligation")
+    return problems
+
+
+def export_dict(rec: DecisionRecord, catalog) -> dict:
+    """The record with every ID resolved to text, in the walkthrough's nested layout."""
+    a, b = tension_texts(rec, catalog)
+    examples = []
+    if rec.include_examples and catalog is not None:
+        examples = [f"{ex.id}: {ex.text}" for sid in rec.csf_outcomes for ex in catalog.examples.get(sid, ())]
+    return {
+        "scenario_description": rec.scenario_description,
+        "decision_point": rec.decision_point,
+        "procedural_context": rec.procedural_context,
+        "technical": {
+            "csf_categories": list(rec.csf_categories),
+            "csf_outcomes": list(rec.csf_outcomes),
+            "csf_functions": list(rec.csf_functions),
+            "implementation_examples": examples,
+            "considerations": [o.text for o in technical_obligations(rec, catalog)],
+            "other_notes": rec.technical_other_notes,
+        },
+        "stakeholders": STAKEHOLDER_BITS.decode(rec.stakeholders) + list(rec.stakeholders_other),
+        "ethical": {
+            "pfce_salience_selected": SALIENCE_BITS.decode(rec.pfce_salience),
+            "pfce_principles": PRINCIPLE_BITS.decode(rec.pfce_principles),
+            "considerations": [o.text for o in ethical_obligations(rec)],
+            "pfce_pressure_summary": rec.pfce_pressure_summary,
+        },
+        "tension": {
+            "a": a,
+            "b": b,
+            "statement": tension_statement(a, b),
+            "type": TENSION_TYPE_CODES[rec.tension_type],
+        },
+        "constraints": {
+            "selected": CONSTRAINT_BITS.decode(rec.constraints) + list(rec.constraints_other),
+        },
+        "decision": {
+            "decision_text": rec.decision_text,
+            "documented_rationale": rec.documented_rationale,
+            "tradeoff_reasoning": rec.tradeoff_reasoning,
+        },
+    }
+
+
+def summary_lines(rec: DecisionRecord, catalog) -> list:
+    """Closing lines of the exported record (decision tension, procedural context)."""
+    code = rec.procedural_context
+    label = CSF_FUNCTION_PROMPTS.get(code, {}).get("label", code or NOT_SPECIFIED)
+    return [
+        f"Decision Tension: {tension_statement(*tension_texts(rec, catalog)) or NOT_SPECIFIED}",
+        f"Procedural Context: {label}",
+    ]
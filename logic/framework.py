@@ -0,0 +1,191 @@
+"""
+Framework content the walkthrough reasons over: NIST CSF Function prompts,
+the PFCE principles, salience prompts and sub-nodes, stakeholder and
+constraint options, and the tension types. Plain data, no Streamlit.
+"""
+
+STAKEHOLDER_OPTIONS = [
+    "Local Residents/Businesses",
+    "City Leadership (Mayor, City Manager, City Council)",
+    "Department leadership (Public Works, Utilities, Police, Fire, etc.)",
+    "IT/Cybersecurity Team",
+    "City Employees/Internal Staff",
+    "Vendors/Managed Service Providers",
+    "State or Federal Partners/Regulators",
+    "Law enforcement / investigative partners",
+    "Finance/Procurement/Legal",
+    "Media/Public Information Office",
+]
+
+# Pre-selected in Step 5 when Step 4 outcomes involve third-party risk
+THIRD_PARTY_STAKEHOLDER = "Vendors/Managed Service Providers"
+
+
+CSF_FUNCTION_PROMPTS = {
+    "GV": {
+        "label": "GOVERN (GV)",
+        "prompt": "Are you establishing, reviewing, or overseeing cybersecurity risk management strategy, policies, or governance expectations?",
+    },
+    "ID": {
+        "label": "IDENTIFY (ID)",
+        "prompt": "Are you working to understand current cybersecurity risks, such as identifying assets, systems, vulnerabilities, or risk exposure?",
+    },
+    "PR": {
+        "label": "PROTECT (PR)",
+        "prompt": "Are you applying or managing safeguards to reduce or manage cybersecurity risk?",
+    },
+    "DE": {
+        "label": "DETECT (DE)",
+        "prompt": "Are you monitoring for, identifying, or analyzing potential cybersecurity attacks or compromises?",
+    },
+    "RS": {
+        "label": "RESPOND (RS)",
+        "prompt": "Are you taking action in response to a confirmed cybersecurity incident?",
+    },
+    "RC": {
+        "label": "RECOVER (RC)",
+        "prompt": "Are you restoring systems, data, or operations affected by a cybersecurity incident?",
+    },
+}
+
+PFCE_PRESSURE_PROMPTS = {
+    "Beneficence": {
+        "label": "Beneficence",
+        "prompt": "What benefit is being protected or promoted—and for whom?",
+    },
+    "Non-maleficence": {
+        "label": "Non-maleficence",
+        "prompt": "What foreseeable harm is being avoided or accepted?",
+    },
+    "Autonomy": {
+        "label": "Autonomy",
+        "prompt": "Whose choices or agency are being constrained, overridden, or preserved?",
+    },
+    "Justice": {
+        "label": "Justice",
+        "prompt": "Are impacts or protections distributed unevenly across groups or communities?",
+    },
+    "Explicability": {
+        "label": "Explicability",
+        "prompt": "What would be difficult to explain, justify, or defend about this decision?",
+    },
+}
+
+
+PFCE_DEFINITIONS = {
+    "Beneficence": (
+        "Cybersecurity technologies should be used to benefit humans, promote human well-being, "
+        "and make our lives better overall."
+    ),
+    "Non-maleficence": (
+        "Cybersecurity technologies should not be used to intentionally harm humans or to make "
+        "our lives worse overall."
+    ),
+    "Autonomy": (
+        "Cybersecurity technologies should be used in ways that respect human autonomy. Humans "
+        "should be able to make informed decisions for themselves about how that technology is used "
+        "in their lives."
+    ),
+    "Justice": (
+        "Cybersecurity technologies should be used to promote fairness, equality, and impartiality. "
+        "They should not be used to unfairly discriminate, undermine solidarity, or prevent equal access."
+    ),
+    "Explicability": (
+        "Cybersecurity technologies should be used in ways that are intelligible, transparent, and "
+        "comprehensible, and it should be clear who is accountable and responsible for their use."
+    ),
+}
+
+PFCE_SURFACING_PROMPTS = [
+    {
+        "id": "harm_disadvantage",
+        "prompt": "This decision could cause harm or disadvantage to people, even indirectly.",
+        "maps_to": ["Non-maleficence", "Justice"],
+    },
+    {
+        "id": "cost_of_failure",
+        "prompt": "The costs or burdens of failure would fall unevenly or unfairly.",
+        "maps_to": ["Justice", "Non-maleficence"],
+    },
+    {
+        "id": "rights_dependencies",
+        "prompt": "This decision could affect people’s rights, expectations, or reliance on services.",
+        "maps_to": ["Autonomy", "Beneficence"],
+    },
+    {
+        "id": "public_justification",
+        "prompt": "This decision would be difficult to publicly justify or defend if questioned later.",
+        "maps_to": ["Explicability", "Justice", "Non-maleficence"],
+    },
+    {
+        "id": "ethical_discomfort",
+        "prompt": "This decision feels ethically uncomfortable, even if it is technically justified.",
+        "maps_to": ["Beneficence", "Non-maleficence", "Explicability"],
+    },
+]
+
+OLD_PFCE_PROMPTS = {
+    "Beneficence": "Could this decision affect human well-being or access to essential services?",
+    "Non-maleficence": "Could this decision foreseeably cause harm (directly or indirectly)?",
+    "Autonomy": "Could this decision constrain people’s ability to make informed choices about how they are affected?",
+    "Justice": "Could impacts or protections be distributed unevenly across groups or neighborhoods?",
+    "Explicability": "Is accountability, transparency, or explainability central to this decision?",
+}
+
+PFCE_SUBNODES = {
+    "Non-maleficence": [
+        "Privacy violations",
+        "Financial harm",
+        "Physical harm",
+        "Psychological harm",
+        "System harm",
+        "Data harm",
+        "Reputational harm",
+    ],
+    "Justice": [
+        "Democracy / Free speech",
+        "Avoiding bias",
+        "Accessibility & usability",
+        "Procedural fairness",
+        "Substantive fairness",
+        "Rights (incl. privacy rights)",
+        "Self defence",
+    ],
+    "Beneficence": [
+        "Promote well-being",
+        "Protect privacy",
+        "Financial benefits",
+        "Reputational benefits",
+        "Connectivity benefits",
+        "Strengthen trust",
+    ],
+    "Autonomy": [
+        "Informed consent",
+        "Control data & access",
+        "Privacy settings",
+        "Ownership",
+        "Respect for persons",
+        "Relationships",
+    ],
+    "Explicability": [
+        "Accountability",
+        "Transparency (incl. privacy policies)",
+        "Responsible use of AI",
+        "Responsibility to protect systems & data",
+        "Professional development & diligence",
+    ],
+}
+
+TEMP_CONSTRAINT_OPTIONS = [
+    "Legal or regulatory requirements",
+    "Public transparency or disclosure obligations",
+    "Budgetary or resource limitations",
+    "Staffing or expertise constraints",
+    "Procurement or contracting limitations",
+    "Political or leadership direction",
+    "Interagency or third-party dependencies",
+    "Time sensitivity or urgency",
+    "Incomplete or uncertain information",
+]
+
+TENSION_TYPES = ["Not specified", "Ethical–Technical", "Technical–Technical", "Ethical–Ethical"]
@@ -0,0 +1,116 @@
+"""
+Incremental reader for large JSON documents built from nested objects and
+big arrays of small records (the OLIR / CSF reference-tool export shape).
+
+iter_array_items() walks the document's objects key by key and yields the
+items of the arrays at the requested key paths one at a time. Only one item
+(plus a read-ahead chunk) is held in memory; values on other paths are
+decoded and dropped as they are passed.
+"""
+import json
+import re
+
+_WS = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    __slots__ = ("fp", "buf", "pos", "eof", "chunk")
+
+    def __init__(self, fp, chunk: int):
+        self.fp = fp
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.chunk = chunk
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.fp.read(self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        # Drop what has been consumed before appending.
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed), or "" at EOF."""
+        while True:
+            buf = self.buf
+            self.pos = pos = _WS.match(buf, self.pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"expected {ch!r} at offset ~{self.pos}, got {got!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decodes one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_array_items(fp, paths, chunk: int = 1 << 16):
+    """
+    Yields (path, item) for every item of the arrays at `paths` (tuples of
+    object keys, e.g. ("response", "elements", "relationships")), in
+    document order. `fp` is a text file object.
+    """
+    targets = {tuple(p) for p in paths}
+    prefixes = {t[:i] for t in targets for i in range(len(t))}
+    reader = _Reader(fp, chunk)
+    yield from _walk_object(reader, (), targets, prefixes)
+
+
+def _walk_object(reader, path, targets, prefixes):
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        sub = path + (key,)
+        nxt = reader.peek()
+
+        if sub in targets and nxt == "[":
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield sub, reader.value()
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    reader.expect("]")
+                    break
+        elif sub in prefixes and nxt == "{":
+            yield from _walk_object(reader, sub, targets, prefixes)
+        else:
+            reader.value()  # not on a requested path
+
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
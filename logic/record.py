@@ -0,0 +1,274 @@
+"""
+Compact decision record: IDs and bitsets instead of text.
+
+CSF categories, outcomes and Functions are kept as catalog IDs (the same
+interned strings the shared catalog holds). Stakeholders, salience prompts,
+PFCE principles and sub-nodes, and constraints are bitsets over the option
+tables below; only free text a user typed is stored as text. Tension sides
+are references to obligations ("csf:GV.SC-05", "pfce:12", and for typed
+obligations a digest of their text, "tech:3f2a…", see text_ref). Outcome
+text, example text and labels are resolved from the catalog and
+logic.framework when the record is rendered or exported (see logic.engine),
+never stored.
+
+Two serializations, both versioned by SCHEMA_VERSION: canonical JSON
+(sorted keys, no whitespace; equal records give equal bytes) and a compact
+binary form (varints and length-prefixed UTF-8, fields in _FIELDS order).
+"""
+import hashlib
+import json
+import struct
+
+from logic.framework import (
+    PFCE_DEFINITIONS,
+    PFCE_SUBNODES,
+    PFCE_SURFACING_PROMPTS,
+    STAKEHOLDER_OPTIONS,
+    TEMP_CONSTRAINT_OPTIONS,
+    TENSION_TYPES,
+)
+
+# Bump when a field or an option table below changes. Bit positions are part
+# of the stored format: options may only be appended without a bump.
+SCHEMA_VERSION = 1
+
+
+def iter_bits(bits: int):
+    """Positions of the set bits in `bits`, lowest first (cost scales with set bits, not width)."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def range_mask(start: int, stop: int) -> int:
+    """Bitset with bits [start, stop) set."""
+    return ((1 << stop) - 1) ^ ((1 << start) - 1) if stop > start else 0
+
+
+class OptionBits:
+    """Bit i of a bitset stands for options[i]."""
+
+    __slots__ = ("options", "_pos")
+
+    def __init__(self, options):
+        self.options = tuple(options)
+        self._pos = {o: i for i, o in enumerate(self.options)}
+
+    def __len__(self):
+        return len(self.options)
+
+    def encode(self, selected):
+        """(bitset of the selected options, tuple of selected items that are not options)"""
+        pos = self._pos
+        bits = 0
+        others = []
+        for item in selected:
+            i = pos.get(item)
+            if i is None:
+                others.append(item)
+            else:
+                bits |= 1 << i
+        return bits, tuple(others)
+
+    def position(self, option) -> int:
+        return self._pos[option]
+
+    def decode(self, bits: int) -> list:
+        options = self.options
+        return [options[i] for i in iter_bits(bits & ((1 << len(options)) - 1))]
+
+
+STAKEHOLDER_BITS = OptionBits(STAKEHOLDER_OPTIONS)
+SALIENCE_BITS = OptionBits(item["id"] for item in PFCE_SURFACING_PROMPTS)
+PRINCIPLE_BITS = OptionBits(PFCE_DEFINITIONS)
+PFCE_NODE_BITS = OptionBits((pid, node) for pid, nodes in PFCE_SUBNODES.items() for node in nodes)
+CONSTRAINT_BITS = OptionBits(TEMP_CONSTRAINT_OPTIONS)
+TENSION_TYPE_CODES = tuple(TENSION_TYPES)
+
+# Bitset fields and the option table each one ranges over
+_BIT_FIELDS = (
+    ("stakeholders", STAKEHOLDER_BITS),
+    ("pfce_salience", SALIENCE_BITS),
+    ("pfce_principles", PRINCIPLE_BITS),
+    ("pfce_nodes", PFCE_NODE_BITS),
+    ("constraints", CONSTRAINT_BITS),
+)
+
+# (field, kind): "s" text, "S" tuple of text, "u" unsigned int (bitset, code or flag)
+_FIELDS = (
+    ("scenario_description", "s"),
+    ("decision_point", "s"),
+    ("procedural_context", "s"),      # CSF Function ID
+    ("csf_categories", "S"),
+    ("csf_outcomes", "S"),
+    ("csf_functions", "S"),
+    ("include_examples", "u"),        # 1: export the selected outcomes' implementation examples
+    ("technical_additional", "S"),
+    ("technical_other_notes", "s"),
+    ("stakeholders", "u"),            # bits over STAKEHOLDER_BITS
+    ("stakeholders_other", "S"),
+    ("pfce_salience", "u"),           # bits over SALIENCE_BITS
+    ("pfce_principles", "u"),         # bits over PRINCIPLE_BITS
+    ("pfce_nodes", "u"),              # bits over PFCE_NODE_BITS
+    ("ethical_additional", "S"),
+    ("pfce_pressure_summary", "s"),
+    ("tension_a", "s"),               # obligation reference
+    ("tension_b", "s"),
+    ("tension_type", "u"),            # index into TENSION_TYPE_CODES
+    ("constraints", "u"),             # bits over CONSTRAINT_BITS
+    ("constraints_other", "S"),
+    ("decision_text", "s"),
+    ("documented_rationale", "s"),
+    ("tradeoff_reasoning", "s"),
+)
+_DEFAULTS = {"s": "", "S": (), "u": 0}
+
+_BINARY_MAGIC = b"OER"
+_BINARY_HEADER = struct.Struct("<3sB")
+
+
+class DecisionRecord:
+    __slots__ = tuple(name for name, _ in _FIELDS)
+
+    def __init__(self, **fields):
+        for name, kind in _FIELDS:
+            setattr(self, name, fields.pop(name, _DEFAULTS[kind]))
+        if fields:
+            raise TypeError(f"unknown record fields: {', '.join(sorted(fields))}")
+
+    def __eq__(self, other):
+        if not isinstance(other, DecisionRecord):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DecisionRecord(outcomes={self.csf_outcomes!r}, tension={self.tension_a!r}/{self.tension_b!r})"
+
+
+def range_problems(rec: DecisionRecord) -> list:
+    """
+    Codes and bitsets outside their option tables (empty list if none). A
+    record with any of these cannot be rendered, so check records that come
+    from outside the app (share links) before using them.
+    """
+    problems = []
+    for name, options in _BIT_FIELDS:
+        if getattr(rec, name) >> len(options):
+            problems.append(f"{name} has bits beyond its {len(options)} options")
+    if rec.tension_type >= len(TENSION_TYPE_CODES):
+        problems.append(f"unknown tension type code {rec.tension_type}")
+    if rec.include_examples > 1:
+        problems.append(f"include_examples is a flag, not {rec.include_examples}")
+    return problems
+
+
+def text_ref(prefix: str, text: str) -> str:
+    """
+    Reference to a typed obligation ("tech" or "eth"): a digest of its text,
+    not its position, so adding or removing other lines leaves it pointing at
+    the same obligation, and editing the text leaves it unresolvable rather
+    than pointing at another one.
+    """
+    return f"{prefix}:{hashlib.blake2s(text.encode('utf-8'), digest_size=6).hexdigest()}"
+
+
+# ---------- Canonical JSON ----------
+
+def to_json(rec: DecisionRecord) -> str:
+    d = {name: list(getattr(rec, name)) if kind == "S" else getattr(rec, name) for name, kind in _FIELDS}
+    d["schema"] = SCHEMA_VERSION
+    return json.dumps(d, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def from_json(s) -> DecisionRecord:
+    d = json.loads(s)
+    if d.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"unsupported decision record schema {d.get('schema')!r} (expected {SCHEMA_VERSION})")
+    fields = {}
+    for name, kind in _FIELDS:
+        if name in d:
+            v = d[name]
+            fields[name] = tuple(str(x) for x in v) if kind == "S" else int(v) if kind == "u" else str(v)
+    return DecisionRecord(**fields)
+
+
+# ---------- Binary ----------
+
+def _put_uint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _put_str(out: bytearray, s: str):
+    b = s.encode("utf-8")
+    _put_uint(out, len(b))
+    out += b
+
+
+def _get_uint(buf, pos: int):
+    n = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _get_str(buf, pos: int):
+    n, pos = _get_uint(buf, pos)
+    end = pos + n
+    if end > len(buf):
+        raise ValueError("truncated decision record")
+    return bytes(buf[pos:end]).decode("utf-8"), end
+
+
+def to_bytes(rec: DecisionRecord) -> bytes:
+    out = bytearray(_BINARY_HEADER.pack(_BINARY_MAGIC, SCHEMA_VERSION))
+    for name, kind in _FIELDS:
+        v = getattr(rec, name)
+        if kind == "u":
+            _put_uint(out, v)
+        elif kind == "s":
+            _put_str(out, v)
+        else:
+            _put_uint(out, len(v))
+            for s in v:
+                _put_str(out, s)
+    return bytes(out)
+
+
+def from_bytes(buf) -> DecisionRecord:
+    if len(buf) < _BINARY_HEADER.size:
+        raise ValueError("not a decision record")
+    magic, version = _BINARY_HEADER.unpack_from(buf)
+    if magic != _BINARY_MAGIC:
+        raise ValueError("not a decision record")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"unsupported decision record schema {version} (expected {SCHEMA_VERSION})")
+    pos = _BINARY_HEADER.size
+    fields = {}
+    try:
+        for name, kind in _FIELDS:
+            if kind == "u":
+                fields[name], pos = _get_uint(buf, pos)
+            elif kind == "s":
+                fields[name], pos = _get_str(buf, pos)
+            else:
+                n, pos = _get_uint(buf, pos)
+                items = []
+                for _ in range(n):
+                    s, pos = _get_str(buf, pos)
+                    items.append(s)
+                fields[name] = tuple(items)
+    except IndexError:
+        raise ValueError("truncated decision record") from None
+    if pos != len(buf):
+        raise ValueError("trailing bytes after decision record")
+    return DecisionRecord(**fields)
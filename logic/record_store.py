@@ -0,0 +1,210 @@
+"""
+Persistent decision records in a local SQLite database (WAL mode).
+
+Each row holds the record's compact binary form (logic.record) plus indexed
+columns for the queries an administrator needs: CSF Function, tension type,
+decision status and created/updated time. save() is cheap enough to call on
+every step navigation: it serializes the record and queues it; a writer
+thread writes everything queued in one transaction every `flush_interval`
+seconds, so a user clicking through steps costs one write, not one per
+click. load() sees queued saves before they reach the database.
+
+A write that fails (e.g. "database is locked" while another process holds
+the WAL file past the busy timeout) is logged and its rows go back in the
+queue, behind any newer save of the same record; the writer tries again
+one interval later.
+"""
+import atexit
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from logic.engine import record_status
+from logic.record import SCHEMA_VERSION, TENSION_TYPE_CODES, from_bytes, to_bytes
+
+log = logging.getLogger(__name__)
+
+# How long a write waits for another process's lock before it fails
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id           TEXT PRIMARY KEY,
+    schema       INTEGER NOT NULL,
+    csf_function TEXT NOT NULL,
+    tension_type TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    step         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    body         BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_csf_function ON records (csf_function);
+CREATE INDEX IF NOT EXISTS records_tension_type ON records (tension_type);
+CREATE INDEX IF NOT EXISTS records_status ON records (status);
+CREATE INDEX IF NOT EXISTS records_created_at ON records (created_at);
+CREATE INDEX IF NOT EXISTS records_updated_at ON records (updated_at);
+"""
+
+_UPSERT = """
+INSERT INTO records (id, schema, csf_function, tension_type, status, step, created_at, updated_at, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    schema = excluded.schema,
+    csf_function = excluded.csf_function,
+    tension_type = excluded.tension_type,
+    status = excluded.status,
+    step = excluded.step,
+    updated_at = excluded.updated_at,
+    body = excluded.body
+"""
+
+
+def new_record_id() -> str:
+    """Unguessable record ID, safe to put in a URL."""
+    return secrets.token_urlsafe(12)
+
+
+def record_row(record_id: str, rec, step: int) -> tuple:
+    """The records-table row (in _UPSERT order) for `rec`, saved on `step`."""
+    now = time.time()
+    return (
+        record_id,
+        SCHEMA_VERSION,
+        rec.procedural_context,
+        TENSION_TYPE_CODES[rec.tension_type],
+        record_status(rec),
+        step,
+        now,
+        now,
+        to_bytes(rec),
+    )
+
+
+class RecordStore:
+    def __init__(self, path, flush_interval: float = 0.5):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self._pending = {}  # record id -> row tuple, newest save wins
+        self._writing = {}  # rows taken by the flush in progress
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.writes = 0  # transactions committed
+        self._writer = threading.Thread(target=self._run, name="record-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, record_id: str, rec, step: int):
+        """Queues `rec` (serialized now, so later edits don't leak in) for the next write."""
+        row = record_row(record_id, rec, step)
+        with self._pending_lock:
+            self._pending[record_id] = row
+        self._wake.set()
+
+    def flush(self):
+        """
+        Writes every queued save now, in one transaction. If the write fails
+        the rows are queued again (a newer save of the same record wins) and
+        the error is raised.
+        """
+        with self._db_lock:
+            with self._pending_lock:
+                self._writing, self._pending = self._pending, {}
+            if not self._writing:
+                return
+            try:
+                with self._db:
+                    self._db.execute("BEGIN")
+                    self._db.executemany(_UPSERT, self._writing.values())
+                self.writes += 1
+            except BaseException:
+                with self._pending_lock:
+                    for record_id, row in self._writing.items():
+                        self._pending.setdefault(record_id, row)
+                raise
+            finally:
+                with self._pending_lock:
+                    self._writing = {}
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Debounce: collect the saves that arrive within one interval.
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                log.exception("writing decision records to %s failed; retrying", self.path)
+                self._wake.set()
+
+    def load(self, record_id: str):
+        """(record, step) for `record_id`, or None if there is no such record."""
+        with self._pending_lock:
+            row = self._pending.get(record_id) or self._writing.get(record_id)
+        if row is None:
+            with self._db_lock:
+                found = self._db.execute(
+                    "SELECT step, body FROM records WHERE id = ?", (record_id,)
+                ).fetchone()
+            if found is None:
+                return None
+            step, body = found
+        else:
+            step, body = row[5], row[8]
+        return from_bytes(body), step
+
+    def find(self, csf_function=None, tension_type=None, status=None, limit: int = 50):
+        """Most recently updated records matching the filters: [(id, csf_function, tension_type, status, updated_at)]."""
+        self.flush()
+        where, args = [], []
+        for col, val in (("csf_function", csf_function), ("tension_type", tension_type), ("status", status)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT id, csf_function, tension_type, status, updated_at FROM records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY updated_at DESC LIMIT ?"
+        with self._db_lock:
+            return self._db.execute(sql, (*args, limit)).fetchall()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        try:
+            self.flush()
+        except sqlite3.Error:
+            log.exception("decision records still queued for %s were not written", self.path)
+        with self._db_lock:
+            self._db.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_record_store(path) -> RecordStore:
+    """The process-wide store for the database at `path` (created and opened on first use)."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = RecordStore(key)
+    return store
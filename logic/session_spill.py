@@ -0,0 +1,252 @@
+"""
+Spills idle sessions' reasoning state to disk to bound server memory.
+
+Each rerun brackets itself with touch() and release(). A reaper thread looks
+for sessions not touched for `ttl` seconds: their state (the keys `include`
+accepts) is written to a compact snapshot, one file per session (canonical
+JSON per key, see logic.session_store, then zlib), and removed from the
+in-memory session state; keys `drop` accepts (caches that are rebuilt on
+demand) are removed without being saved. The next touch() puts the state
+back before the rerun reads it, so the user never notices. Keys set since
+the spill (a widget value the browser sent with that rerun) are newer and
+are kept. Widget callbacks run before the rerun's touch(), so a callback
+that reads spilled keys has to touch() (and release()) first, or it would
+work from missing values that then win over the saved ones.
+
+The manager only keeps a weak reference to each session's state: once
+Streamlit forgets a session, its entry and snapshot are removed. Snapshots
+left on disk longer than `disk_ttl` (e.g. by a crashed process) are deleted.
+
+stats() reports live and spilled sessions, restores and their latency, and
+the bytes reclaimed (encoded size of the state released from memory).
+"""
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+import zlib
+from collections import deque
+from pathlib import Path
+
+from logic.session_store import decode_value, encode_value, join_encoded, split_encoded
+
+log = logging.getLogger(__name__)
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class _Session:
+    __slots__ = ("state", "last_seen", "running", "spilled_bytes", "lock")
+
+    def __init__(self, state, now):
+        self.state = _ref(state)
+        self.last_seen = now
+        self.running = 0
+        self.spilled_bytes = 0  # encoded size while spilled, else 0
+        self.lock = threading.Lock()
+
+
+def _ref(obj):
+    try:
+        return weakref.ref(obj)
+    except TypeError:  # not weak-referenceable: hold it (it is freed when the entry is)
+        return lambda: obj
+
+
+class SpillManager:
+    """
+    `view(state)` adapts a session's state object to a mapping (keys(),
+    item get/set/delete) usable from the reaper thread; by default the
+    state is used as is.
+    """
+
+    def __init__(self, directory, ttl: float, include, drop=None, view=None,
+                 disk_ttl: float = 7 * 24 * 3600, clock=time.monotonic):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self.include = include
+        self.drop = drop or (lambda key: False)
+        self.view = view or (lambda state: state)
+        self._clock = clock
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._stop = threading.Event()
+
+        self.spills = 0
+        self.restores = 0
+        self.bytes_reclaimed = 0
+        self._restore_ms = deque(maxlen=256)
+
+    def _path(self, sid: str) -> Path:
+        return self.directory / f"{_SAFE_NAME.sub('_', sid)}.snap"
+
+    # ---------- Per rerun ----------
+
+    def touch(self, sid: str, state):
+        """
+        Start of a rerun of session `sid`. Restores its state first if it was
+        spilled; returns the restore time in ms, or None if it was live.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None or entry.state() is not state:
+                entry = self._sessions[sid] = _Session(state, now)
+        with entry.lock:
+            entry.running += 1
+            entry.last_seen = now
+            if not entry.spilled_bytes:
+                return None
+            t0 = time.perf_counter()
+            self._restore(sid, entry, self.view(state))
+            ms = (time.perf_counter() - t0) * 1e3
+        self._restore_ms.append(ms)
+        self.restores += 1
+        return ms
+
+    def release(self, sid: str):
+        """End of a rerun of session `sid`: its idle time starts now."""
+        with self._lock:
+            entry = self._sessions.get(sid)
+        if entry is not None:
+            with entry.lock:
+                entry.running = max(0, entry.running - 1)
+                entry.last_seen = self._clock()
+
+    def _restore(self, sid, entry, state):
+        path = self._path(sid)
+        try:
+            encoded = split_encoded(zlib.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            log.warning("session %s: spill snapshot missing, starting from what is in memory", sid)
+            encoded = {}
+        for k, v in encoded.items():
+            if k not in state:
+                state[k] = decode_value(v)
+        entry.spilled_bytes = 0
+        path.unlink(missing_ok=True)
+
+    # ---------- Spilling ----------
+
+    def spill_idle(self) -> int:
+        """Spills every session idle for at least `ttl` seconds; returns how many."""
+        now = self._clock()
+        with self._lock:
+            items = list(self._sessions.items())
+        n = 0
+        for sid, entry in items:
+            state = entry.state()
+            if state is None:
+                self._forget(sid)
+                continue
+            with entry.lock:
+                if entry.running or entry.spilled_bytes or now - entry.last_seen < self.ttl:
+                    continue
+                try:
+                    n += self._spill(sid, entry, self.view(state))
+                except Exception:
+                    log.exception("session %s: spill failed, keeping it in memory", sid)
+        return n
+
+    def _spill(self, sid, entry, state) -> int:
+        encoded, dropped = {}, []
+        for k in list(state.keys()):
+            if not isinstance(k, str):
+                continue
+            if self.include(k):
+                try:
+                    encoded[k] = encode_value(state[k])
+                except TypeError:
+                    continue  # stays in memory
+            elif self.drop(k):
+                dropped.append(k)
+        if not encoded:
+            return 0
+        path = self._path(sid)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(zlib.compress(join_encoded(encoded), 6))
+        os.replace(tmp, path)
+        for k in encoded:
+            del state[k]
+        for k in dropped:
+            del state[k]
+        size = sum(len(k) + len(v) for k, v in encoded.items())
+        entry.spilled_bytes = size
+        self.spills += 1
+        self.bytes_reclaimed += size
+        return 1
+
+    def _forget(self, sid: str):
+        with self._lock:
+            self._sessions.pop(sid, None)
+        self._path(sid).unlink(missing_ok=True)
+
+    def prune_disk(self):
+        """Deletes snapshots no live session owns that are older than `disk_ttl`."""
+        cutoff = time.time() - self.disk_ttl
+        with self._lock:
+            owned = {self._path(sid).name for sid in self._sessions}
+        for path in self.directory.glob("*.snap"):
+            try:
+                if path.name not in owned and path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def start_reaper(self, interval: float = None):
+        """Starts (once) the thread that spills idle sessions every `interval` seconds."""
+        with self._lock:
+            if self._reaper is not None:
+                return
+            interval = interval or max(1.0, self.ttl / 4)
+            self._reaper = threading.Thread(target=self._run, args=(interval,), name="session-spill", daemon=True)
+            self._reaper.start()
+
+    def _run(self, interval: float):
+        self.prune_disk()
+        while not self._stop.wait(interval):
+            try:
+                self.spill_idle()
+            except Exception:
+                log.exception("spilling idle sessions failed")
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------- Counters ----------
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = list(self._sessions.values())
+        spilled = sum(1 for e in entries if e.spilled_bytes)
+        ms = sorted(self._restore_ms)
+        return {
+            "live_sessions": len(entries) - spilled,
+            "spilled_sessions": spilled,
+            "spills": self.spills,
+            "restores": self.restores,
+            "restore_ms_median": round(ms[len(ms) // 2], 3) if ms else None,
+            "restore_ms_max": round(ms[-1], 3) if ms else None,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "bytes_spilled_now": sum(e.spilled_bytes for e in entries),
+        }
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def shared_spill_manager(directory, ttl: float, include, drop=None, view=None) -> SpillManager:
+    """The process-wide manager for `directory` (created, with its reaper running, on first use)."""
+    key = os.path.abspath(directory)
+    with _managers_lock:
+        mgr = _managers.get(key)
+        if mgr is None:
+            mgr = _managers[key] = SpillManager(key, ttl, include, drop, view)
+            mgr.start_reaper()
+    return mgr
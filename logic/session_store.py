@@ -0,0 +1,437 @@
+"""
+Session state kept outside the Streamlit process, so a session survives
+being routed to another worker.
+
+A store holds, per session ID, a version number and the externalized part of
+the session state as JSON. Two stores share one interface:
+
+  version(sid)             -> int, 0 if the session has never been saved
+  load(sid)                -> (version, body bytes or None)
+  compare_and_swap(sid, expected_version, body) -> new version, or None if
+                              another process saved first
+
+SqliteSessionStore keeps sessions in a local SQLite file (WAL mode), for
+several processes on one host. RedisSessionStore speaks the Redis protocol
+(RESP2) over a plain socket, with WATCH/MULTI/EXEC for the swap; it needs no
+client library, and benchmarks/resp_standin.py serves enough of the protocol
+to run it locally. open_session_store() picks one from a URL.
+
+SessionSync does the per-rerun work against any store. pull() asks for the
+version only and loads the body just when another process has saved a newer
+one. push() writes only if a key changed; on a conflict it reloads, puts this
+rerun's changes on top of the other process's state and swaps again. push()
+never writes into the session state (it runs at the end of a rerun, when
+Streamlit no longer lets widget keys be set): the other process's values are
+taken in by the next pull().
+"""
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from logic.record import DecisionRecord, from_json, to_json
+
+# Seconds a session is kept after its last save
+SESSION_TTL = 7 * 24 * 3600
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id         TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    body       BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+
+def new_session_id() -> str:
+    """Unguessable session ID, safe to put in a URL."""
+    return secrets.token_urlsafe(16)
+
+
+# ---------- Values ----------
+
+def _tag(v):
+    if v is None or isinstance(v, (bool, int, float, str)):
+        return v
+    if isinstance(v, list):
+        return [_tag(x) for x in v]
+    if isinstance(v, tuple):
+        return {"~t": [_tag(x) for x in v]}
+    if isinstance(v, (set, frozenset)):
+        items = [_tag(x) for x in v]
+        try:
+            items.sort()
+        except TypeError:
+            pass
+        return {"~s": items}
+    if isinstance(v, dict):
+        return {"~m": [[_tag(k), _tag(x)] for k, x in v.items()]}
+    if isinstance(v, DecisionRecord):
+        return {"~r": to_json(v)}
+    raise TypeError(f"cannot externalize {type(v).__name__}")
+
+
+def _untag(v):
+    if isinstance(v, list):
+        return [_untag(x) for x in v]
+    if isinstance(v, dict):
+        (tag, x), = v.items()
+        if tag == "~t":
+            return tuple(_untag(i) for i in x)
+        if tag == "~s":
+            return {_untag(i) for i in x}
+        if tag == "~m":
+            return {_untag(k): _untag(i) for k, i in x}
+        if tag == "~r":
+            return from_json(x)
+        raise ValueError(f"unknown session value tag {tag!r}")
+    return v
+
+
+def encode_value(v) -> str:
+    """Canonical JSON for one session value (equal values give equal text). TypeError if unsupported."""
+    return json.dumps(_tag(v), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_value(s: str):
+    return _untag(json.loads(s))
+
+
+def join_encoded(encoded: dict) -> bytes:
+    """Body for a {key: encoded value} mapping (the values are already JSON)."""
+    return ("{" + ",".join(f"{json.dumps(k)}:{v}" for k, v in sorted(encoded.items())) + "}").encode("utf-8")
+
+
+def split_encoded(body) -> dict:
+    """{key: encoded value} from a body written by join_encoded."""
+    if not body:
+        return {}
+    return {k: json.dumps(v, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            for k, v in json.loads(body).items()}
+
+
+# ---------- Stores ----------
+
+class SqliteSessionStore:
+    def __init__(self, path, ttl: float = SESSION_TTL):
+        self.path = str(path)
+        self.ttl = ttl
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+        self.prune()
+
+    def version(self, sid: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM sessions WHERE id = ?", (sid,)).fetchone()
+        return row[0] if row else 0
+
+    def load(self, sid: str):
+        with self._lock:
+            row = self._db.execute("SELECT version, body FROM sessions WHERE id = ?", (sid,)).fetchone()
+        return (row[0], bytes(row[1])) if row else (0, None)
+
+    def compare_and_swap(self, sid: str, expected: int, body: bytes):
+        now = time.time()
+        with self._lock:
+            if expected == 0:
+                cur = self._db.execute(
+                    "INSERT OR IGNORE INTO sessions (id, version, updated_at, body) VALUES (?, 1, ?, ?)",
+                    (sid, now, body),
+                )
+            else:
+                cur = self._db.execute(
+                    "UPDATE sessions SET version = version + 1, updated_at = ?, body = ? "
+                    "WHERE id = ? AND version = ?",
+                    (now, body, sid, expected),
+                )
+        return expected + 1 if cur.rowcount == 1 else None
+
+    def prune(self):
+        """Drops sessions not saved for `ttl` seconds."""
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RespError(Exception):
+    pass
+
+
+class _RespConnection:
+    """One Redis-protocol (RESP2) connection; commands are sent one at a time."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+
+    def command(self, *args):
+        out = [b"*%d\r\n" % len(args)]
+        for a in args:
+            b = a if isinstance(a, bytes) else str(a).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(b), b))
+        self._sock.sendall(b"".join(out))
+        return self._read()
+
+    def _read(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the session store")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RespError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self._file.read(n + 2)
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read() for _ in range(n)]
+        raise RespError(f"unexpected reply {line!r}")
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+
+class RedisSessionStore:
+    """
+    Sessions as two keys, <prefix><sid>:v (version) and <prefix><sid>:body,
+    both expiring `ttl` seconds after the last save. One connection, used
+    under a lock (WATCH state belongs to the connection). A connection that
+    fails is dropped and the command retried once on a new one; an error
+    reply leaves no WATCH or MULTI behind on the connection.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 prefix: str = "oe:session:", ttl: float = SESSION_TTL, timeout: float = 2.0):
+        self.prefix = prefix
+        self.ttl = int(ttl)
+        self._address = (host, port, db, timeout)
+        self._lock = threading.Lock()
+        self._conn = None
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> _RespConnection:
+        host, port, db, timeout = self._address
+        conn = _RespConnection(host, port, timeout)
+        try:
+            if db:
+                conn.command("SELECT", db)
+        except BaseException:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    def _drop(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _call(self, fn):
+        """fn(connection) under the lock; reconnects and retries once if the connection fails."""
+        with self._lock:
+            for attempt in (0, 1):
+                conn = self._conn or self._connect()
+                try:
+                    return fn(conn)
+                except RespError:
+                    try:
+                        # DISCARD ends a MULTI and its WATCH; without one it is an error, so UNWATCH.
+                        try:
+                            conn.command("DISCARD")
+                        except RespError:
+                            conn.command("UNWATCH")
+                    except (OSError, RespError):
+                        self._drop()
+                    raise
+                except OSError:
+                    # ConnectionError, timeouts: the reply stream is out of step, never reuse it.
+                    self._drop()
+                    if attempt:
+                        raise
+
+    def _keys(self, sid: str):
+        return f"{self.prefix}{sid}:v", f"{self.prefix}{sid}:body"
+
+    def version(self, sid: str) -> int:
+        v = self._call(lambda conn: conn.command("GET", self._keys(sid)[0]))
+        return int(v) if v else 0
+
+    def load(self, sid: str):
+        vkey, bkey = self._keys(sid)
+
+        def load(conn):
+            conn.command("MULTI")
+            conn.command("GET", vkey)
+            conn.command("GET", bkey)
+            return conn.command("EXEC")
+
+        v, body = self._call(load)
+        return (int(v), body) if v else (0, None)
+
+    def compare_and_swap(self, sid: str, expected: int, body: bytes):
+        vkey, bkey = self._keys(sid)
+
+        # Safe to retry: if a lost EXEC reply had in fact saved, the version no longer matches.
+        def swap(conn):
+            conn.command("WATCH", vkey)
+            v = conn.command("GET", vkey)
+            if (int(v) if v else 0) != expected:
+                conn.command("UNWATCH")
+                return None
+            conn.command("MULTI")
+            conn.command("SET", vkey, expected + 1, "EX", self.ttl)
+            conn.command("SET", bkey, body, "EX", self.ttl)
+            return conn.command("EXEC")
+
+        done = self._call(swap)
+        return expected + 1 if done is not None else None
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+
+def open_session_store(url: str):
+    """
+    "redis://host:port/db" -> RedisSessionStore; "sqlite:path" or a plain
+    path -> SqliteSessionStore.
+    """
+    if url.startswith("redis://"):
+        u = urlparse(url)
+        return RedisSessionStore(u.hostname or "127.0.0.1", u.port or 6379, int(u.path.strip("/") or 0))
+    return SqliteSessionStore(url[len("sqlite:"):] if url.startswith("sqlite:") else url)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_session_store(url: str):
+    """The process-wide store for `url` (opened on first use)."""
+    key = url if url.startswith("redis://") else os.path.abspath(url.removeprefix("sqlite:"))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = open_session_store(url)
+    return store
+
+
+# ---------- Per-session sync ----------
+
+class SessionSync:
+    """
+    Mirrors the keys of a session-state mapping that `include(key)` accepts
+    into `store` under one session ID. Values the encoder cannot handle stay
+    in-process only.
+    """
+
+    def __init__(self, store, session_id: str, include, retries: int = 3):
+        self.store = store
+        self.session_id = session_id
+        self.include = include
+        self.retries = retries
+        self.version = None  # store version the local state matches; None before the first pull
+        self._saved = {}     # key -> encoded value as of that version
+        self._pending = {}   # key -> encoded value (None: deleted) merged in from another process, for the next pull
+        self.conflicts = 0
+
+    def _encoded(self, state) -> dict:
+        out = {}
+        for k in list(state.keys()):
+            if self.include(k):
+                try:
+                    out[k] = encode_value(state[k])
+                except TypeError:
+                    pass
+        return out
+
+    def _differences(self, local: dict, encoded: dict, keep=()) -> dict:
+        """What makes `local` match `encoded`, except keys in `keep`: key -> encoded value, None to delete."""
+        out = {}
+        for k in local:
+            # Only keys this process had saved count as deleted elsewhere
+            if k not in encoded and k in self._saved and k not in keep:
+                out[k] = None
+        for k, v in encoded.items():
+            if k not in keep and local.get(k) != v:
+                out[k] = v
+        return out
+
+    @staticmethod
+    def _set(state, updates: dict):
+        for k, v in updates.items():
+            if v is None:
+                if k in state:
+                    del state[k]
+            else:
+                state[k] = decode_value(v)
+
+    def pull(self, state) -> bool:
+        """
+        Loads the stored state if another process saved a newer version, or
+        the values the last push merged in from another process. True if
+        anything was loaded.
+        """
+        pending, self._pending = self._pending, {}
+        if self.version is not None and self.store.version(self.session_id) == self.version:
+            self._set(state, pending)
+            return bool(pending)
+        version, body = self.store.load(self.session_id)
+        if version == self.version:
+            self._set(state, pending)
+            return bool(pending)
+        encoded = split_encoded(body)
+        self._set(state, self._differences(self._encoded(state), encoded))
+        self.version, self._saved = version, encoded
+        return True
+
+    def push(self, state) -> bool:
+        """
+        Saves the externalized keys if any changed this rerun. True if it wrote.
+        On a conflict only the stored body is merged; `state` is left alone.
+        """
+        local = current = self._encoded(state)
+        changed = {k: v for k, v in current.items() if self._saved.get(k) != v}
+        removed = [k for k in self._saved if k not in current]
+        if not changed and not removed:
+            return False
+        expected = self.version or 0
+        for _ in range(self.retries + 1):
+            version = self.store.compare_and_swap(self.session_id, expected, join_encoded(current))
+            if version is not None:
+                self.version, self._saved = version, current
+                return True
+            # Another process saved first: keep its state, with this rerun's changes on top.
+            # Its values reach the local state at the next pull.
+            self.conflicts += 1
+            expected, body = self.store.load(self.session_id)
+            theirs = split_encoded(body)
+            self._pending = self._differences(local, theirs, keep=changed.keys() | set(removed))
+            current = {k: v for k, v in theirs.items() if k not in removed}
+            current.update(changed)
+        raise RuntimeError(f"session {self.session_id}: gave up after {self.retries + 1} conflicting saves")
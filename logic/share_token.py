@@ -0,0 +1,53 @@
+"""
+Share/resume tokens: the whole reasoning state of a walkthrough in a URL.
+
+A token is the record's compact binary form (logic.record.to_bytes, which
+carries its own schema version) plus the step to reopen, zlib-compressed and
+base64url-encoded without padding:
+
+    TOKEN_VERSION (1 byte) | step (1 byte) | record bytes   -> zlib -> base64url
+
+Nothing is stored on the server: the link is the state. Decoding rebuilds
+the record in one pass; the app derives everything else from it. Anyone
+can write a token, so a decoded record is range-checked before it is
+returned.
+"""
+import base64
+import binascii
+import zlib
+
+from logic.record import DecisionRecord, from_bytes, range_problems, to_bytes
+
+TOKEN_VERSION = 1
+
+# Longest token accepted, and the most a token may inflate to (guards against zlib bombs)
+MAX_TOKEN_CHARS = 8192
+_MAX_PAYLOAD = 64 * 1024
+
+
+def to_token(rec: DecisionRecord, step: int) -> str:
+    payload = bytes((TOKEN_VERSION, step)) + to_bytes(rec)
+    return base64.urlsafe_b64encode(zlib.compress(payload, 9)).rstrip(b"=").decode("ascii")
+
+
+def from_token(token: str):
+    """(record, step) from a token. ValueError if it is malformed or from another version."""
+    if not token or len(token) > MAX_TOKEN_CHARS:
+        raise ValueError("not a share token")
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        inflate = zlib.decompressobj()
+        payload = inflate.decompress(raw, _MAX_PAYLOAD)
+    except (binascii.Error, zlib.error, ValueError):
+        raise ValueError("not a share token") from None
+    if inflate.unconsumed_tail or not inflate.eof:
+        raise ValueError("not a share token")
+    if len(payload) < 2:
+        raise ValueError("not a share token")
+    if payload[0] != TOKEN_VERSION:
+        raise ValueError(f"unsupported share token version {payload[0]} (expected {TOKEN_VERSION})")
+    rec = from_bytes(payload[2:])
+    problems = range_problems(rec)
+    if problems:
+        raise ValueError(f"invalid share token: {'; '.join(problems)}")
+    return rec, payload[1]